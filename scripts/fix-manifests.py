@@ -2,67 +2,63 @@
 Fix existing manifests to include fields required by BgEditor:
   - name: inferred from parent folder name
   - dir: absolute path to manifest directory (forward slashes)
-  - assetsPath: relative path from assets root to manifest dir (forward slashes)
+  - assetsPath: relative path from the assets root to manifest dir (forward slashes)
   - modelFormat: file extension of modelFile (e.g. "dae")
 
 Preserves all existing fields (version, format, animationMode, modelFile, textures, clips, etc.)
+The inference rules live in tools/manifest_schema.py (normalize); run
+tools/validate_manifests.py to check references and types as well.
+
+With --relative the manifests are made portable: no absolute "dir" is
+written (an existing one is removed) and only root-relative assetsPath is
+kept, so moving or mirroring the tree needs no rewrite pass. Python tools
+resolve such manifests through tools/asset_paths.py. BgEditor still loads
+models through "dir", so keep the default mode for trees it edits.
+
+assetsPath is relative to the assets root of tools/asset_paths.py
+(--assets-root, else $STARFIELD_ASSETS_ROOT, else src/Starfield2026.Assets),
+not to the folder being scanned, so fixing Models/ or the whole tree
+writes the same value.
+
+Manifests already fixed on an earlier run and unchanged since are skipped
+without being read (tools/build_cache.py); --no-cache re-reads everything.
 
 Usage:
-  python fix-manifests.py <assets-root>
+  python fix-manifests.py <folder>
   python fix-manifests.py D:/Projects/Starfield-2026/src/Starfield2026.Assets/Models
   python fix-manifests.py --dry-run D:/Projects/Starfield-2026/src/Starfield2026.Assets/Models
+  python fix-manifests.py --assets-root D:/Other/Assets D:/Other/Assets/Models   # another checkout
+  python fix-manifests.py --trace fix.jsonl <folder>   # per-manifest timing trace (tools/telemetry.py)
+  python fix-manifests.py --no-cache <folder>
+  python fix-manifests.py --relative <folder>            # portable manifests, no absolute dir
 """
 
 import json
 import os
 import sys
+from pathlib import Path
 
-def fix_manifest(manifest_path: str, assets_root: str, dry_run: bool = False) -> bool:
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+import asset_paths
+import build_cache
+import manifest_schema
+import telemetry
+
+CACHE_VERSION = 2
+
+def fix_manifest(manifest_path: str, assets_root: str, dry_run: bool = False, portable: bool = False) -> bool:
     """Fix a single manifest. Returns True if modified."""
-    with open(manifest_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with telemetry.stage("read"):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
 
     manifest_dir = os.path.dirname(manifest_path).replace("\\", "/")
-    folder_name = os.path.basename(manifest_dir)
-
-    changed = False
-
-    # modelFile: if missing but "models" array exists, promote models[0].file
-    if "modelFile" not in data:
-        models = data.get("models")
-        if models and len(models) > 0 and "file" in models[0]:
-            data["modelFile"] = models[0]["file"]
-            changed = True
-
-    # name: use parent folder name
-    if "name" not in data:
-        data["name"] = folder_name
-        changed = True
-
-    # dir: absolute path with forward slashes
-    if "dir" not in data:
-        data["dir"] = manifest_dir
-        changed = True
-
-    # modelFormat: extension of modelFile
-    if "modelFormat" not in data:
-        model_file = data.get("modelFile", "")
-        ext = os.path.splitext(model_file)[1].lstrip(".").lower()
-        if not ext:
-            # Fall back to "format" field
-            ext = data.get("format", "dae")
-        data["modelFormat"] = ext
-        changed = True
-
-    # assetsPath: relative path from assets root
-    if "assetsPath" not in data:
-        rel = os.path.relpath(manifest_dir, assets_root).replace("\\", "/")
-        data["assetsPath"] = rel
-        changed = True
+    changed = manifest_schema.normalize(data, manifest_dir, assets_root, portable)
 
     if changed and not dry_run:
-        with open(manifest_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        with telemetry.stage("write"):
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
 
     return changed
 
@@ -72,39 +68,81 @@ def main():
     dry_run = "--dry-run" in args
     if dry_run:
         args.remove("--dry-run")
+    use_cache = "--no-cache" not in args
+    if not use_cache:
+        args.remove("--no-cache")
+    portable = "--relative" in args
+    if portable:
+        args.remove("--relative")
+    trace = None
+    if "--trace" in args:
+        i = args.index("--trace")
+        trace = args[i + 1] if i + 1 < len(args) else None
+        del args[i:i + 2]
+    assets_root = None
+    if "--assets-root" in args:
+        i = args.index("--assets-root")
+        assets_root = args[i + 1] if i + 1 < len(args) else None
+        del args[i:i + 2]
 
     if not args:
-        print("Usage: python fix-manifests.py [--dry-run] <assets-root>")
+        print("Usage: python fix-manifests.py [--dry-run] [--no-cache] [--relative] [--trace PATH] "
+              "[--assets-root DIR] <folder>")
         sys.exit(1)
 
-    assets_root = os.path.abspath(args[0]).replace("\\", "/")
-    if not os.path.isdir(assets_root):
-        print(f"Error: {assets_root} is not a directory")
-        sys.exit(1)
+    scan_dir = os.path.abspath(args[0]).replace("\\", "/")
+    assets_root = os.path.abspath(assets_root or asset_paths.default_root()).replace("\\", "/")
+    for path in (scan_dir, assets_root):
+        if not os.path.isdir(path):
+            print(f"Error: {path} is not a directory")
+            sys.exit(1)
 
+    print(f"Scanning: {scan_dir}")
     print(f"Assets root: {assets_root}")
     print(f"Dry run: {dry_run}")
+    print(f"Mode: {'relative (portable)' if portable else 'absolute dir'}")
+    telemetry.setup("fix-manifests", trace=trace)
+    if portable:
+        # Nothing machine-specific is written: entries are root-relative and survive a move
+        cache = build_cache.open_cache("fix-manifests", enabled=use_cache,
+                                       config={"version": CACHE_VERSION, "relative": True}, root=assets_root)
+    else:
+        # "dir" is absolute, so each root gets its own entries
+        cache = build_cache.open_cache("fix-manifests", enabled=use_cache,
+                                       config={"version": CACHE_VERSION, "root": assets_root})
 
     total = 0
     fixed = 0
     errors = 0
 
-    for root, dirs, files in os.walk(assets_root):
+    for root, dirs, files in os.walk(scan_dir):
         for f in files:
             if f == "manifest.json" or (f.startswith("manifest.") and f.endswith(".json")):
                 total += 1
                 path = os.path.join(root, f)
+                telemetry.count("manifests")
                 try:
-                    if fix_manifest(path, assets_root, dry_run):
+                    key = os.path.relpath(path, assets_root).replace("\\", "/") if portable else path
+                    if cache.get(key, inputs=[path]) is not None:
+                        telemetry.count("cached")
+                        continue
+                    if fix_manifest(path, assets_root, dry_run, portable):
                         fixed += 1
+                        telemetry.count("fixed")
                         if dry_run:
                             print(f"  WOULD FIX: {path}")
+                            continue
+                    # Fixed (or already complete): the file on disk now needs nothing
+                    cache.put(key, {"clean": True}, inputs=[path])
                 except Exception as e:
                     errors += 1
+                    telemetry.count("errors")
+                    telemetry.event("error", path=path, error=str(e))
                     print(f"  ERROR: {path}: {e}")
 
+    cache.close()
     action = "would fix" if dry_run else "fixed"
-    print(f"\nDone: {total} manifests found, {fixed} {action}, {errors} errors")
+    print(f"\nDone: {total} manifests found, {fixed} {action}, {errors} errors ({cache.summary()})")
 
     if dry_run and fixed > 0:
         print("\nRe-run without --dry-run to apply changes.")
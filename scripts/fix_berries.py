@@ -1,18 +1,41 @@
+"""
+Re-apply the ID-range category rules from item_rules.py to an existing
+gamedata.db without re-fetching from PokeAPI.
+
+Only needed for databases seeded before seed_items.py applied the rules at
+ingest time; a fresh seed already writes these categories. Only rows whose
+category differs from the rule are written.
+
+Usage:
+    python fix_berries.py [--dry-run]
+"""
 import sqlite3
+import sys
+from pathlib import Path
+
+from item_rules import compile_rules
+
+db_path = Path(__file__).resolve().parent.parent / "src" / "Starfield2026.Assets" / "Data" / "gamedata.db"
+dry_run = "--dry-run" in sys.argv
 
-db_path = r"D:\Projects\Starfield-2026\src\Starfield2026.Assets\Data\gamedata.db"
+rules = compile_rules()
 conn = sqlite3.connect(db_path)
 cur = conn.cursor()
 
-# Fix berry categories - PokeAPI IDs 125-178 are berries
-cur.execute("UPDATE items SET category = 'Berry' WHERE id BETWEEN 125 AND 178")
-print(f"Updated {cur.rowcount} items to Berry category")
+# Diff current categories against the ID rules
+cur.execute("SELECT id, name, category FROM items ORDER BY id")
+changes = [(rules.by_id[item_id], item_id, name, category)
+           for item_id, name, category in cur.fetchall()
+           if item_id in rules.by_id and rules.by_id[item_id] != category]
 
-conn.commit()
+for new_category, item_id, name, old_category in changes:
+    print(f"  {item_id:>3}: {name:<20} {old_category} -> {new_category}")
 
-# Verify
-cur.execute("SELECT id, name, category FROM items WHERE category = 'Berry' ORDER BY id LIMIT 10")
-for row in cur.fetchall():
-    print(f"  {row[0]:>3}: {row[1]:<20} ({row[2]})")
+if dry_run:
+    print(f"Dry run: {len(changes)} items would change")
+else:
+    cur.executemany("UPDATE items SET category = ? WHERE id = ?", [(c[0], c[1]) for c in changes])
+    conn.commit()
+    print(f"Updated {len(changes)} items")
 
 conn.close()
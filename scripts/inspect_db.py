@@ -1,19 +1,23 @@
 import sqlite3
+import sys
+from pathlib import Path
 
-db_path = r"D:\Projects\Starfield-2026\src\Starfield2026.Assets\Data\gamedata.db"
-conn = sqlite3.connect(db_path)
-cur = conn.cursor()
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+from gamedata_lookup import NameLookup
+
+db_path = Path(__file__).resolve().parent.parent / "src" / "Starfield2026.Assets" / "Data" / "gamedata.db"
+conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
 
 # Find the items we need for CreateTestInventory
 names = ["Potion", "Super Potion", "Hyper Potion", "Antidote", "Parlyz Heal",
          "Full Heal", "Revive", "Poke Ball", "Great Ball", "Oran Berry",
          "Sitrus Berry", "Pecha Berry"]
 
-for name in names:
-    cur.execute("SELECT id, name, category FROM items WHERE LOWER(name) = LOWER(?)", (name,))
-    row = cur.fetchone()
-    if row:
-        print(f"  {row[0]:>3}: {row[1]:<15} ({row[2]})")
+# One batched lookup; names spelled differently in the DB resolve fuzzily
+for name, match in NameLookup(conn, "items").resolve(names).items():
+    if match:
+        note = f"  (matched {name!r})" if match.fuzzy else ""
+        print(f"  {match.id:>3}: {match.name:<15} ({match.fields[0]}){note}")
     else:
         print(f"  ???: {name:<15} NOT FOUND")
 
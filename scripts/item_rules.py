@@ -0,0 +1,104 @@
+"""
+Declarative item category rules for seed_items.py.
+
+Categories are decided while each item is ingested, so a re-seed writes
+correct rows in one pass and no post-hoc UPDATE sweep is needed.
+
+Precedence (first match wins):
+  1. ITEM_ID_RULES    - inclusive PokeAPI item ID ranges
+  2. CATEGORY_RULES   - exact PokeAPI item-category names
+  3. DEFAULT_CATEGORY
+
+ATTRIBUTE_FLAGS maps exact PokeAPI item attribute names to items-table
+flag columns.
+
+compile_rules() flattens the tables into dicts once, so every lookup is O(1).
+"""
+
+from dataclasses import dataclass
+
+# (first_id, last_id, category, note)
+ITEM_ID_RULES = [
+    (114, 125, "Mail", "Grass Mail .. Brick Mail"),
+    # PokeAPI files most berries under "medicine", "in-a-pinch", "other", etc.
+    (126, 189, "Berry", "Cheri Berry .. Rowap Berry"),
+]
+
+# PokeAPI item-category name -> our ItemCategory
+CATEGORY_RULES = {
+    "standard-balls": "Pokeball",
+    "special-balls": "Pokeball",
+    "apricorn-balls": "Pokeball",
+    "healing": "Medicine",
+    "status-cures": "Medicine",
+    "revival": "Medicine",
+    "pp-recovery": "Medicine",
+    "vitamins": "Medicine",
+    "medicine": "Medicine",
+    "stat-boosts": "Battle",
+    "flutes": "Battle",
+    "in-a-pinch": "Berry",
+    "picky-healing": "Berry",
+    "type-protection": "Berry",
+    "baking-only": "Berry",
+    "all-mail": "Mail",
+    "evolution": "EvolutionStone",
+    "held-items": "HeldItem",
+    "choice": "HeldItem",
+    "effort-training": "HeldItem",
+    "bad-held-items": "HeldItem",
+    "training": "HeldItem",
+    "plates": "HeldItem",
+    "species-specific": "HeldItem",
+    "type-enhancement": "HeldItem",
+    "loot": "Valuable",
+    "collectibles": "Valuable",
+    "all-machines": "TM",
+    "plot-advancement": "KeyItem",
+    "gameplay": "KeyItem",
+    "event-items": "KeyItem",
+}
+
+DEFAULT_CATEGORY = "Valuable"
+
+# PokeAPI item attribute name -> items-table flag column
+ATTRIBUTE_FLAGS = {
+    "usable-in-battle": "usable_in_battle",
+    "usable-overworld": "usable_overworld",
+}
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    by_id: dict[int, str]
+    by_category: dict[str, str]
+    flags: dict[str, str]
+    default: str = DEFAULT_CATEGORY
+
+    def category(self, item_id: int, api_category: str | None) -> str:
+        """Our category for an item, given its ID and PokeAPI category name."""
+        cat = self.by_id.get(item_id)
+        if cat is not None:
+            return cat
+        if api_category:
+            return self.by_category.get(api_category, self.default)
+        return self.default
+
+    def attribute_flags(self, attribute_names: list[str]) -> dict[str, int]:
+        """Flag columns set by an item's attribute names; unset flags are 0."""
+        result = dict.fromkeys(self.flags.values(), 0)
+        for name in attribute_names:
+            column = self.flags.get(name)
+            if column:
+                result[column] = 1
+        return result
+
+
+def compile_rules() -> CompiledRules:
+    by_id: dict[int, str] = {}
+    for first, last, category, note in ITEM_ID_RULES:
+        for item_id in range(first, last + 1):
+            if item_id in by_id and by_id[item_id] != category:
+                raise ValueError(f"item {item_id} matched by conflicting ID rules ({note})")
+            by_id[item_id] = category
+    return CompiledRules(by_id=by_id, by_category=dict(CATEGORY_RULES), flags=dict(ATTRIBUTE_FLAGS))
@@ -10,22 +10,35 @@ Field versions win on duplicate slot names (e.g. both have anim_0).
 Battle clips play on the field skeleton — the loader skips bone tracks
 for bones that don't exist in the target rig.
 
+Characters whose two manifests are unchanged since an earlier run are
+skipped without parsing them (tools/build_cache.py). Manifests are read
+through tools/manifest_store.py, which only decodes the clips arrays.
+
 Usage:
-    python merge_battle_clips.py [--dry-run]
+    python merge_battle_clips.py [--dry-run] [--no-cache] [--trace PATH]
 """
 
-import json
 import shutil
 import sys
 from pathlib import Path
 
-ASSETS_ROOT = Path(__file__).resolve().parent.parent / "src" / "Starfield2026.Assets"
-SUNMOON = ASSETS_ROOT / "Models" / "Characters" / "sun-moon"
-BATTLE_DIR = SUNMOON / "battle"
-FIELD_DIR = SUNMOON / "field"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+import asset_paths
+import build_cache
+import manifest_store
+import telemetry
+
+resolver = asset_paths.AssetResolver()  # $STARFIELD_ASSETS_ROOT or src/Starfield2026.Assets
+SUNMOON = "Models/Characters/sun-moon"
+BATTLE_DIR = resolver.resolve(f"{SUNMOON}/battle")
+FIELD_DIR = resolver.resolve(f"{SUNMOON}/field")
+
+CACHE_VERSION = 2
 
+store = manifest_store.ManifestStore()
 
-def merge_character(char_id: str, dry_run: bool) -> dict:
+
+def merge_character(char_id: str, dry_run: bool, cache=None) -> dict:
     """Merge battle clips into field for one character. Returns stats."""
     battle_path = BATTLE_DIR / char_id
     field_path = FIELD_DIR / char_id
@@ -35,27 +48,51 @@ def merge_character(char_id: str, dry_run: bool) -> dict:
     if not battle_manifest.exists() or not field_manifest.exists():
         return {"skipped": True, "reason": "missing manifest"}
 
-    with open(battle_manifest, "r", encoding="utf-8") as f:
-        battle_data = json.load(f)
-    with open(field_manifest, "r", encoding="utf-8") as f:
-        field_data = json.load(f)
-
-    battle_clips = battle_data.get("clips", [])
-    field_clips = field_data.get("clips", [])
+    cache = cache or build_cache.NullCache()
+    cache_key = f"{char_id}:dry-run" if dry_run else char_id
+    inputs = [battle_manifest, field_manifest]
+    cached = cache.get(cache_key, inputs=inputs)
+    if cached is not None:
+        telemetry.count("cached")
+        return cached
+
+    with telemetry.stage("read", char=char_id):
+        try:
+            battle = store.get(battle_manifest)
+            field = store.get(field_manifest)
+        except ValueError as e:
+            result = {"skipped": True, "reason": f"invalid manifest: {e}"}
+            cache.put(cache_key, result, inputs=inputs)
+            return result
+
+    # Clip entries are keyed by index/name/file below; refuse manifests that lack them
+    for side, manifest in (("battle", battle), ("field", field)):
+        for check, severity, where, detail in manifest.clip_issues:
+            if severity == "error":
+                result = {"skipped": True, "reason": f"invalid {side} manifest: {where} {detail}"}
+                cache.put(cache_key, result, inputs=inputs)
+                return result
+
+    battle_clips = battle.clips
+    field_clips = field.clips
 
     if not battle_clips:
-        return {"skipped": True, "reason": "no battle clips"}
+        result = {"skipped": True, "reason": "no battle clips"}
+        cache.put(cache_key, result, inputs=inputs)
+        return result
 
     # Build set of slot names already in field (e.g. "anim_0", "anim_1")
-    field_slot_names = {c["name"] for c in field_clips}
+    field_slot_names = {c.name for c in field_clips}
 
     # Find battle clips not present in field
-    new_clips = [c for c in battle_clips if c["name"] not in field_slot_names]
+    new_clips = [c for c in battle_clips if c.name not in field_slot_names]
     if not new_clips:
-        return {"skipped": False, "copied": 0, "reason": "all slots already present"}
+        result = {"skipped": False, "copied": 0, "reason": "all slots already present"}
+        cache.put(cache_key, result, inputs=inputs)
+        return result
 
     # Continue index numbering from field
-    next_index = max((c["index"] for c in field_clips), default=-1) + 1
+    next_index = max((c.index for c in field_clips), default=-1) + 1
     # Continue clip file numbering from field
     next_file_num = len(field_clips)
 
@@ -67,26 +104,28 @@ def merge_character(char_id: str, dry_run: bool) -> dict:
         if not src_file:
             continue
 
-        src_path = battle_path / src_file
+        src_path = resolver.manifest_file(battle, battle_manifest, src_file)
         if not src_path.exists():
             continue
 
         # New filename in field/clips/
         dest_filename = f"battle_clip_{next_file_num:03d}.dae"
         dest_rel = f"clips/{dest_filename}"
-        dest_path = field_path / dest_rel
+        dest_path = resolver.manifest_file(field, field_manifest, dest_rel)
 
         if not dry_run:
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src_path, dest_path)
+            with telemetry.stage("copy"):
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(src_path, dest_path)
+            telemetry.count("bytes_copied", src_path.stat().st_size)
 
         added_entries.append({
             "index": next_index,
-            "name": clip["name"],
+            "name": clip.name,
             "file": dest_rel,
-            "frameCount": clip.get("frameCount", 0),
+            "frameCount": clip.get("frame_count", 0),
             "fps": clip.get("fps", 30),
-            "boneCount": clip.get("boneCount", 0),
+            "boneCount": clip.get("bone_count", 0),
         })
 
         next_index += 1
@@ -94,16 +133,32 @@ def merge_character(char_id: str, dry_run: bool) -> dict:
         copied_files += 1
 
     if added_entries and not dry_run:
-        field_data["clips"].extend(added_entries)
-        with open(field_manifest, "w", encoding="utf-8") as f:
-            json.dump(field_data, f, indent=2, ensure_ascii=False)
-            f.write("\n")
+        field_data = field.to_dict()
+        field_data["clips"] = (field_data.get("clips") or []) + added_entries
+        with telemetry.stage("write", char=char_id):
+            store.write(field_manifest, field_data)
+    telemetry.count("clips", copied_files)
 
-    return {"skipped": False, "copied": copied_files, "new_slots": [c["name"] for c in added_entries]}
+    result = {"skipped": False, "copied": copied_files, "new_slots": [c["name"] for c in added_entries]}
+    if dry_run:
+        cache.put(cache_key, result, inputs=inputs)
+    else:
+        # A second run over the merged manifests would find every slot present
+        cache.put(cache_key, {"skipped": False, "copied": 0, "reason": "all slots already present"},
+                  inputs=inputs, outputs=[resolver.manifest_file(field, field_manifest, e["file"]) for e in added_entries])
+    return result
 
 
 def main():
     dry_run = "--dry-run" in sys.argv
+    trace = None
+    if "--trace" in sys.argv:
+        i = sys.argv.index("--trace")
+        trace = sys.argv[i + 1] if i + 1 < len(sys.argv) else None
+    telemetry.setup("merge_battle_clips", trace=trace)
+    cache = build_cache.open_cache("merge_battle_clips", enabled="--no-cache" not in sys.argv, root=resolver.root,
+                                   config={"version": CACHE_VERSION, "battle": resolver.relative(BATTLE_DIR),
+                                           "field": resolver.relative(FIELD_DIR)})
 
     if not BATTLE_DIR.exists() or not FIELD_DIR.exists():
         print(f"ERROR: Expected directories not found:")
@@ -121,10 +176,14 @@ def main():
 
     total_copied = 0
     total_merged = 0
+    kept = []
 
     for char_id in overlap:
-        result = merge_character(char_id, dry_run)
+        result = merge_character(char_id, dry_run, cache)
         if result.get("skipped"):
+            if result["reason"].startswith("invalid"):
+                print(f"  {char_id}: skipped, {result['reason']}")
+                kept.append(char_id)
             continue
 
         copied = result.get("copied", 0)
@@ -134,13 +193,19 @@ def main():
             total_copied += copied
             total_merged += 1
 
-    # Delete merged battle character folders (clips already copied to field)
+    cache.close()
+
+    # Delete merged battle character folders (clips already copied to field).
+    # Characters skipped for an invalid manifest were never merged: keep their battle clips.
     deleted = 0
     for char_id in overlap:
+        if char_id in kept:
+            continue
         battle_path = BATTLE_DIR / char_id
         if battle_path.exists():
             if not dry_run:
-                shutil.rmtree(battle_path)
+                with telemetry.stage("delete"):
+                    shutil.rmtree(battle_path)
             deleted += 1
 
     # Delete battle-only characters that have no field counterpart
@@ -152,17 +217,22 @@ def main():
         dst = FIELD_DIR / char_id
         if src.exists():
             if not dry_run:
-                shutil.move(str(src), str(dst))
+                with telemetry.stage("move"):
+                    shutil.move(str(src), str(dst))
             print(f"  {char_id}: moved battle-only -> field/")
             moved += 1
 
+    for char_id in kept:
+        print(f"  {char_id}: kept battle/{char_id} (not merged, fix its manifest and re-run)")
+
     # Remove battle directory if empty
     if not dry_run and BATTLE_DIR.exists() and not any(BATTLE_DIR.iterdir()):
         BATTLE_DIR.rmdir()
         print("Removed empty battle/ directory")
 
     print(f"\nDone: {total_merged} characters merged, {total_copied} clip files copied, "
-          f"{deleted} battle folders deleted, {moved} battle-only moved to field/")
+          f"{deleted} battle folders deleted, {len(kept)} kept, {moved} battle-only moved to field/ "
+          f"({cache.summary()})")
     if dry_run:
         print("(dry run — re-run without --dry-run to apply)")
 
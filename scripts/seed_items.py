@@ -1,85 +1,132 @@
 """
 Fetch items from PokeAPI and seed the gamedata.db items table.
 Uses batched requests to avoid overwhelming the API.
+
+Categories and usability flags come from the declarative rules in
+item_rules.py and are applied as each item is ingested.
+
+Requests are retried with backoff by tools/http_retry.py; items whose
+requests still fail are retried once more after the main pass.
+
+Usage:
+    python seed_items.py                # fetch and write items
+    python seed_items.py --dry-run      # fetch and print a diff against the DB, no writes
+    python seed_items.py --api-base http://127.0.0.1:8765/api/v2   # tools/mock_pokeapi.py
+    python seed_items.py --trace items.jsonl   # per-request timing trace (tools/telemetry.py)
 """
+import argparse
 import sqlite3
-import urllib.request
-import json
+import sys
 import time
+from pathlib import Path
+
+from item_rules import compile_rules
 
-DB_PATH = r"D:\Projects\Starfield-2026\src\Starfield2026.Assets\Data\gamedata.db"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+import gamedata_lookup
+import http_retry
+import telemetry
+
+DB_PATH = Path(__file__).resolve().parent.parent / "src" / "Starfield2026.Assets" / "Data" / "gamedata.db"
 API_BASE = "https://pokeapi.co/api/v2"
 
-# Map PokeAPI category names to our game categories
-CATEGORY_MAP = {
-    "standard-balls": "Pokeball",
-    "special-balls": "Pokeball",
-    "apricorn-balls": "Pokeball",
-    "healing": "Medicine",
-    "status-cures": "Medicine",
-    "revival": "Medicine",
-    "pp-recovery": "Medicine",
-    "vitamins": "Medicine",
-    "stat-boosts": "Battle",
-    "flutes": "Battle",
-    "medicine": "Medicine",
-    "berries": "Berry",
-    "mail": "Mail",
-    "evolution": "EvolutionStone",
-    "held-items": "HeldItem",
-    "choice": "HeldItem",
-    "effort-training": "HeldItem",
-    "bad-held-items": "HeldItem",
-    "training": "HeldItem",
-    "plates": "HeldItem",
-    "species-specific": "HeldItem",
-    "type-enhancement": "HeldItem",
-    "type-protection": "HeldItem",
-    "loot": "Valuable",
-    "collectibles": "Valuable",
-    "all-machines": "TM",
-    "all-mail": "Mail",
-    "plot-advancement": "KeyItem",
-    "gameplay": "KeyItem",
-    "event-items": "KeyItem",
-    "in-a-+pinch": "Berry",
-    "picky-healing": "Berry",
-    "type-protection-berry": "Berry",
-    "baking-only": "Berry",
-}
-
-def get_category(api_category_name):
-    """Map a PokeAPI category to our game category."""
-    for key, val in CATEGORY_MAP.items():
-        if key in api_category_name:
-            return val
-    return "Valuable"
-
-def fetch_json(url):
-    """Fetch JSON from a URL."""
-    req = urllib.request.Request(url, headers={"User-Agent": "Starfield2026-ItemSeeder/1.0"})
-    with urllib.request.urlopen(req, timeout=15) as resp:
-        return json.loads(resp.read().decode())
+ITEM_COLUMNS = ("id", "name", "sprite", "category", "buy_price", "sell_price",
+                "usable_in_battle", "usable_overworld", "effect")
+
+def item_row(item, rules):
+    """items-table row for one /item payload."""
+    item_id = item["id"]
+    name = item["name"].replace("-", " ").title()
+
+    # Category: ID-range rules, then the PokeAPI category name
+    api_category = (item.get("category") or {}).get("name")
+    cat_name = rules.category(item_id, api_category)
+
+    cost = item.get("cost", 0)
+    buy_price = cost
+    sell_price = cost // 2
+
+    # Check usability from attributes
+    flags = rules.attribute_flags([attr.get("name", "") for attr in item.get("attributes", [])])
+
+    # Effect: grab short effect text
+    effect = None
+    for ee in item.get("effect_entries", []):
+        if ee.get("language", {}).get("name") == "en":
+            effect = ee.get("short_effect", "")[:100]
+            break
+
+    return (item_id, name, "", cat_name, buy_price, sell_price,
+            flags["usable_in_battle"], flags["usable_overworld"], effect)
+
+def insert_item(cur, row):
+    with telemetry.stage("insert"):
+        cur.execute("""
+            INSERT OR REPLACE INTO items (id, name, sprite, category, buy_price, sell_price, usable_in_battle, usable_overworld, effect)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, row)
+    telemetry.count("rows")
+
+def print_diff(existing, rows):
+    """Print how seeding `rows` would change the existing items table."""
+    added = changed = 0
+    for row in rows:
+        old = existing.get(row[0])
+        if old is None:
+            added += 1
+            print(f"  + {row[0]:>3}: {row[1]:<20} ({row[3]})")
+            continue
+        diffs = [f"{col} {old[i]!r} -> {row[i]!r}"
+                 for i, col in enumerate(ITEM_COLUMNS) if old[i] != row[i]]
+        if diffs:
+            changed += 1
+            print(f"  ~ {row[0]:>3}: {row[1]:<20} {'; '.join(diffs)}")
+    print(f"\nDry run: {added} new, {changed} changed, {len(rows) - added - changed} unchanged")
+
 
 def main():
-    conn = sqlite3.connect(DB_PATH)
+    global API_BASE
+
+    parser = argparse.ArgumentParser(description="Seed gamedata.db items from PokeAPI")
+    parser.add_argument("--db", type=str, default=str(DB_PATH), help="Path to gamedata.db")
+    parser.add_argument("--dry-run", action="store_true", help="Print a diff against the DB without writing")
+    parser.add_argument("--api-base", type=str, default=API_BASE, help=f"PokeAPI base URL (default: {API_BASE})")
+    http_retry.add_arguments(parser)
+    telemetry.add_arguments(parser)
+    args = parser.parse_args()
+
+    API_BASE = args.api_base.rstrip("/")
+    telemetry.setup("seed_items", trace=args.trace, summary=not args.no_summary)
+
+    rules = compile_rules()
+    client = http_retry.RetryingClient(
+        http_retry.urllib_transport({"User-Agent": "Starfield2026-ItemSeeder/1.0"}),
+        http_retry.policy_from_args(args),
+    )
+    conn = sqlite3.connect(args.db)
     cur = conn.cursor()
 
-    # Create items table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS items (
-        id INTEGER PRIMARY KEY,
-        name TEXT NOT NULL,
-        sprite TEXT NOT NULL DEFAULT '',
-        category TEXT NOT NULL,
-        buy_price INTEGER NOT NULL DEFAULT 0,
-        sell_price INTEGER NOT NULL DEFAULT 0,
-        usable_in_battle INTEGER NOT NULL DEFAULT 0,
-        usable_overworld INTEGER NOT NULL DEFAULT 0,
-        effect TEXT
-    )
-    """)
-    conn.commit()
+    existing = {}
+    if args.dry_run:
+        has_table = cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items'").fetchone()
+        if has_table:
+            existing = {r[0]: r for r in cur.execute(f"SELECT {', '.join(ITEM_COLUMNS)} FROM items")}
+    else:
+        # Create items table
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS items (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            sprite TEXT NOT NULL DEFAULT '',
+            category TEXT NOT NULL,
+            buy_price INTEGER NOT NULL DEFAULT 0,
+            sell_price INTEGER NOT NULL DEFAULT 0,
+            usable_in_battle INTEGER NOT NULL DEFAULT 0,
+            usable_overworld INTEGER NOT NULL DEFAULT 0,
+            effect TEXT
+        )
+        """)
+        conn.commit()
 
     # Fetch item list from PokeAPI (Gen 1-3 items, IDs 1-350ish)
     print("Fetching item list from PokeAPI...")
@@ -90,68 +137,70 @@ def main():
     while offset < 400:
         url = f"{API_BASE}/item?offset={offset}&limit={batch_size}"
         print(f"  Batch: offset={offset}, limit={batch_size}")
-        data = fetch_json(url)
-        results = data.get("results", [])
+        try:
+            data = client.get_json(url)
+        except http_retry.FetchFailed as e:
+            print(f"ERROR: item list unavailable: {e}")
+            sys.exit(1)
+        results = (data or {}).get("results", [])
         if not results:
             break
         all_items.extend(results)
         offset += batch_size
-        time.sleep(0.3)
+        with telemetry.stage("cooldown"):
+            time.sleep(0.3)
 
     print(f"Found {len(all_items)} items. Fetching details...")
 
-    inserted = 0
+    rows = []
     for i, item_stub in enumerate(all_items):
         try:
-            item = fetch_json(item_stub["url"])
-        except Exception as e:
-            print(f"  SKIP {item_stub['name']}: {e}")
+            item = client.get_json(item_stub["url"], item_stub["name"])
+        except http_retry.FetchFailed as e:
+            telemetry.count("errors")
+            print(f"  SKIP {item_stub['name']}: {e.reason} (retrying after the main pass)")
+            continue
+        if item is None:
+            print(f"  SKIP {item_stub['name']}: not found")
             continue
 
-        item_id = item["id"]
-        name = item["name"].replace("-", " ").title()
-
-        # Get category from first category attribute
-        cat_name = "Valuable"
-        if item.get("category") and item["category"].get("name"):
-            cat_name = get_category(item["category"]["name"])
-
-        cost = item.get("cost", 0)
-        buy_price = cost
-        sell_price = cost // 2
-
-        # Check usability from attributes
-        usable_battle = 0
-        usable_overworld = 0
-        for attr in item.get("attributes", []):
-            aname = attr.get("name", "")
-            if "usable-in-battle" in aname:
-                usable_battle = 1
-            if "usable-overworld" in aname:
-                usable_overworld = 1
-
-        # Effect: grab short effect text
-        effect = None
-        for ee in item.get("effect_entries", []):
-            if ee.get("language", {}).get("name") == "en":
-                effect = ee.get("short_effect", "")[:100]
-                break
-
-        cur.execute("""
-            INSERT OR REPLACE INTO items (id, name, sprite, category, buy_price, sell_price, usable_in_battle, usable_overworld, effect)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (item_id, name, "", cat_name, buy_price, sell_price, usable_battle, usable_overworld, effect))
-        inserted += 1
+        with telemetry.stage("rows"):
+            row = item_row(item, rules)
+        rows.append(row)
+        if not args.dry_run:
+            insert_item(cur, row)
 
         if (i + 1) % 20 == 0:
-            conn.commit()
+            if not args.dry_run:
+                with telemetry.stage("commit"):
+                    conn.commit()
+                telemetry.count("commits")
             print(f"  Processed {i+1}/{len(all_items)}...")
-            time.sleep(0.5)
+            with telemetry.stage("cooldown"):
+                time.sleep(0.5)
         else:
-            time.sleep(0.2)
-
-    conn.commit()
-    print(f"\nDone! Inserted {inserted} items into gamedata.db")
+            with telemetry.stage("cooldown"):
+                time.sleep(0.2)
+
+    for _, item in client.retry_dead_letters():
+        if item is not None:
+            row = item_row(item, rules)
+            rows.append(row)
+            if not args.dry_run:
+                insert_item(cur, row)
+    if client.report_dead_letters():
+        print("  Items above were not seeded; re-run to fill them in.")
+
+    if args.dry_run:
+        print_diff(existing, rows)
+        conn.close()
+        return
+
+    with telemetry.stage("commit"):
+        conn.commit()
+    telemetry.count("commits")
+    gamedata_lookup.ensure_name_indexes(conn, ("items",))
+    print(f"\nDone! Inserted {len(rows)} items into gamedata.db")
 
     # Show sample
     cur.execute("SELECT id, name, category FROM items ORDER BY id LIMIT 20")
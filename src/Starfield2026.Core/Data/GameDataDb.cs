@@ -226,6 +226,68 @@ public static class GameDataDb
         return list;
     }
 
+    /// <summary>
+    /// Get the unevolved base form of a species (the species itself if it has no pre-evolution).
+    /// Reads evolution_family, built by tools/evolution_graph.py.
+    /// </summary>
+    public static int GetBaseForm(int speciesId)
+    {
+        EnsureInitialized();
+
+        using var cmd = _conn!.CreateCommand();
+        cmd.CommandText = "SELECT base_species_id FROM evolution_family WHERE species_id = @id";
+        cmd.Parameters.AddWithValue("@id", speciesId);
+
+        var result = cmd.ExecuteScalar();
+        return result is long baseId ? (int)baseId : speciesId;
+    }
+
+    /// <summary>
+    /// Get every species in the same evolution family, ordered by evolution depth then ID.
+    /// </summary>
+    public static IReadOnlyList<int> GetEvolutionFamily(int speciesId)
+    {
+        EnsureInitialized();
+
+        var list = new List<int>();
+        using var cmd = _conn!.CreateCommand();
+        cmd.CommandText = @"
+            SELECT species_id FROM evolution_family
+            WHERE family_id = (SELECT family_id FROM evolution_family WHERE species_id = @id)
+            ORDER BY depth, species_id";
+        cmd.Parameters.AddWithValue("@id", speciesId);
+
+        using var reader = cmd.ExecuteReader();
+        while (reader.Read())
+        {
+            list.Add(reader.GetInt32(0));
+        }
+        return list;
+    }
+
+    /// <summary>
+    /// Get every species the given species can eventually evolve into, nearest first.
+    /// </summary>
+    public static IReadOnlyList<int> GetEvolutionDescendants(int speciesId)
+    {
+        EnsureInitialized();
+
+        var list = new List<int>();
+        using var cmd = _conn!.CreateCommand();
+        cmd.CommandText = @"
+            SELECT descendant_id FROM evolution_closure
+            WHERE ancestor_id = @id
+            ORDER BY distance, descendant_id";
+        cmd.Parameters.AddWithValue("@id", speciesId);
+
+        using var reader = cmd.ExecuteReader();
+        while (reader.Read())
+        {
+            list.Add(reader.GetInt32(0));
+        }
+        return list;
+    }
+
     // --- Helpers ---
 
     private static void EnsureInitialized()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Build shared animation libraries for models that use the same skeleton.
+
+Many Sun/Moon trainers share one rig, yet every character carries its own
+clips/ folder. This tool:
+
+  1. reads each manifest's model DAE and computes a skeleton signature:
+     a hash of every JOINT node's name and its parent joint's name
+     (sibling order does not matter)
+  2. groups manifests by signature into skeleton families
+  3. for each family with --min-members or more models, fingerprints the
+     clips of all members (dedup_clips.fingerprint) and writes one copy of
+     each distinct clip to <root>/_libraries/<signature>/clips/<print>.dae
+     plus a library.json describing the family
+  4. rewrites each member manifest's clips[].file to the library copy and
+     sets "animationLibrary" to the library.json path, both relative to
+     the manifest
+
+A clip file is deleted only once no manifest in the tree references it
+any more. Clips without animation channels stay where they are. Without
+--apply the tool only reports what it would share.
+
+For now only disk usage is shared: the runtime (SplitModelAnimationSet)
+still loads every clip entry of every character on its own, with no
+cache keyed by path, and nothing in the C# loaders reads
+"animationLibrary" yet.
+
+Usage:
+    python anim_libraries.py                              # report for src/Starfield2026.Assets
+    python anim_libraries.py path/to/Assets --min-members 3
+    python anim_libraries.py --apply
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+
+import asset_paths
+import build_cache
+import dedup_clips
+import manifest_schema
+import telemetry
+
+LIBRARY_DIR = "_libraries"
+CACHE_VERSION = 1
+
+
+# --- Skeleton ---
+
+def read_skeleton(path: str) -> list[tuple[str, str | None]]:
+    """(joint name, parent joint name) for every JOINT node, streaming past mesh data."""
+    stack: list[tuple[str, bool]] = []
+    joints = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        tag = elem.tag.rpartition("}")[2]
+        if tag == "node":
+            if event == "start":
+                name = elem.get("name") or elem.get("sid") or elem.get("id") or ""
+                is_joint = elem.get("type") == "JOINT"
+                if is_joint:
+                    parent = next((n for n, j in reversed(stack) if j), None)
+                    joints.append((name, parent))
+                stack.append((name, is_joint))
+            else:
+                stack.pop()
+        elif event == "end":
+            elem.clear()  # geometry and controller arrays are not needed
+    return joints
+
+
+def skeleton_signature(joints: list[tuple[str, str | None]]) -> str | None:
+    if not joints:
+        return None
+    h = hashlib.blake2b(digest_size=8)
+    for name, parent in sorted(joints, key=lambda j: (j[0], j[1] or "")):
+        h.update(f"{name}<{parent or ''};".encode())
+    return h.hexdigest()
+
+
+def model_file(data: dict) -> str | None:
+    return data.get("modelFile") or manifest_schema.first_model_file(data)
+
+
+# --- Families ---
+
+def signatures(resolver: asset_paths.AssetResolver, manifests: dict[str, dict], cache) -> dict[str, list[str]]:
+    """Skeleton signature -> member manifest paths (root-relative)."""
+    families = defaultdict(list)
+    for rel, data in sorted(manifests.items()):
+        model = model_file(data)
+        if not isinstance(model, str):
+            continue
+        model_path = resolver.manifest_file(data, resolver.resolve(rel), model)
+        model_rel = resolver.relative(model_path)
+        if not model_path.is_file():
+            continue
+        hit = cache.get("skeleton:" + model_rel, inputs=[model_path])
+        if hit is None:
+            with telemetry.stage("skeleton"):
+                try:
+                    joints = read_skeleton(model_path)
+                except ET.ParseError as e:
+                    print(f"  WARNING: {model_rel}: {e}")
+                    continue
+            hit = {"signature": skeleton_signature(joints), "bones": len(joints)}
+            cache.put("skeleton:" + model_rel, hit, inputs=[model_path])
+        if hit["signature"]:
+            families[hit["signature"]].append(rel)
+    return families
+
+
+def clip_prints(resolver: asset_paths.AssetResolver, users: dict[str, list[tuple[str, int]]], members: list[str],
+                tolerance: float, jobs: int, cache) -> dict[str, str]:
+    """Root-relative clip path -> exact fingerprint, for clips used by the family."""
+    member_set = set(members)
+    clips = sorted(rel for rel, uses in users.items()
+                   if any(m in member_set for m, _ in uses) and resolver.resolve(rel).is_file())
+    prints, errors = dedup_clips.fingerprint_all(resolver, clips, tolerance, jobs, cache)
+    for e in errors:
+        print(f"  WARNING: {e}")
+    return {rel: exact for rel, (exact, _shape) in prints.items() if exact}
+
+
+def plan_library(signature: str, members: list[str], manifests: dict[str, dict],
+                 prints: dict[str, str]) -> dict:
+    """library.json content: one entry per distinct clip, in first-use order."""
+    clips, by_print = [], {}
+    for rel in members:
+        rel_dir = rel.rpartition("/")[0]
+        for clip in manifests[rel].get("clips") or []:
+            if not isinstance(clip, dict) or not isinstance(clip.get("file"), str):
+                continue
+            source = manifest_schema.resolve(rel_dir, clip["file"])
+            fp = prints.get(source)
+            if fp is None:
+                continue
+            entry = by_print.get(fp)
+            if entry is None:
+                entry = by_print[fp] = {
+                    "file": f"clips/{fp[:16]}.dae",
+                    "fingerprint": fp,
+                    "frameCount": clip.get("frameCount", 0),
+                    "fps": clip.get("fps", 30),
+                    "boneCount": clip.get("boneCount", 0),
+                    "sources": [],
+                }
+                clips.append(entry)
+            if source not in entry["sources"]:
+                entry["sources"].append(source)
+    return {"version": 1, "skeleton": signature, "members": members, "clips": clips}
+
+
+# --- Apply ---
+
+def apply_library(resolver: asset_paths.AssetResolver, library: dict, manifests: dict[str, dict]) -> set[str]:
+    """Write the library and repoint member manifests; returns the source clips that were replaced."""
+    lib_rel = f"{LIBRARY_DIR}/{library['skeleton']}"
+    os.makedirs(resolver.resolve(f"{lib_rel}/clips"), exist_ok=True)
+
+    target_of = {}
+    for entry in library["clips"]:
+        dest = resolver.resolve(f"{lib_rel}/{entry['file']}")
+        if not os.path.exists(dest):
+            with telemetry.stage("copy"):
+                shutil.copy2(resolver.resolve(entry["sources"][0]), dest)
+        for source in entry["sources"]:
+            target_of[source] = f"{lib_rel}/{entry['file']}"
+
+    with open(resolver.resolve(f"{lib_rel}/library.json"), "w", encoding="utf-8") as f:
+        json.dump(library, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    replaced = set()
+    for rel in library["members"]:
+        data = manifests[rel]
+        rel_dir = rel.rpartition("/")[0] or "."
+        for clip in data.get("clips") or []:
+            if not isinstance(clip, dict) or not isinstance(clip.get("file"), str):
+                continue
+            source = manifest_schema.resolve(rel.rpartition("/")[0], clip["file"])
+            if source in target_of:
+                clip["file"] = posixpath.relpath(target_of[source], rel_dir)
+                replaced.add(source)
+        data["animationLibrary"] = posixpath.relpath(f"{lib_rel}/library.json", rel_dir)
+        with telemetry.stage("write"):
+            with open(resolver.resolve(rel), "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+    return replaced
+
+
+def remove_unreferenced(resolver: asset_paths.AssetResolver, candidates: set[str], manifests: dict[str, dict]) -> list[str]:
+    """Delete candidate clip files no manifest points at any more."""
+    referenced = set()
+    for rel, data in manifests.items():
+        rel_dir = rel.rpartition("/")[0]
+        for clip in data.get("clips") or []:
+            if isinstance(clip, dict) and isinstance(clip.get("file"), str):
+                referenced.add(manifest_schema.resolve(rel_dir, clip["file"]))
+    removed = []
+    for rel in sorted(candidates - referenced):
+        path = resolver.resolve(rel)
+        if os.path.isfile(path):
+            os.remove(path)
+            removed.append(rel)
+            clips_dir = os.path.dirname(path)
+            if not os.listdir(clips_dir):
+                os.rmdir(clips_dir)
+    return removed
+
+
+# --- Main ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Share clip sets between models with the same skeleton")
+    parser.add_argument("root", nargs="?", default=str(asset_paths.default_root()), help="Assets root to scan")
+    parser.add_argument("--min-members", type=int, default=2, help="Smallest family that gets a library")
+    parser.add_argument("--tolerance", type=float, default=dedup_clips.DEFAULT_TOLERANCE,
+                        help="Rounding step for clip fingerprints")
+    parser.add_argument("--apply", action="store_true", help="Write libraries and rewrite manifests")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    build_cache.add_arguments(parser)
+    telemetry.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.root)
+    if not os.path.isdir(root):
+        print(f"ERROR: {root} is not a directory.")
+        raise SystemExit(1)
+    resolver = asset_paths.AssetResolver(root)
+    telemetry.setup("anim_libraries", trace=args.trace, summary=not args.no_summary)
+    cache = build_cache.open_cache("anim_libraries", enabled=not args.no_cache, path=args.cache, root=root,
+                                   config={"version": CACHE_VERSION, "tolerance": args.tolerance})
+
+    with telemetry.stage("manifests"):
+        manifests, users, unreadable = dedup_clips.collect_clips(resolver)
+    # Libraries live under the root; never treat one as a member
+    manifests = {rel: data for rel, data in manifests.items() if not rel.startswith(LIBRARY_DIR + "/")}
+    families = signatures(resolver, manifests, cache)
+    eligible = {sig: members for sig, members in families.items() if len(members) >= args.min_members}
+    print(f"{len(manifests)} manifests, {len(families)} skeleton families, {len(eligible)} with "
+          f">= {args.min_members} members")
+
+    libraries = []
+    for sig, members in sorted(eligible.items(), key=lambda kv: -len(kv[1])):
+        prints = clip_prints(resolver, users, members, args.tolerance, args.jobs, cache)
+        library = plan_library(sig, members, manifests, prints)
+        uses = sum(len(e["sources"]) for e in library["clips"])
+        saved = sum(os.path.getsize(resolver.resolve(s)) for e in library["clips"] for s in e["sources"][1:])
+        print(f"  {sig}: {len(members)} models, {uses} clip files -> {len(library['clips'])} shared "
+              f"({saved / 1024:,.1f} KB saved)")
+        libraries.append(library)
+    cache.close()
+
+    if not args.apply:
+        return
+    replaced = set()
+    for library in libraries:
+        replaced |= apply_library(resolver, library, manifests)
+    if unreadable:
+        print(f"\nKept replaced clips: {len(unreadable)} manifests could not be read ({unreadable[0]}, ...)")
+        removed = []
+    else:
+        removed = remove_unreferenced(resolver, replaced, manifests)
+    print(f"\nWrote {len(libraries)} libraries under {LIBRARY_DIR}/, removed {len(removed)} per-model clip files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Resolve asset paths against a configured root instead of absolute paths
+baked into manifests.
+
+Manifests written by fix-manifests carry an absolute "dir" (e.g.
+D:/Projects/...), which goes stale the moment the tree is moved, copied to
+another machine or mirrored. In portable mode (fix-manifests --relative)
+manifests keep only "assetsPath", relative to the assets root, and tools
+find files through an AssetResolver:
+
+    import asset_paths
+
+    resolver = asset_paths.AssetResolver(args.assets_root)
+    char_dir = resolver.manifest_dir(manifest, manifest_path)
+    clip = resolver.manifest_file(manifest, manifest_path, clip["file"])
+    key = resolver.relative(clip)          # root-relative posix, stable across machines
+
+The root comes from --assets-root, else $STARFIELD_ASSETS_ROOT, else the
+repo's src/Starfield2026.Assets. It is the one root assetsPath is relative
+to: fix-manifests and validate_manifests derive and check assetsPath
+against it whatever folder they scan, so a model under Models/ has an
+assetsPath starting with "Models/". Resolved directories are memoized per
+resolver, so repeated lookups for the same manifest are dictionary hits.
+
+A manifest directory is found from, in order: the manifest file's own
+location when known, assetsPath under the root, and a legacy "dir" that
+still exists on disk. The manifest may be a dict or a manifest_store record.
+"""
+
+import os
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT_ENV = "STARFIELD_ASSETS_ROOT"
+REPO_ASSETS = SCRIPT_DIR.parent / "src" / "Starfield2026.Assets"
+
+
+def default_root() -> Path:
+    return Path(os.environ.get(ROOT_ENV) or REPO_ASSETS)
+
+
+def to_posix(path: str) -> str:
+    return path.replace("\\", "/")
+
+
+class AssetResolver:
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(os.path.abspath(root or default_root()))
+        self._resolved: dict[str, Path] = {}
+        self._relative: dict[str, str] = {}
+
+    def resolve(self, rel: str) -> Path:
+        """Absolute path for a root-relative path."""
+        rel = to_posix(rel)
+        cached = self._resolved.get(rel)
+        if cached is None:
+            cached = self._resolved[rel] = Path(os.path.normpath(self.root / rel))
+        return cached
+
+    def relative(self, path: str | Path) -> str:
+        """Root-relative posix path ('.' for the root itself)."""
+        key = str(path)
+        cached = self._relative.get(key)
+        if cached is None:
+            cached = self._relative[key] = to_posix(os.path.relpath(os.path.abspath(path), self.root))
+        return cached
+
+    def manifest_dir(self, manifest, manifest_path: str | Path | None = None) -> Path | None:
+        """Directory the manifest's relative file references are relative to."""
+        if manifest_path is not None:
+            return Path(os.path.abspath(manifest_path)).parent
+        if isinstance(manifest, dict):
+            assets_path, legacy = manifest.get("assetsPath"), manifest.get("dir")
+        else:
+            assets_path, legacy = getattr(manifest, "assets_path", None), getattr(manifest, "dir", None)
+        if isinstance(assets_path, str):
+            return self.resolve(assets_path)
+        if isinstance(legacy, str) and os.path.isdir(legacy):
+            return Path(legacy)
+        return None
+
+    def manifest_file(self, manifest, manifest_path: str | Path | None, ref: str) -> Path | None:
+        """Absolute path of a file a manifest references (modelFile, clips[].file, ...)."""
+        base = self.manifest_dir(manifest, manifest_path)
+        if base is None:
+            return None
+        return Path(os.path.normpath(base / to_posix(ref)))
+
+
+def add_arguments(parser):
+    parser.add_argument("--assets-root", type=str, default=None,
+                        help=f"Assets root for relative paths (default: ${ROOT_ENV} or src/Starfield2026.Assets)")
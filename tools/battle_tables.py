@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Precompute battle lookup tables from species.json into one binary blob.
+
+Computed with NumPy over every species at once:
+
+  STAT  stats at levels 1-100, neutral nature, 0 EVs, one plane per IV
+        setting (default IV 0 and IV 31) - StatCalculator.cs formulas
+  EXPC  total EXP to reach levels 0-100 per GrowthRate - GrowthRateHelper.cs
+  CAPT  catch probability per distinct catch rate x HP fraction x ball x
+        status, Gen III/IV formula (a, then four shake checks)
+
+The game and tools index these instead of recomputing per encounter.
+
+species.json may be either shape in the tree (fetch_pokeapi.py output or
+the MapEditor copy); see export_columnar.load_species_json.
+
+File layout (little-endian, same container as gamedata.bin):
+
+    header      magic "SFBT", u16 version, u16 section count
+    directory   per section: 4-char tag, u32 offset, u32 byte length, u32 count
+    META        UTF-8 JSON: axes (ivs, hp_fractions, balls, statuses, growth rates)
+    SIDX        u16[max_species_id + 1]: species id -> row, 0xFFFF if absent
+    SPID        u16[n] species ids by row
+    GROW        u8[n] GrowthRate code by row
+    STAT        u16[ivs][n][100][6]  (hp, atk, def, spa, spd, spe)
+    EXPC        u32[6][101]          GrowthRate x level
+    CRAT        u8[k] distinct catch rates
+    CIDX        u8[n] row -> CRAT index
+    CAPT        u16[k][hp][balls][statuses]  probability * 65535
+
+Usage:
+    python battle_tables.py                         # MapEditor species.json -> Data/battle_tables.bin
+    python battle_tables.py --species species.json --out battle_tables.bin
+    python battle_tables.py --ivs 0 15 31 --hp-steps 10
+    python battle_tables.py --check                 # also verify against scalar ports of the C# code
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import time
+from pathlib import Path
+
+import numpy as np
+
+from export_columnar import GROWTH_RATES, load_species_json
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / "src" / "Starfield2026.Assets" / "Data"
+SPECIES_JSON = SCRIPT_DIR.parent / "src" / "Starfield2026.MapEditor" / "frontend" / "public" / "species.json"
+TABLES_PATH = DATA_DIR / "battle_tables.bin"
+
+MAGIC = b"SFBT"
+FORMAT_VERSION = 1
+NO_ROW = 0xFFFF
+MAX_LEVEL = 100
+
+HEADER = struct.Struct("<4sHH")
+DIRECTORY_ENTRY = struct.Struct("<4sIII")
+
+STAT_COLUMNS = ["hp", "attack", "defense", "sp_attack", "sp_defense", "speed"]
+
+# (name, catch-rate multiplier), Gen III/IV values
+BALLS = [("PokeBall", 1.0), ("GreatBall", 1.5), ("UltraBall", 2.0)]
+STATUSES = [("None", 1.0), ("Paralysis/Poison/Burn", 1.5), ("Sleep/Freeze", 2.0)]
+
+
+# --- Tables ---
+
+def stat_table(base: np.ndarray, ivs: list[int]) -> np.ndarray:
+    """u16[ivs][species][100][6] for neutral nature and 0 EVs.
+
+    base is int[species][6] in STAT_COLUMNS order.
+    """
+    level = np.arange(1, MAX_LEVEL + 1, dtype=np.int32)[None, None, :, None]
+    iv = np.asarray(ivs, dtype=np.int32)[:, None, None, None]
+    core = (2 * base.astype(np.int32)[None, :, None, :] + iv) * level // 100
+    stats = core + 5
+    stats[..., 0] = core[..., 0] + level[..., 0] + 10
+    return stats.astype(np.uint16)
+
+
+def exp_table() -> np.ndarray:
+    """u32[6][101]: total EXP for each level, rows in GROWTH_RATES order."""
+    n = np.arange(MAX_LEVEL + 1, dtype=np.float64)
+    n3 = n * n * n
+    curves = {
+        "Fast": 4 * n3 / 5,
+        "MediumFast": n3,
+        "MediumSlow": np.maximum(0, 6 * n3 / 5 - 15 * n * n + 100 * n - 140),
+        "Slow": 5 * n3 / 4,
+        "Erratic": np.select(
+            [n < 50, n < 68, n < 98],
+            [n3 * (100 - n) / 50, n3 * (150 - n) / 100, n3 * ((1911 - 10 * n) / 3.0) / 500],
+            n3 * (160 - n) / 100),
+        "Fluctuating": np.select(
+            [n < 15, n < 36],
+            [n3 * ((np.floor(n + 1) // 3) + 24) / 50, n3 * (n + 14) / 50],
+            n3 * (n / 2 + 32) / 50),
+    }
+    table = np.stack([curves[rate] for rate in GROWTH_RATES])
+    table[:, :2] = 0  # GetEXPForLevel returns 0 for level <= 1
+    return np.trunc(table).astype(np.uint32)
+
+
+def hp_fractions(steps: int) -> np.ndarray:
+    """Current/max HP sample points from 1 HP (0.0) to full (1.0)."""
+    return np.linspace(0.0, 1.0, steps + 1)
+
+
+def capture_table(rates: np.ndarray, fractions: np.ndarray) -> np.ndarray:
+    """u16[rates][hp][balls][statuses]: P(catch) * 65535."""
+    rate = rates.astype(np.float64)[:, None, None, None]
+    hp = fractions[None, :, None, None]
+    ball = np.array([m for _, m in BALLS])[None, None, :, None]
+    status = np.array([m for _, m in STATUSES])[None, None, None, :]
+
+    a = np.floor((3 - 2 * hp) * rate * ball / 3) * status
+    with np.errstate(divide="ignore"):
+        b = np.floor(1048560 / np.sqrt(np.sqrt(16711680 / a)))
+    shake = np.clip(b / 65536, 0.0, 1.0)
+    prob = np.where(a >= 255, 1.0, np.where(a <= 0, 0.0, shake ** 4))
+    return np.round(prob * 65535).astype(np.uint16)
+
+
+# --- Build ---
+
+def build(species_path: Path, ivs: list[int], hp_steps: int) -> bytes:
+    columns, _, rows = load_species_json(species_path)
+    col = {name: i for i, name in enumerate(columns)}
+    rows = sorted(rows, key=lambda r: r[col["id"]])
+
+    ids = np.array([r[col["id"]] for r in rows], dtype=np.uint16)
+    base = np.array([[r[col[c]] for c in STAT_COLUMNS] for r in rows], dtype=np.int32)
+    growth_index = {name: i for i, name in enumerate(GROWTH_RATES)}
+    growth = np.array([growth_index.get(r[col["growth_rate"]], growth_index["MediumFast"]) for r in rows],
+                      dtype=np.uint8)
+    catch = np.array([r[col["catch_rate"]] for r in rows], dtype=np.uint8)
+
+    sidx = np.full(int(ids.max()) + 1 if ids.size else 1, NO_ROW, dtype=np.uint16)
+    sidx[ids] = np.arange(len(ids), dtype=np.uint16)
+
+    rates, cidx = np.unique(catch, return_inverse=True)
+    fractions = hp_fractions(hp_steps)
+
+    meta = {
+        "source": species_path.name,
+        "max_level": MAX_LEVEL,
+        "stats": STAT_COLUMNS,
+        "ivs": ivs,
+        "growth_rates": GROWTH_RATES,
+        "hp_fractions": [round(f, 6) for f in fractions.tolist()],
+        "balls": [name for name, _ in BALLS],
+        "statuses": [name for name, _ in STATUSES],
+    }
+    sections = {
+        "META": (json.dumps(meta, separators=(",", ":")).encode("utf-8"), 1),
+        "SIDX": (sidx.tobytes(), len(sidx)),
+        "SPID": (ids.tobytes(), len(ids)),
+        "GROW": (growth.tobytes(), len(growth)),
+        "STAT": (stat_table(base, ivs).tobytes(), len(ids)),
+        "EXPC": (exp_table().tobytes(), len(GROWTH_RATES)),
+        "CRAT": (rates.astype(np.uint8).tobytes(), len(rates)),
+        "CIDX": (cidx.astype(np.uint8).tobytes(), len(cidx)),
+        "CAPT": (capture_table(rates, fractions).tobytes(), len(rates)),
+    }
+
+    offset = HEADER.size + DIRECTORY_ENTRY.size * len(sections)
+    directory = []
+    payload = []
+    for tag, (blob, count) in sections.items():
+        pad = -offset % 4
+        payload.append(b"\0" * pad)
+        offset += pad
+        directory.append(DIRECTORY_ENTRY.pack(tag.encode("ascii"), offset, len(blob), count))
+        payload.append(blob)
+        offset += len(blob)
+
+    return HEADER.pack(MAGIC, FORMAT_VERSION, len(sections)) + b"".join(directory) + b"".join(payload)
+
+
+# --- Load ---
+
+class BattleTables:
+    """Read-only view over a battle_tables.bin; every table is a NumPy array over the mapping."""
+
+    def __init__(self, path: str | Path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a battle tables file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} has battle tables version {version}, expected {FORMAT_VERSION}")
+
+        sections = {}
+        for i in range(count):
+            tag, offset, length, n = DIRECTORY_ENTRY.unpack_from(self._map, HEADER.size + i * DIRECTORY_ENTRY.size)
+            sections[tag.decode("ascii")] = (offset, length, n)
+
+        def array(tag: str, dtype) -> np.ndarray:
+            offset, length, _ = sections[tag]
+            return np.frombuffer(self._map, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=offset)
+
+        offset, length, _ = sections["META"]
+        self.meta = json.loads(self._map[offset:offset + length].decode("utf-8"))
+        n = sections["SPID"][2]
+        ivs = len(self.meta["ivs"])
+        hp = len(self.meta["hp_fractions"])
+        balls, statuses = len(self.meta["balls"]), len(self.meta["statuses"])
+
+        self.species_index = array("SIDX", "<u2")
+        self.species_ids = array("SPID", "<u2")
+        self.growth = array("GROW", "u1")
+        self.stats = array("STAT", "<u2").reshape(ivs, n, MAX_LEVEL, 6)
+        self.exp = array("EXPC", "<u4").reshape(len(self.meta["growth_rates"]), MAX_LEVEL + 1)
+        self.catch_rates = array("CRAT", "u1")
+        self.catch_index = array("CIDX", "u1")
+        self.capture = array("CAPT", "<u2").reshape(len(self.catch_rates), hp, balls, statuses)
+
+    def row(self, species_id: int) -> int:
+        if species_id >= len(self.species_index) or self.species_index[species_id] == NO_ROW:
+            raise KeyError(species_id)
+        return int(self.species_index[species_id])
+
+    def stats_at(self, species_id: int, level: int, iv_plane: int = 0) -> tuple[int, ...]:
+        """(hp, atk, def, spa, spd, spe) at level for the iv_plane-th IV setting."""
+        return tuple(int(v) for v in self.stats[iv_plane, self.row(species_id), level - 1])
+
+    def exp_for_level(self, species_id: int, level: int) -> int:
+        return int(self.exp[self.growth[self.row(species_id)], min(max(level, 0), MAX_LEVEL)])
+
+    def catch_probability(self, species_id: int, hp_fraction: float, ball: int = 0, status: int = 0) -> float:
+        """P(catch) at the nearest tabulated HP fraction at or above hp_fraction."""
+        steps = len(self.meta["hp_fractions"]) - 1
+        hp = min(steps, max(0, int(np.ceil(hp_fraction * steps - 1e-9))))
+        rate = self.catch_index[self.row(species_id)]
+        return int(self.capture[rate, hp, ball, status]) / 65535
+
+    def close(self):
+        for name in ("species_index", "species_ids", "growth", "stats", "exp",
+                     "catch_rates", "catch_index", "capture"):
+            setattr(self, name, None)
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- Check ---
+
+def _scalar_exp(rate: str, level: int) -> int:
+    """Line-for-line port of GrowthRateHelper.GetEXPForLevel."""
+    if level <= 1:
+        return 0
+    n = float(level)
+    n3 = n * n * n
+    if rate == "Fast":
+        return int(4 * n3 / 5)
+    if rate == "MediumSlow":
+        return int(max(0, 6 * n3 / 5 - 15 * n * n + 100 * n - 140))
+    if rate == "Slow":
+        return int(5 * n3 / 4)
+    if rate == "Erratic":
+        if n < 50: return int(n3 * (100 - n) / 50)
+        if n < 68: return int(n3 * (150 - n) / 100)
+        if n < 98: return int(n3 * ((1911 - 10 * n) / 3.0) / 500)
+        return int(n3 * (160 - n) / 100)
+    if rate == "Fluctuating":
+        if n < 15: return int(n3 * ((int(n + 1) // 3) + 24) / 50)
+        if n < 36: return int(n3 * (n + 14) / 50)
+        return int(n3 * (n / 2 + 32) / 50)
+    return int(n3)
+
+
+def check(tables: BattleTables, species_path: Path) -> int:
+    """Compare every tabulated stat and EXP value with scalar ports; returns mismatches."""
+    columns, _, rows = load_species_json(species_path)
+    col = {name: i for i, name in enumerate(columns)}
+    mismatches = 0
+    for r in rows:
+        base = [r[col[c]] for c in STAT_COLUMNS]
+        for plane, iv in enumerate(tables.meta["ivs"]):
+            for level in range(1, MAX_LEVEL + 1):
+                expected = ((2 * base[0] + iv) * level // 100 + level + 10,
+                            *((2 * b + iv) * level // 100 + 5 for b in base[1:]))
+                if tables.stats_at(r[col["id"]], level, plane) != expected:
+                    mismatches += 1
+    for i, rate in enumerate(GROWTH_RATES):
+        for level in range(MAX_LEVEL + 1):
+            if int(tables.exp[i, level]) != _scalar_exp(rate, level):
+                mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute stat / EXP / capture tables from species.json")
+    parser.add_argument("--species", type=str, default=str(SPECIES_JSON), help="species.json (either shape)")
+    parser.add_argument("--out", type=str, default=str(TABLES_PATH))
+    parser.add_argument("--ivs", type=int, nargs="+", default=[0, 31], help="IV planes for STAT (default: 0 31)")
+    parser.add_argument("--hp-steps", type=int, default=20, help="HP fraction steps in CAPT (default: 20 = 5%%)")
+    parser.add_argument("--check", action="store_true", help="Verify STAT/EXPC against scalar ports")
+    args = parser.parse_args()
+
+    species_path = Path(args.species)
+    start = time.perf_counter()
+    blob = build(species_path, args.ivs, args.hp_steps)
+    elapsed = time.perf_counter() - start
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_bytes(blob)
+    print(f"{species_path} -> {out}")
+    print(f"  {len(blob) / 1024:.1f} KB built in {elapsed * 1000:.0f} ms")
+
+    with BattleTables(out) as tables:
+        print(f"  {len(tables.species_ids)} species, IV planes {tables.meta['ivs']}, "
+              f"{len(tables.catch_rates)} distinct catch rates x {len(tables.meta['hp_fractions'])} HP steps")
+        if args.check:
+            mismatches = check(tables, species_path)
+            print(f"  Check: {mismatches} mismatches")
+            if mismatches:
+                raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Python asset and data tooling.
+
+Every benchmark runs on synthetic fixtures generated into a temp directory
+(sprite sheets, manifest trees, PokeAPI-shaped payloads, a scratch
+gamedata.db); nothing touches the network or the real asset tree.
+
+Each case is timed over several rounds after a warm-up; the best round's
+throughput (units/second) is compared against a stored baseline and the
+run fails when any case drops more than --threshold below it.
+
+Usage:
+    python benchmark_tools.py                     # run and compare to baseline
+    python benchmark_tools.py --save-baseline     # run and store as the new baseline
+    python benchmark_tools.py --only flatten_chain --only count_sprites
+    python benchmark_tools.py --threshold 0.15 --rounds 10
+    python benchmark_tools.py --list
+
+Baselines are machine-specific; record one per machine before tuning.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import pokeapi_fixtures
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent
+BASELINE_PATH = SCRIPT_DIR / "benchmark_baseline.json"
+
+DEFAULT_ROUNDS = 5
+DEFAULT_THRESHOLD = 0.25
+
+
+def load_script(path: Path, name: str):
+    """Import a script by path (handles hyphenated file names)."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@dataclass
+class Case:
+    run: Callable[[], int]
+    unit: str
+    setup: Callable[[], None] | None = None
+    # Per-case override of --threshold for cases dominated by disk I/O noise
+    threshold: float | None = None
+
+
+BENCHMARKS: dict[str, Callable[[Path], Case]] = {}
+
+
+def benchmark(name: str):
+    """Register a factory that builds fixtures under a work dir and returns a Case."""
+    def register(factory: Callable[[Path], Case]):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+# --- Asset tooling ---
+
+@benchmark("count_sprites")
+def bench_count_sprites(work: Path) -> Case:
+    from PIL import Image, ImageDraw
+    count_sprites = load_script(SCRIPT_DIR / "count_sprites.py", "count_sprites").count_sprites
+
+    sheet = work / "sheet.png"
+    img = Image.new("RGBA", (256, 128), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    for row in range(4):
+        for col in range(8):
+            x, y = col * 32, row * 32
+            draw.ellipse((x + 4, y + 4, x + 27, y + 27), fill=(200, 80, 40, 255))
+    img.save(sheet)
+    pixels = img.width * img.height
+
+    def run() -> int:
+        with contextlib.redirect_stdout(io.StringIO()):
+            count_sprites(str(sheet))
+        return pixels
+
+    return Case(run, "px")
+
+
+def _manifest(index: int, clip_count: int = 12) -> dict:
+    return {
+        "version": 1,
+        "modelFile": "model.dae",
+        "textures": [f"textures/tex_{t}.png" for t in range(4)],
+        "clips": [
+            {"index": c, "name": f"anim_{c}", "file": f"clips/clip_{c:03d}.dae",
+             "frameCount": 30, "fps": 30, "boneCount": 40}
+            for c in range(clip_count)
+        ],
+    }
+
+
+@benchmark("fix_manifest")
+def bench_fix_manifest(work: Path) -> Case:
+    fix_manifests = load_script(REPO_ROOT / "scripts" / "fix-manifests.py", "fix_manifests")
+    root = work / "Models"
+    originals = {}
+    for i in range(300):
+        path = root / f"group_{i % 10}" / f"char_{i:04d}" / "manifest.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        originals[path] = json.dumps(_manifest(i), indent=2)
+
+    def setup():
+        for path, text in originals.items():
+            path.write_text(text, encoding="utf-8")
+
+    def run() -> int:
+        for path in originals:
+            fix_manifests.fix_manifest(str(path), str(root))
+        return len(originals)
+
+    return Case(run, "manifests", setup)
+
+
+@benchmark("manifest_header")
+def bench_manifest_header(work: Path) -> Case:
+    import manifest_store
+    paths = []
+    for i in range(300):
+        path = work / f"char_{i:04d}" / "manifest.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(_manifest(i, 60), indent=2) + "\n", encoding="utf-8")
+        paths.append(path)
+
+    def run() -> int:
+        store = manifest_store.ManifestStore()
+        for path in paths:
+            store.header(path)
+        return len(paths)
+
+    return Case(run, "manifests")
+
+
+@benchmark("merge_character")
+def bench_merge_character(work: Path) -> Case:
+    merge = load_script(REPO_ROOT / "scripts" / "merge_battle_clips.py", "merge_battle_clips")
+    template = work / "template"
+    chars = [f"tr{i:04d}_00" for i in range(60)]
+    clip_body = "<COLLADA>" + "0 " * 4096 + "</COLLADA>"
+    for char_id in chars:
+        for side, count in (("battle", 16), ("field", 6)):
+            char_dir = template / side / char_id
+            (char_dir / "clips").mkdir(parents=True, exist_ok=True)
+            manifest = _manifest(0, count)
+            if side == "battle":
+                for c in manifest["clips"]:
+                    c["name"] = f"anim_{c['index'] + 3}"
+            for c in manifest["clips"]:
+                (char_dir / c["file"]).write_text(clip_body, encoding="utf-8")
+            (char_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    live = work / "live"
+    merge.BATTLE_DIR = live / "battle"
+    merge.FIELD_DIR = live / "field"
+
+    def setup():
+        shutil.rmtree(live, ignore_errors=True)
+        shutil.copytree(template, live)
+        merge.store = merge.manifest_store.ManifestStore()  # cold reads every round
+
+    def run() -> int:
+        for char_id in chars:
+            merge.merge_character(char_id, dry_run=False)
+        return len(chars)
+
+    return Case(run, "characters", setup, threshold=0.6)
+
+
+@benchmark("convert_mesh")
+def bench_convert_mesh(work: Path) -> Case:
+    dae_to_mesh = load_script(SCRIPT_DIR / "dae_to_mesh.py", "dae_to_mesh")
+    n = 80
+    positions = " ".join(f"{x} 0 {z}" for z in range(n + 1) for x in range(n + 1))
+    uvs = " ".join(f"{x / n} {z / n}" for z in range(n + 1) for x in range(n + 1))
+    quads = " ".join(f"{z * (n + 1) + x} {z * (n + 1) + x + 1} {(z + 1) * (n + 1) + x + 1} {(z + 1) * (n + 1) + x}"
+                     for z in range(n) for x in range(n))
+    dae = work / "grid.dae"
+    dae.write_text(
+        '<COLLADA xmlns="http://www.collada.org/2005/11/COLLADASchema"><library_geometries>'
+        '<geometry id="grid"><mesh>'
+        f'<source id="pos"><float_array id="pos-array">{positions}</float_array>'
+        '<technique_common><accessor source="#pos-array" stride="3"/></technique_common></source>'
+        f'<source id="uv"><float_array id="uv-array">{uvs}</float_array>'
+        '<technique_common><accessor source="#uv-array" stride="2"/></technique_common></source>'
+        '<vertices id="verts"><input semantic="POSITION" source="#pos"/><input semantic="TEXCOORD" source="#uv"/></vertices>'
+        f'<polylist material="m" count="{n * n}"><input semantic="VERTEX" source="#verts" offset="0"/>'
+        f'<vcount>{"4 " * (n * n)}</vcount><p>{quads}</p></polylist>'
+        '</mesh></geometry></library_geometries></COLLADA>', encoding="utf-8")
+    out = work / "grid.sfmesh"
+
+    def run() -> int:
+        return dae_to_mesh.convert(dae, out)["triangles"]
+
+    return Case(run, "triangles")
+
+
+# --- Data tooling ---
+
+@benchmark("flatten_chain")
+def bench_flatten_chain(work: Path) -> Case:
+    fetch_gamedata = load_script(SCRIPT_DIR / "fetch-gamedata.py", "fetch_gamedata")
+    chains = [pokeapi_fixtures.evolution_chain(i)["chain"] for i in range(1, 428)]
+
+    def run() -> int:
+        for chain in chains:
+            fetch_gamedata.flatten_chain(chain)
+        return len(chains)
+
+    return Case(run, "chains")
+
+
+@benchmark("learnset_rows")
+def bench_learnset_rows(work: Path) -> Case:
+    fetch_gamedata = load_script(SCRIPT_DIR / "fetch-gamedata.py", "fetch_gamedata")
+    payloads = [(i, pokeapi_fixtures.pokemon(i)) for i in range(1, 201)]
+
+    def run() -> int:
+        for species_id, data in payloads:
+            fetch_gamedata.learnset_rows(species_id, data)
+        return len(payloads)
+
+    return Case(run, "species")
+
+
+def _scratch_db(work: Path, fetch_gamedata) -> Path:
+    db = work / "gamedata.db"
+    conn = sqlite3.connect(db)
+    fetch_gamedata.ensure_schema(conn)
+    conn.close()
+    return db
+
+
+@benchmark("sqlite_insert_learnsets")
+def bench_sqlite_insert_learnsets(work: Path) -> Case:
+    fetch_gamedata = load_script(SCRIPT_DIR / "fetch-gamedata.py", "fetch_gamedata")
+    db = _scratch_db(work, fetch_gamedata)
+    batches = []
+    for start in range(1, 301, 100):
+        rows = []
+        for species_id in range(start, start + 100):
+            rows.extend(fetch_gamedata.learnset_rows(species_id, pokeapi_fixtures.pokemon(species_id)))
+        batches.append(rows)
+    total = sum(len(b) for b in batches)
+
+    def setup():
+        conn = sqlite3.connect(db)
+        conn.execute("DELETE FROM learnsets_by_version")
+        conn.commit()
+        conn.close()
+
+    def run() -> int:
+        # Same statement and per-batch commit as fetch_and_insert_learnsets
+        conn = sqlite3.connect(db)
+        for rows in batches:
+            conn.executemany(
+                """INSERT OR IGNORE INTO learnsets_by_version
+                   (species_id, move_id, version_group, method, level) VALUES (?,?,?,?,?)""",
+                rows
+            )
+            conn.commit()
+        conn.close()
+        return total
+
+    return Case(run, "rows", setup)
+
+
+@benchmark("sqlite_insert_evolutions")
+def bench_sqlite_insert_evolutions(work: Path) -> Case:
+    fetch_gamedata = load_script(SCRIPT_DIR / "fetch-gamedata.py", "fetch_gamedata")
+    db = _scratch_db(work, fetch_gamedata)
+    rows = []
+    for i in range(1, 428):
+        rows.extend(fetch_gamedata.flatten_chain(pokeapi_fixtures.evolution_chain(i)["chain"]))
+
+    def setup():
+        conn = sqlite3.connect(db)
+        conn.execute("DELETE FROM evolutions")
+        conn.commit()
+        conn.close()
+
+    def run() -> int:
+        conn = sqlite3.connect(db)
+        conn.executemany(
+            """INSERT OR IGNORE INTO evolutions
+               (from_species_id, to_species_id, trigger, min_level, item, held_item,
+                known_move, known_move_type, min_happiness, time_of_day, gender)
+               VALUES (?,?,?,?,?,?,?,?,?,?,?)""",
+            rows
+        )
+        conn.commit()
+        conn.close()
+        return len(rows)
+
+    return Case(run, "rows", setup)
+
+
+# --- Runner ---
+
+def run_case(name: str, factory: Callable[[Path], Case], work_root: Path, rounds: int) -> dict:
+    work = work_root / name
+    work.mkdir(parents=True)
+    case = factory(work)
+
+    timings = []
+    units = 0
+    for i in range(rounds + 1):
+        if case.setup:
+            case.setup()
+        start = time.perf_counter()
+        units = case.run()
+        elapsed = time.perf_counter() - start
+        if i > 0:  # round 0 is warm-up
+            timings.append(elapsed)
+
+    best = min(timings)
+    return {"unit": case.unit, "units": units, "seconds": best,
+            "throughput": units / best if best else float("inf"),
+            "threshold": case.threshold}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print a result table; return names of cases that regressed past threshold."""
+    regressions = []
+    print(f"\n{'benchmark':<26}{'best':>11}{'throughput':>22}{'vs baseline':>14}")
+    for name, r in results.items():
+        rate = f"{r['throughput']:,.0f} {r['unit']}/s"
+        base = baseline.get(name)
+        if base:
+            ratio = r["throughput"] / base["throughput"]
+            status = f"{ratio:>8.2f}x"
+            allowed = r["threshold"] if r["threshold"] is not None else threshold
+            if ratio < 1 - allowed:
+                status += "  FAIL"
+                regressions.append(name)
+        else:
+            status = "      new"
+        print(f"  {name:<24}{r['seconds'] * 1000:>8.2f} ms{rate:>22}{status:>14}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Python asset and data tooling")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="Run only these cases")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Timed rounds per case")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed throughput drop vs baseline, as a fraction (default 0.25)")
+    parser.add_argument("--baseline", type=str, default=str(BASELINE_PATH), help="Baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(sorted(BENCHMARKS)))
+        return
+
+    selected = {n: f for n, f in BENCHMARKS.items() if not args.only or n in args.only}
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8")).get("results", {})
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="starfield-bench-") as tmp:
+        for name, factory in selected.items():
+            print(f"  running {name}...", flush=True)
+            try:
+                results[name] = run_case(name, factory, Path(tmp), args.rounds)
+            except ImportError as e:
+                print(f"    skipped: {e}")
+
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        stored = {"machine": platform.node(), "python": platform.python_version(),
+                  "results": {**baseline, **{n: {k: v for k, v in r.items() if k != "threshold"}
+                                             for n, r in results.items()}}}
+        baseline_path.write_text(json.dumps(stored, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline saved to {baseline_path}")
+    elif regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
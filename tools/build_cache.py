@@ -0,0 +1,202 @@
+"""
+Build-state cache shared by the asset maintenance scripts.
+
+A small SQLite DB remembers, per tool, which units of work were already
+done and what files they depended on:
+
+    entries  (namespace, key)             -> result (JSON)
+    files    (namespace, key, path, role) -> mtime_ns, size, hash
+
+A unit's `inputs` are the files its result was computed from; its
+`outputs` are files it wrote. get() returns the stored result only while
+every input and output still matches what put() recorded, so editing an
+input re-runs the unit and touching or deleting an output does too.
+
+Matching is stat-first: equal mtime and size is a hit without reading
+the file. When only the mtime moved (checkout, copy) the content hash
+decides and the new mtime is stored, so the next run is stat-only again.
+
+    import build_cache
+
+    cache = build_cache.open_cache("count_sprites", enabled=not args.no_cache, path=args.cache)
+    result = cache.get(path, inputs=[path])
+    if result is None:
+        result = {"sprites": do_work(path)}
+        cache.put(path, result, inputs=[path])
+    cache.close()
+
+The namespace is the tool name plus a hash of its `config` (anything that
+changes what the tool would produce, e.g. an assets root), so runs with
+different settings never see each other's entries. Given a `root`, file
+paths are stored relative to it, so a moved or mirrored tree (with
+portable manifests, see asset_paths.py) keeps its entries: mtimes usually
+survive the move, and where they do not the content hash still matches.
+Bump the "version" in a tool's config when its logic changes to drop old
+entries.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_PATH = SCRIPT_DIR / "out" / "build_cache.db"
+
+COMMIT_EVERY = 500
+HASH_CHUNK = 1 << 20
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        namespace   TEXT NOT NULL,
+        key         TEXT NOT NULL,
+        result      TEXT NOT NULL,
+        PRIMARY KEY (namespace, key)
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS files (
+        namespace   TEXT NOT NULL,
+        key         TEXT NOT NULL,
+        path        TEXT NOT NULL,
+        role        TEXT NOT NULL,     -- 'input' or 'output'
+        mtime_ns    INTEGER NOT NULL,
+        size        INTEGER NOT NULL,
+        hash        TEXT NOT NULL,
+        PRIMARY KEY (namespace, key, path, role)
+    ) WITHOUT ROWID;
+"""
+
+
+def file_hash(path: str | Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_state(path: str | Path) -> tuple[int, int, str]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size, file_hash(path)
+
+
+class BuildCache:
+    def __init__(self, tool: str, config: dict | None = None, path: str | Path = DEFAULT_PATH,
+                 root: str | Path | None = None):
+        self.namespace = tool
+        self.root = os.path.abspath(root) if root else None
+        if config:
+            digest = hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+            self.namespace += ":" + digest[:12]
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript(SCHEMA)
+        self.pending = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, inputs: list[str | Path] = ()) -> dict | list | None:
+        """Stored result for key, or None if it is missing or any recorded file changed."""
+        row = self.conn.execute("SELECT result FROM entries WHERE namespace = ? AND key = ?",
+                                (self.namespace, key)).fetchone()
+        recorded = self.conn.execute(
+            "SELECT path, role, mtime_ns, size, hash FROM files WHERE namespace = ? AND key = ?",
+            (self.namespace, key)).fetchall()
+        wanted = {self._stored_path(p) for p in inputs}
+        if row is None or not wanted <= {r[0] for r in recorded if r[1] == "input"}:
+            self.misses += 1
+            return None
+
+        for stored, role, mtime_ns, size, digest in recorded:
+            path = self._disk_path(stored)
+            try:
+                st = os.stat(path)
+            except OSError:
+                self.misses += 1
+                return None
+            if st.st_mtime_ns == mtime_ns and st.st_size == size:
+                continue
+            if st.st_size != size or file_hash(path) != digest:
+                self.misses += 1
+                return None
+            # Same bytes, new mtime: remember it so the next check is stat-only
+            self.conn.execute(
+                "UPDATE files SET mtime_ns = ? WHERE namespace = ? AND key = ? AND path = ? AND role = ?",
+                (st.st_mtime_ns, self.namespace, key, stored, role))
+            self._dirty()
+
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, result: dict | list, inputs: list[str | Path] = (), outputs: list[str | Path] = ()):
+        """Record result for key along with the current state of its files."""
+        self.invalidate(key)
+        self.conn.execute("INSERT INTO entries VALUES (?, ?, ?)", (self.namespace, key, json.dumps(result)))
+        rows = [(self.namespace, key, self._stored_path(p), role, *file_state(p))
+                for role, paths in (("input", inputs), ("output", outputs)) for p in paths]
+        self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        self._dirty()
+
+    def invalidate(self, key: str) -> list[str]:
+        """Drop key; returns the output paths it had recorded so callers can clean them up."""
+        outputs = [self._disk_path(r[0]) for r in self.conn.execute(
+            "SELECT path FROM files WHERE namespace = ? AND key = ? AND role = 'output'", (self.namespace, key))]
+        self.conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (self.namespace, key))
+        self.conn.execute("DELETE FROM files WHERE namespace = ? AND key = ?", (self.namespace, key))
+        return outputs
+
+    def _stored_path(self, path: str | Path) -> str:
+        if self.root is None:
+            return str(path)
+        return os.path.relpath(os.path.abspath(path), self.root).replace("\\", "/")
+
+    def _disk_path(self, stored: str) -> str:
+        if self.root is None:
+            return stored
+        return os.path.join(self.root, stored)
+
+    def _dirty(self):
+        self.pending += 1
+        if self.pending >= COMMIT_EVERY:
+            self.conn.commit()
+            self.pending = 0
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def summary(self) -> str:
+        return f"cache: {self.hits} unchanged, {self.misses} processed"
+
+
+class NullCache:
+    """Stand-in for --no-cache: never hits, never stores."""
+
+    def get(self, key, inputs=()):
+        return None
+
+    def put(self, key, result, inputs=(), outputs=()):
+        pass
+
+    def invalidate(self, key):
+        return []
+
+    def close(self):
+        pass
+
+    def summary(self) -> str:
+        return "cache: disabled"
+
+
+def open_cache(tool: str, enabled: bool = True, config: dict | None = None,
+               path: str | Path | None = None, root: str | Path | None = None) -> BuildCache | NullCache:
+    if not enabled:
+        return NullCache()
+    return BuildCache(tool, config, path or DEFAULT_PATH, root)
+
+
+def add_arguments(parser):
+    parser.add_argument("--no-cache", action="store_true", help="Reprocess everything and leave the build cache alone")
+    parser.add_argument("--cache", type=str, default=None, metavar="PATH",
+                        help=f"Build cache DB (default: {DEFAULT_PATH.relative_to(SCRIPT_DIR.parent)})")
@@ -1,55 +1,335 @@
+"""
+Count sprites in sprite sheets by finding connected components of
+non-transparent pixels (4-connected, alpha > 0).
+
+Images are decoded on the shared image_pipeline thread pool, so a whole
+directory of sheets can be scanned at once. Counts are kept in the shared
+build cache (build_cache.py), so unchanged sheets are not decoded again.
+
+Labelling works on horizontal runs of opaque pixels rather than single
+pixels: runs are found with NumPy, runs that overlap on adjacent rows are
+joined, and components are merged by min-label propagation over those
+joins.
+
+With --frames each sheet also gets a <sheet>.frames.json next to it that
+describes its animation frames, so SpriteGen and the client can slice the
+sheet without scanning it at runtime:
+
+  - sprite boxes are clustered into rows and columns (boxes whose spans
+    overlap on an axis share a band);
+  - when every band fits a uniform pitch the sheet is a grid: the cell
+    size, offset and row/column counts are recorded, boxes in the same
+    cell form one frame and each frame's rect is its cell;
+  - otherwise each sprite is a frame with its tight box;
+  - frames are numbered row-major and hashed over their pixels (fully
+    transparent pixels count as zero), so repeated frames point at the
+    first copy through duplicateOf.
+
+    {"version": 1, "image": "walk.png", "width": 256, "height": 128,
+     "grid": {"cellWidth": 32, "cellHeight": 32, "columns": 8, "rows": 4, "offsetX": 0, "offsetY": 0},
+     "frames": [{"index": 0, "row": 0, "column": 0, "x": 0, "y": 0, "width": 32, "height": 32,
+                 "trim": {"x": 4, "y": 4, "width": 24, "height": 24}, "hash": "9f1c...", "duplicateOf": null}, ...],
+     "uniqueFrames": 30}
+
+Usage:
+    python count_sprites.py sheet.png
+    python count_sprites.py ../src/Starfield2026.Assets --workers 8
+    python count_sprites.py ../src/Starfield2026.Assets --no-cache
+    python count_sprites.py ../src/Starfield2026.Assets/Sprites --frames
+"""
+
 import argparse
-from PIL import Image
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+import build_cache
+import image_pipeline
+import telemetry
+
+CACHE_CONFIG = {"version": 1}
+FRAMES_VERSION = 1
+FRAMES_SUFFIX = ".frames.json"
+PART_AREA = 0.25  # sprites smaller than this fraction of the largest don't shape the grid
+
+
+# --- Labelling ---
+
+def find_runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(row, start, end) of every horizontal run of True in mask, end exclusive, row-major order."""
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return rows, starts, ends
+
+
+def run_links(rows: np.ndarray, starts: np.ndarray, ends: np.ndarray, width: int) -> tuple[np.ndarray, np.ndarray]:
+    """Index pairs of runs on adjacent rows that share at least one column."""
+    stride = width + 1
+    start_keys = rows * stride + starts
+    end_keys = rows * stride + ends
+    below = (rows + 1) * stride
+    # Runs on the next row overlapping run i are exactly [first, last) in row-major order
+    first = np.searchsorted(end_keys, below + starts, side="right")
+    last = np.searchsorted(start_keys, below + ends, side="left")
+    counts = np.maximum(last - first, 0)
+    upper = np.repeat(np.arange(len(rows)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    lower = np.repeat(first, counts) + offsets
+    return upper, lower
+
+
+def label_runs(count: int, upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """Component label (smallest member index) for each of `count` runs."""
+    labels = np.arange(count)
+    while True:
+        a, b = labels[upper], labels[lower]
+        low = np.minimum(a, b)
+        hooked = labels.copy()
+        np.minimum.at(hooked, a, low)
+        np.minimum.at(hooked, b, low)
+        while True:
+            jumped = hooked[hooked]
+            if np.array_equal(jumped, hooked):
+                break
+            hooked = jumped
+        if np.array_equal(hooked, labels):
+            return labels
+        labels = hooked
+
+
+def label_sprites(mask: np.ndarray) -> np.ndarray:
+    """Bounding boxes (x0, y0, x1, y1), exclusive max, of each sprite in mask, top-to-bottom."""
+    rows, starts, ends = find_runs(mask)
+    if not len(rows):
+        return np.zeros((0, 4), dtype=np.int64)
+    upper, lower = run_links(rows, starts, ends, mask.shape[1])
+    labels = label_runs(len(rows), upper, lower)
+
+    roots, component = np.unique(labels, return_inverse=True)
+    boxes = np.empty((len(roots), 4), dtype=np.int64)
+    boxes[:, :2] = np.iinfo(np.int64).max
+    boxes[:, 2:] = -1
+    np.minimum.at(boxes[:, 0], component, starts)
+    np.minimum.at(boxes[:, 1], component, rows)
+    np.maximum.at(boxes[:, 2], component, ends)
+    np.maximum.at(boxes[:, 3], component, rows + 1)
+    return boxes
+
+
+def sprite_boxes(img: image_pipeline.Decoded) -> np.ndarray:
+    """Pipeline stage: sprite bounding boxes from the alpha channel."""
+    return label_sprites(img.alpha > 0)
+
+
+# --- Frames ---
+
+def bands(lo: np.ndarray, hi: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cluster [lo, hi) spans that overlap into bands: (band of each span, band lo, band hi)."""
+    order = np.argsort(lo, kind="stable")
+    reach = np.maximum.accumulate(hi[order])
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = lo[order][1:] >= reach[:-1]
+    band = np.empty(len(order), dtype=np.int64)
+    band[order] = np.cumsum(starts) - 1
+    count = int(band.max()) + 1 if len(band) else 0
+    band_lo = np.full(count, np.iinfo(np.int64).max)
+    band_hi = np.full(count, -1)
+    np.minimum.at(band_lo, band, lo)
+    np.maximum.at(band_hi, band, hi)
+    return band, band_lo, band_hi
+
+
+def grid_pitch(band_lo: np.ndarray, band_hi: np.ndarray, extent: int) -> tuple[int, int] | None:
+    """(cell size, offset) that puts every band in a cell of its own, or None when the bands are not on a grid."""
+    count = len(band_lo)
+    candidates = []
+    if count > 1:
+        pitch = float(np.median(np.diff((band_lo + band_hi) / 2)))
+        cells = max(1, round(extent / pitch))
+        candidates += [extent // cells, int(round(pitch))]  # prefer the pitch that tiles the sheet exactly
+    if extent % count == 0:
+        candidates.append(extent // count)
+    widest = int((band_hi - band_lo).max())
+    for pitch in candidates:
+        if pitch < max(widest, 1):
+            continue
+        for offset in dict.fromkeys((0, extent % pitch, int(band_lo[0]) % pitch)):
+            first = (band_lo - offset) // pitch
+            last = (band_hi - 1 - offset) // pitch
+            if (band_lo[0] >= offset and offset + (last[-1] + 1) * pitch <= extent
+                    and np.array_equal(first, last) and (np.diff(first) > 0).all()):
+                return pitch, offset
+    return None
+
+
+def frame_hash(rgba: np.ndarray, x0: int, y0: int, x1: int, y1: int) -> str:
+    block = rgba[y0:y1, x0:x1].copy()
+    block[block[..., 3] == 0] = 0
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(np.array(block.shape[:2], dtype="<u4").tobytes())
+    digest.update(block.tobytes())
+    return digest.hexdigest()
+
+
+def detect_frames(boxes: np.ndarray, rgba: np.ndarray) -> dict:
+    """Grid, frames and duplicates of a sheet from its sprite boxes (see module docstring)."""
+    height, width = rgba.shape[:2]
+    meta = {"version": FRAMES_VERSION, "image": None, "width": width, "height": height,
+            "grid": None, "frames": [], "uniqueFrames": 0}
+    if not len(boxes):
+        return meta
+
+    # Detached bits (a hat, a spark) would split cells into extra bands: lay out the grid from the large sprites
+    area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    large = boxes[area >= PART_AREA * area.max()]
+    row, row_lo, row_hi = bands(large[:, 1], large[:, 3])
+    _, col_lo, col_hi = bands(large[:, 0], large[:, 2])
+    pitch_x = grid_pitch(col_lo, col_hi, width)
+    pitch_y = grid_pitch(row_lo, row_hi, height)
+
+    frames = []
+    if pitch_x and pitch_y:
+        (cell_w, off_x), (cell_h, off_y) = pitch_x, pitch_y
+        meta["grid"] = {"cellWidth": cell_w, "cellHeight": cell_h,
+                        "columns": (width - off_x) // cell_w, "rows": (height - off_y) // cell_h,
+                        "offsetX": off_x, "offsetY": off_y}
+        centers = (boxes[:, :2] + boxes[:, 2:]) // 2
+        cells = np.stack([np.clip((centers[:, 1] - off_y) // cell_h, 0, meta["grid"]["rows"] - 1),
+                          np.clip((centers[:, 0] - off_x) // cell_w, 0, meta["grid"]["columns"] - 1)], axis=1)
+        keys, member = np.unique(cells, axis=0, return_inverse=True)
+        member = member.reshape(-1)
+        trim = np.empty((len(keys), 4), dtype=np.int64)
+        trim[:, :2] = np.iinfo(np.int64).max
+        trim[:, 2:] = -1
+        for axis, reduce in ((0, np.minimum), (1, np.minimum), (2, np.maximum), (3, np.maximum)):
+            reduce.at(trim[:, axis], member, boxes[:, axis])
+        for (r, c), (x0, y0, x1, y1) in zip(keys.tolist(), trim.tolist()):
+            cx, cy = off_x + c * cell_w, off_y + r * cell_h
+            frames.append({"row": r, "column": c, "x": cx, "y": cy, "width": cell_w, "height": cell_h,
+                           "trim": {"x": x0, "y": y0, "width": x1 - x0, "height": y1 - y0}})
+    else:
+        row, _, _ = bands(boxes[:, 1], boxes[:, 3])
+        column = {}
+        for i in np.lexsort((boxes[:, 0], row)):
+            x0, y0, x1, y1 = boxes[i].tolist()
+            r = int(row[i])
+            column[r] = column.get(r, -1) + 1
+            frames.append({"row": r, "column": column[r],
+                           "x": x0, "y": y0, "width": x1 - x0, "height": y1 - y0})
+
+    first_seen: dict[str, int] = {}
+    for index, frame in enumerate(frames):
+        x, y = frame["x"], frame["y"]
+        digest = frame_hash(rgba, x, y, x + frame["width"], y + frame["height"])
+        frame.update(index=index, hash=digest, duplicateOf=first_seen.get(digest))
+        first_seen.setdefault(digest, index)
+    meta["frames"] = [{"index": f.pop("index"), **f} for f in frames]
+    meta["uniqueFrames"] = len(first_seen)
+    return meta
+
+
+def sheet_frames(img: image_pipeline.Decoded) -> tuple[int, dict]:
+    """Pipeline stage for --frames: (sprite count, frame metadata)."""
+    boxes = label_sprites(img.alpha > 0)
+    meta = detect_frames(boxes, np.asarray(img.image.convert("RGBA")))
+    meta["image"] = img.path.name
+    return len(boxes), meta
+
+
+def frames_path(image: Path) -> Path:
+    return image.with_name(image.stem + FRAMES_SUFFIX)
+
+
+def write_frames(image: Path, meta: dict) -> Path:
+    out = frames_path(image)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+        f.write("\n")
+    return out
+
+
+# --- Main ---
+
+def count_sheets(paths: list[str], workers: int = image_pipeline.DEFAULT_WORKERS,
+                 prefetch: int = image_pipeline.DEFAULT_PREFETCH,
+                 cache: build_cache.BuildCache | build_cache.NullCache | None = None,
+                 frames: bool = False) -> dict[str, int | None]:
+    """Count sprites in every image under `paths`; None for images that failed to open.
+
+    With frames=True also writes <sheet>.frames.json next to each sheet.
+    """
+    cache = cache or build_cache.NullCache()
+    images = image_pipeline.find_images(paths)
+    cache_suffix = ":frames" if frames else ""
+    cached = {}
+    for path in images:
+        hit = cache.get(str(path.resolve()) + cache_suffix, inputs=[path.resolve()])
+        if hit is not None:
+            cached[path] = hit
+    telemetry.count("cached", len(cached))
+
+    stages = {"frames": sheet_frames} if frames else {"label": sprite_boxes}
+    pipeline = image_pipeline.Pipeline(stages, workers, prefetch)
+    decoded = pipeline.run(p for p in images if p not in cached)
+    counts = {}
+    for path in images:
+        if path in cached:
+            entry = cached[path]
+        else:
+            result = next(decoded)
+            if result.error:
+                print(f"Error opening image {result.path}: {result.error}")
+                counts[str(path)] = None
+                continue
+            if frames:
+                sprite_count, meta = result.values["frames"]
+                sidecar = write_frames(path, meta)
+                grid = meta["grid"]
+                entry = {"sprites": sprite_count, "frames": len(meta["frames"]), "unique": meta["uniqueFrames"],
+                         "grid": f"{grid['columns']}x{grid['rows']} of {grid['cellWidth']}x{grid['cellHeight']}"
+                                 if grid else None}
+                cache.put(str(path.resolve()) + cache_suffix, entry, inputs=[path.resolve()], outputs=[sidecar])
+            else:
+                entry = {"sprites": len(result.values["label"])}
+                cache.put(str(path.resolve()), entry, inputs=[path.resolve()])
+        sprite_count = entry["sprites"]
+        telemetry.count("sprites", sprite_count)
+        print(f"Found {sprite_count} sprites in {path}")
+        if frames:
+            telemetry.count("frames", entry["frames"])
+            telemetry.count("duplicate_frames", entry["frames"] - entry["unique"])
+            layout = f"grid {entry['grid']}" if entry["grid"] else "no grid"
+            print(f"  {layout}, {entry['frames']} frames ({entry['frames'] - entry['unique']} duplicates)"
+                  f" -> {frames_path(path).name}")
+        counts[str(path)] = sprite_count
+    return counts
+
 
 def count_sprites(image_path):
     """
     Counts the number of sprites in a sprite sheet by finding connected components
     of non-transparent pixels.
     """
-    try:
-        img = Image.open(image_path).convert("RGBA")
-    except Exception as e:
-        print(f"Error opening image: {e}")
-        return
-
-    width, height = img.size
-    pixels = img.load()
-    visited = set()
-    sprite_count = 0
-
-    def get_neighbors(x, y):
-        neighbors = []
-        if x > 0: neighbors.append((x - 1, y))
-        if x < width - 1: neighbors.append((x + 1, y))
-        if y > 0: neighbors.append((x, y - 1))
-        if y < height - 1: neighbors.append((x, y + 1))
-        return neighbors
-
-    for y in range(height):
-        for x in range(width):
-            if (x, y) in visited:
-                continue
+    return count_sheets([image_path], workers=1, prefetch=1)[str(Path(image_path))]
 
-            r, g, b, a = pixels[x, y]
-            if a > 0:  # Non-transparent pixel found
-                sprite_count += 1
-                # BFS/DFS to mark all connected non-transparent pixels
-                queue = [(x, y)]
-                visited.add((x, y))
-                while queue:
-                    cx, cy = queue.pop(0)
-                    for nx, ny in get_neighbors(cx, cy):
-                        if (nx, ny) not in visited:
-                            nr, ng, nb, na = pixels[nx, ny]
-                            if na > 0:
-                                visited.add((nx, ny))
-                                queue.append((nx, ny))
-    
-    print(f"Found {sprite_count} sprites in {image_path}")
-    return sprite_count
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Count sprites in a sprite sheet.")
-    parser.add_argument("image_path", help="Path to the sprite sheet image.")
+    parser = argparse.ArgumentParser(description="Count sprites in sprite sheets.")
+    parser.add_argument("paths", nargs="+", help="Sprite sheet images or directories to scan for PNGs.")
+    image_pipeline.add_arguments(parser)
+    build_cache.add_arguments(parser)
+    parser.add_argument("--frames", action="store_true",
+                        help=f"Detect animation frames and write <sheet>{FRAMES_SUFFIX} next to each sheet")
+    telemetry.add_arguments(parser)
     args = parser.parse_args()
-    count_sprites(args.image_path)
+    telemetry.setup("count_sprites", trace=args.trace, summary=not args.no_summary)
+    cache = build_cache.open_cache("count_sprites", enabled=not args.no_cache, config=CACHE_CONFIG, path=args.cache)
+    count_sheets(args.paths, args.workers, args.prefetch, cache, args.frames)
+    cache.close()
+    print(cache.summary())
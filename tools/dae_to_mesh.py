@@ -0,0 +1,791 @@
+#!/usr/bin/env python3
+"""
+Convert COLLADA model DAEs into a compact binary mesh (.sfmesh).
+
+The game and editors parse every model DAE in full as XML on each load.
+This converter streams a DAE once with iterparse: each <float_array>,
+<p>, <vcount> and <v> inside a <geometry> or <controller> is turned into
+a NumPy array the moment its end tag is read and its text is dropped;
+those anywhere else (animation keys) are dropped unparsed. A <geometry> /
+<controller> is released, with all of its arrays, as soon as it has been
+converted. The resulting mesh:
+
+  - has one shared vertex buffer per file; polylists are fan-triangulated
+    and identical corners (position, normal, uv, color, skin) are merged
+  - orders each submesh's triangles for post-transform vertex cache reuse
+    (Tipsify, cache of CACHE_SIZE) and renumbers vertices in first-use order
+  - keeps the 4 strongest skin influences per vertex, normalized, like
+    SkinnedDaeModel.VertexInfluence.FromPairs
+  - stores UVs as written in the DAE (V is not flipped) and ignores
+    bind_shape_matrix, matching the runtime loaders
+
+File layout (little endian, every section 4-byte aligned):
+
+  header     magic "SFMS", u16 version, u16 flags, u32 vertex_count,
+             u32 index_count, u16 submesh_count, u16 joint_count,
+             u16 bone_count, u16 reserved
+  submeshes  per submesh: str name, str material, u32 first_index, u32 index_count
+  joints     per skin joint: str name, f32[16] inverse bind matrix (as in the DAE)
+  bones      per JOINT node: str name, i16 parent, f32[16] local matrix
+  streams    f32x3 positions, [f32x3 normals], [f32x2 uvs], [u8x4 colors],
+             [u16x4 joints, f32x4 weights], u16 or u32 indices
+
+  str = u16 byte length + UTF-8. Optional streams follow the FLAG_* bits.
+
+With --manifest, the manifest.json next to each converted modelFile gets
+"meshFile" and "meshFormat": "sfmesh". modelFile is left pointing at the
+DAE, which the runtime and the clip tools still read for skeletons.
+
+Usage:
+    python dae_to_mesh.py                                # every *.dae model under src/Starfield2026.Assets
+    python dae_to_mesh.py path/to/Grass.dae -o out/
+    python dae_to_mesh.py path/to/BattleBG -o out/       # out/<folder>/<name>.sfmesh, mirroring BattleBG
+    python dae_to_mesh.py path/to/Models --manifest       # also record meshFile in manifests
+    python dae_to_mesh.py --verify                       # read each written mesh back and compare
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+import asset_paths
+import build_cache
+import telemetry
+
+ASSETS_DIR = asset_paths.default_root()
+
+MAGIC = b"SFMS"
+VERSION = 1
+MESH_FORMAT = "sfmesh"
+HEADER = struct.Struct("<4sHHIIHHHH")
+
+FLAG_NORMAL = 1
+FLAG_UV = 2
+FLAG_COLOR = 4
+FLAG_SKIN = 8
+FLAG_INDEX32 = 16
+
+CACHE_SIZE = 16
+MAX_INFLUENCES = 4
+CACHE_VERSION = 1
+
+IDENTITY = np.eye(4, dtype=np.float32).ravel()
+
+
+@dataclass
+class Submesh:
+    name: str
+    material: str
+    first_index: int
+    index_count: int
+
+
+@dataclass
+class Mesh:
+    positions: np.ndarray                      # (n, 3) f32
+    indices: np.ndarray                        # (m,) u32
+    normals: np.ndarray | None = None          # (n, 3) f32
+    uvs: np.ndarray | None = None              # (n, 2) f32
+    colors: np.ndarray | None = None           # (n, 4) u8
+    joints: np.ndarray | None = None           # (n, 4) u16
+    weights: np.ndarray | None = None          # (n, 4) f32
+    submeshes: list[Submesh] = field(default_factory=list)
+    joint_names: list[str] = field(default_factory=list)
+    inverse_binds: np.ndarray | None = None    # (joints, 16) f32
+    bones: list[tuple[str, int, np.ndarray]] = field(default_factory=list)
+
+    @property
+    def flags(self) -> int:
+        flags = 0
+        if self.normals is not None:
+            flags |= FLAG_NORMAL
+        if self.uvs is not None:
+            flags |= FLAG_UV
+        if self.colors is not None:
+            flags |= FLAG_COLOR
+        if self.joints is not None:
+            flags |= FLAG_SKIN
+        if len(self.positions) > 0xFFFF:
+            flags |= FLAG_INDEX32
+        return flags
+
+
+def _local(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _floats(text: str | None) -> np.ndarray:
+    return np.array(text.split(), dtype=np.float32) if text else np.zeros(0, dtype=np.float32)
+
+
+def _ints(text: str | None) -> np.ndarray:
+    return np.array(text.split(), dtype=np.int64) if text else np.zeros(0, dtype=np.int64)
+
+
+# --- Parse ---
+
+@dataclass
+class Primitive:
+    geometry: str                   # geometry name, used for the submesh name
+    geometry_id: str                # controllers reference geometries by id
+    material: str
+    columns: dict[str, np.ndarray]  # semantic -> per-corner values, corners in triangle order
+    position_index: np.ndarray      # per-corner index into the geometry's positions (for skinning)
+
+
+def triangulate(vcount: np.ndarray) -> np.ndarray:
+    """Corner positions of a fan triangulation of polygons with `vcount` corners each."""
+    vcount = vcount[vcount >= 3]
+    if len(vcount) == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.cumsum(vcount)[:-1]))
+    fans = vcount - 2
+    poly = np.repeat(np.arange(len(vcount)), fans)
+    k = np.arange(fans.sum()) - np.repeat(np.cumsum(fans) - fans, fans) + 1
+    base = starts[poly]
+    return np.stack((base, base + k, base + k + 1), axis=1).ravel()
+
+
+def read_geometry(geom: ET.Element, ns: str, arrays: dict) -> list[Primitive]:
+    """Triangulated primitives of one <geometry>; `arrays` holds the parsed number arrays by element."""
+    mesh = geom.find(ns + "mesh")
+    if mesh is None:
+        return []
+    sources = {}
+    for src in mesh.findall(ns + "source"):
+        fa = src.find(ns + "float_array")
+        acc = src.find(f"{ns}technique_common/{ns}accessor")
+        if fa is None or fa not in arrays:
+            continue
+        stride = int(acc.get("stride", 1)) if acc is not None else 1
+        data = arrays.pop(fa)
+        sources[src.get("id")] = data[: len(data) // stride * stride].reshape(-1, stride)
+
+    vertices = mesh.find(ns + "vertices")
+    vertex_inputs = {}
+    if vertices is not None:
+        for inp in vertices.findall(ns + "input"):
+            vertex_inputs.setdefault(inp.get("semantic"), inp.get("source", "").lstrip("#"))
+
+    geometry_id = geom.get("id") or ""
+    name = geom.get("name") or geometry_id
+    primitives = []
+    for prim in mesh:
+        kind = _local(prim.tag)
+        if kind not in ("triangles", "polylist"):
+            continue
+        p_elem = prim.find(ns + "p")
+        if p_elem is None or p_elem not in arrays:
+            continue
+        inputs = [(i.get("semantic"), i.get("source", "").lstrip("#"), int(i.get("offset", 0)))
+                  for i in prim.findall(ns + "input")]
+        if not inputs:
+            continue
+        stride = max(offset for _s, _src, offset in inputs) + 1
+        p = arrays.pop(p_elem)
+        p = p[: len(p) // stride * stride].reshape(-1, stride)
+        if kind == "polylist":
+            vcount_elem = prim.find(ns + "vcount")
+            vcount = arrays.pop(vcount_elem) if vcount_elem is not None and vcount_elem in arrays else None
+            corners = p[triangulate(vcount)] if vcount is not None else p[: len(p) // 3 * 3]
+        else:
+            corners = p[: len(p) // 3 * 3]
+
+        semantic_rows = {}
+        position_index = None
+        for semantic, source, offset in inputs:
+            if semantic == "VERTEX":
+                position_index = corners[:, offset]
+                for vsem, vsrc in vertex_inputs.items():
+                    semantic_rows.setdefault(vsem, (vsrc, position_index))
+            else:
+                semantic_rows.setdefault(semantic, (source, corners[:, offset]))
+        if position_index is None or "POSITION" not in semantic_rows:
+            continue
+
+        columns = {}
+        for semantic, (source, rows) in semantic_rows.items():
+            data = sources.get(source)
+            if data is None or len(rows) == 0 or rows.max() >= len(data):
+                continue
+            columns[semantic] = data[rows]
+        if "POSITION" not in columns:
+            continue
+        primitives.append(Primitive(name, geometry_id, prim.get("material", ""), columns, position_index))
+    return primitives
+
+
+@dataclass
+class Skin:
+    joint_names: list[str]
+    inverse_binds: np.ndarray  # (joints, 16)
+    joints: np.ndarray         # (positions, 4) index into joint_names
+    weights: np.ndarray        # (positions, 4)
+
+
+def top_influences(vcount: np.ndarray, joint: np.ndarray, weight: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Strongest MAX_INFLUENCES (joint, weight) pairs per vertex, weights normalized to 1."""
+    n = len(vcount)
+    owner = np.repeat(np.arange(n), vcount)
+    keep = joint >= 0  # -1 binds to the bind shape, not a joint
+    owner, joint, weight = owner[keep], joint[keep], weight[keep]
+    order = np.lexsort((-weight, owner))
+    owner, joint, weight = owner[order], joint[order], weight[order]
+    first = np.searchsorted(owner, np.arange(n))
+    rank = np.arange(len(owner)) - first[owner]
+    keep = rank < MAX_INFLUENCES
+    joints = np.zeros((n, MAX_INFLUENCES), dtype=np.int64)
+    weights = np.zeros((n, MAX_INFLUENCES), dtype=np.float32)
+    joints[owner[keep], rank[keep]] = joint[keep]
+    weights[owner[keep], rank[keep]] = weight[keep]
+    total = weights.sum(axis=1)
+    empty = total <= 0
+    weights[~empty] /= total[~empty, None]
+    weights[empty, 0] = 1.0
+    return joints, weights
+
+
+def read_skin(skin: ET.Element, ns: str, arrays: dict) -> Skin | None:
+    sources = {s.get("id"): s for s in skin.findall(ns + "source")}
+    joint_input = skin.find(f"{ns}joints/{ns}input[@semantic='JOINT']")
+    ibm_input = skin.find(f"{ns}joints/{ns}input[@semantic='INV_BIND_MATRIX']")
+    vw = skin.find(ns + "vertex_weights")
+    if joint_input is None or vw is None:
+        return None
+    names_elem = sources.get(joint_input.get("source", "").lstrip("#"))
+    name_array = names_elem.find(ns + "Name_array") if names_elem is not None else None
+    names = (name_array.text or "").split() if name_array is not None else []
+
+    ibm = np.tile(IDENTITY, (len(names), 1))
+    ibm_src = sources.get(ibm_input.get("source", "").lstrip("#")) if ibm_input is not None else None
+    ibm_array = ibm_src.find(ns + "float_array") if ibm_src is not None else None
+    if ibm_array is not None and ibm_array in arrays:
+        data = arrays.pop(ibm_array)
+        count = min(len(names), len(data) // 16)
+        ibm[:count] = data[: count * 16].reshape(-1, 16)
+
+    inputs = {i.get("semantic"): (i.get("source", "").lstrip("#"), int(i.get("offset", 0)))
+              for i in vw.findall(ns + "input")}
+    weight_src = sources.get(inputs.get("WEIGHT", ("", 0))[0])
+    weight_array = weight_src.find(ns + "float_array") if weight_src is not None else None
+    vcount_elem, v_elem = vw.find(ns + "vcount"), vw.find(ns + "v")
+    if weight_array not in arrays or vcount_elem not in arrays or v_elem not in arrays:
+        return None
+    weight_values = arrays.pop(weight_array)
+    vcount, v = arrays.pop(vcount_elem), arrays.pop(v_elem)
+    stride = max(offset for _src, offset in inputs.values()) + 1
+    pairs = v[: int(vcount.sum()) * stride].reshape(-1, stride)
+    joint = pairs[:, inputs.get("JOINT", ("", 0))[1]]
+    weight_index = pairs[:, inputs.get("WEIGHT", ("", 1))[1]]
+    weight = weight_values[np.clip(weight_index, 0, max(len(weight_values) - 1, 0))]
+    joint = np.where(joint < len(names), joint, -1)
+    joints, weights = top_influences(vcount, joint, weight)
+    return Skin(names, ibm, joints, weights)
+
+
+def parse_dae(path: str | Path) -> tuple[list[Primitive], dict[str, Skin], list[tuple[str, int, np.ndarray]]]:
+    """Stream a DAE: primitives, skins keyed by geometry id, and JOINT bones (name, parent, matrix)."""
+    arrays: dict[ET.Element, np.ndarray] = {}  # number arrays of the open geometry/controller only
+    primitives, skins, bones = [], {}, []
+    bone_stack: list[int | None] = []
+    ns = ""
+    collecting = False
+    for event, elem in ET.iterparse(str(path), events=("start", "end")):
+        tag = _local(elem.tag)
+        if event == "start":
+            if tag == "COLLADA" and elem.tag.startswith("{"):
+                ns = elem.tag[: elem.tag.index("}") + 1]
+            elif tag in ("geometry", "controller"):
+                collecting = True
+            elif tag == "node":
+                if elem.get("type") == "JOINT":
+                    parent = next((b for b in reversed(bone_stack) if b is not None), -1)
+                    bones.append([elem.get("name") or elem.get("sid") or elem.get("id") or "", parent, IDENTITY])
+                    bone_stack.append(len(bones) - 1)
+                else:
+                    bone_stack.append(None)
+            continue
+
+        if tag in ("float_array", "p", "vcount", "v"):
+            # Animation keys and the like are never converted: drop their text unparsed
+            if collecting:
+                arrays[elem] = _floats(elem.text) if tag == "float_array" else _ints(elem.text)
+            elem.text = None
+        elif tag == "geometry":
+            with telemetry.stage("geometry"):
+                primitives.extend(read_geometry(elem, ns, arrays))
+            arrays.clear()  # sources no primitive used
+            collecting = False
+            elem.clear()
+        elif tag == "controller":
+            skin_elem = elem.find(ns + "skin")
+            if skin_elem is not None:
+                skin = read_skin(skin_elem, ns, arrays)
+                if skin is not None:
+                    skins[skin_elem.get("source", "").lstrip("#")] = skin
+            arrays.clear()  # skin sources read_skin did not use
+            collecting = False
+            elem.clear()
+        elif tag == "node":
+            index = bone_stack.pop()
+            if index is not None:
+                matrix = elem.find(ns + "matrix")
+                if matrix is not None:
+                    values = _floats(matrix.text)
+                    if len(values) == 16:
+                        bones[index][2] = values
+        elif tag in ("library_geometries", "library_controllers", "library_animations"):
+            elem.clear()
+    return primitives, skins, [tuple(b) for b in bones]
+
+
+# --- Build ---
+
+def tipsify(indices: np.ndarray, vertex_count: int, cache_size: int = CACHE_SIZE) -> np.ndarray:
+    """Reorder triangles for vertex cache reuse (Sander, Nehab & Barczak 2007)."""
+    tris = indices.reshape(-1, 3)
+    if len(tris) < 2:
+        return indices
+    flat = indices.astype(np.int64)
+    adjacency = (np.argsort(flat, kind="stable") // 3).tolist()
+    counts = np.bincount(flat, minlength=vertex_count)
+    offsets = np.concatenate(([0], np.cumsum(counts))).tolist()
+    live = counts.tolist()
+    tri_list = tris.tolist()
+    cache_time = [0] * vertex_count
+    emitted = bytearray(len(tri_list))
+    dead_end: list[int] = []
+    out: list[int] = []
+    stamp = cache_size + 1
+    cursor = 0
+    fan = tri_list[0][0]
+
+    while fan >= 0:
+        candidates = []
+        for t in adjacency[offsets[fan]:offsets[fan + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = 1
+            for v in tri_list[t]:
+                out.append(v)
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if stamp - cache_time[v] > cache_size:
+                    cache_time[v] = stamp
+                    stamp += 1
+
+        # Next fan: the candidate still in cache after its remaining triangles, oldest first
+        fan, best = -1, -1
+        for v in candidates:
+            if live[v] > 0:
+                priority = stamp - cache_time[v] if stamp - cache_time[v] + 2 * live[v] <= cache_size else 0
+                if priority > best:
+                    fan, best = v, priority
+        if fan < 0:
+            while dead_end:
+                v = dead_end.pop()
+                if live[v] > 0:
+                    fan = v
+                    break
+        if fan < 0:
+            while cursor < vertex_count and live[cursor] == 0:
+                cursor += 1
+            if cursor < vertex_count:
+                fan = cursor
+    return np.array(out, dtype=indices.dtype)
+
+
+def acmr(indices: np.ndarray, cache_size: int = CACHE_SIZE) -> float:
+    """Average cache misses per triangle for a FIFO post-transform cache."""
+    if len(indices) < 3:
+        return 0.0
+    cache: deque = deque()
+    cached: set = set()
+    misses = 0
+    for v in indices.tolist():
+        if v in cached:
+            continue
+        misses += 1
+        cache.append(v)
+        cached.add(v)
+        if len(cache) > cache_size:
+            cached.discard(cache.popleft())
+    return misses / (len(indices) // 3)
+
+
+def build_mesh(primitives: list[Primitive], skins: dict[str, Skin],
+               bones: list[tuple[str, int, np.ndarray]]) -> Mesh:
+    """Merge primitives into one deduplicated, cache-ordered vertex/index buffer."""
+    present = set().union(*(p.columns for p in primitives)) if primitives else set()
+    has_normal, has_uv, has_color = "NORMAL" in present, "TEXCOORD" in present, "COLOR" in present
+    skinned = any(p.geometry_id in skins for p in primitives)
+
+    joint_names: list[str] = []
+    joint_index: dict[str, int] = {}
+    inverse_binds = []
+    for skin in skins.values():
+        for name, ibm in zip(skin.joint_names, skin.inverse_binds):
+            if name not in joint_index:
+                joint_index[name] = len(joint_names)
+                joint_names.append(name)
+                inverse_binds.append(ibm)
+
+    blocks, groups = [], []
+    for prim in primitives:
+        n = len(prim.position_index)
+        cols = [prim.columns["POSITION"][:, :3]]
+        if has_normal:
+            cols.append(_column(prim, "NORMAL", 3, (0.0, 1.0, 0.0)))
+        if has_uv:
+            cols.append(_column(prim, "TEXCOORD", 2, (0.0, 0.0)))
+        if has_color:
+            cols.append(_column(prim, "COLOR", 4, (1.0, 1.0, 1.0, 1.0)))
+        if skinned:
+            skin = skins.get(prim.geometry_id)
+            if skin is not None:
+                remap = np.array([joint_index[name] for name in skin.joint_names] or [0])
+                rows = np.clip(prim.position_index, 0, len(skin.joints) - 1)
+                cols.append(remap[skin.joints[rows]].astype(np.float32))
+                cols.append(skin.weights[rows])
+            else:
+                cols.append(np.zeros((n, MAX_INFLUENCES), dtype=np.float32))
+                cols.append(np.tile(np.array([1, 0, 0, 0], dtype=np.float32), (n, 1)))
+        blocks.append(np.hstack(cols).astype(np.float32))
+        groups.append((prim.geometry, prim.material, n))
+
+    if not blocks:
+        return Mesh(np.zeros((0, 3), np.float32), np.zeros(0, np.uint32), bones=bones)
+
+    corners = np.ascontiguousarray(np.vstack(blocks))
+    with telemetry.stage("dedup"):
+        rows = corners.view(np.dtype((np.void, corners.dtype.itemsize * corners.shape[1]))).ravel()
+        _unique, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    vertices = corners[first]
+    inverse = inverse.ravel().astype(np.uint32)
+
+    # One submesh per primitive; each primitive's corners are contiguous
+    indices, submeshes, start = [], [], 0
+    with telemetry.stage("optimize"):
+        for geometry, material, count in groups:
+            part = tipsify(inverse[start:start + count], len(vertices))
+            submeshes.append(Submesh(geometry, material, start, count))
+            indices.append(part)
+            start += count
+    indices = np.concatenate(indices)
+
+    # Renumber vertices in first-use order so fetches walk the buffer forwards
+    _used, first_use = np.unique(indices, return_index=True)
+    order = _used[np.argsort(first_use)]
+    remap = np.empty(len(vertices), dtype=np.uint32)
+    remap[order] = np.arange(len(order), dtype=np.uint32)
+    vertices = vertices[order]
+    indices = remap[indices]
+
+    mesh = Mesh(positions=vertices[:, :3].copy(), indices=indices, submeshes=submeshes, bones=bones)
+    col = 3
+    if has_normal:
+        mesh.normals, col = vertices[:, col:col + 3].copy(), col + 3
+    if has_uv:
+        mesh.uvs, col = vertices[:, col:col + 2].copy(), col + 2
+    if has_color:
+        mesh.colors = np.clip(np.rint(vertices[:, col:col + 4] * 255), 0, 255).astype(np.uint8)
+        col += 4
+    if skinned:
+        mesh.joints = vertices[:, col:col + 4].astype(np.uint16)
+        mesh.weights = vertices[:, col + 4:col + 8].copy()
+        mesh.joint_names = joint_names
+        mesh.inverse_binds = np.array(inverse_binds, dtype=np.float32).reshape(-1, 16)
+    return mesh
+
+
+def _column(prim: Primitive, semantic: str, width: int, default: tuple) -> np.ndarray:
+    n = len(prim.position_index)
+    data = prim.columns.get(semantic)
+    out = np.tile(np.array(default, dtype=np.float32), (n, 1))
+    if data is not None:
+        w = min(width, data.shape[1])
+        out[:, :w] = data[:, :w]
+    return out
+
+
+# --- Binary I/O ---
+
+def _pack_str(text: str) -> bytes:
+    data = text.encode("utf-8")
+    return struct.pack("<H", len(data)) + data
+
+
+def _align(buf: bytearray):
+    buf.extend(b"\0" * (-len(buf) % 4))
+
+
+def write_mesh(mesh: Mesh, path: str | Path) -> int:
+    """Write `mesh` as .sfmesh; returns the file size."""
+    flags = mesh.flags
+    buf = bytearray(HEADER.pack(MAGIC, VERSION, flags, len(mesh.positions), len(mesh.indices),
+                                len(mesh.submeshes), len(mesh.joint_names), len(mesh.bones), 0))
+    for sub in mesh.submeshes:
+        buf += _pack_str(sub.name) + _pack_str(sub.material) + struct.pack("<II", sub.first_index, sub.index_count)
+    for name, ibm in zip(mesh.joint_names, mesh.inverse_binds if mesh.inverse_binds is not None else []):
+        buf += _pack_str(name) + np.asarray(ibm, dtype="<f4").tobytes()
+    for name, parent, matrix in mesh.bones:
+        buf += _pack_str(name) + struct.pack("<h", parent) + np.asarray(matrix, dtype="<f4").tobytes()
+    _align(buf)
+
+    buf += mesh.positions.astype("<f4").tobytes()
+    if flags & FLAG_NORMAL:
+        buf += mesh.normals.astype("<f4").tobytes()
+    if flags & FLAG_UV:
+        buf += mesh.uvs.astype("<f4").tobytes()
+    if flags & FLAG_COLOR:
+        buf += mesh.colors.tobytes()
+    if flags & FLAG_SKIN:
+        buf += mesh.joints.astype("<u2").tobytes()
+        _align(buf)
+        buf += mesh.weights.astype("<f4").tobytes()
+    buf += mesh.indices.astype("<u4" if flags & FLAG_INDEX32 else "<u2").tobytes()
+    _align(buf)
+
+    Path(path).write_bytes(buf)
+    return len(buf)
+
+
+def read_mesh(path: str | Path) -> Mesh:
+    """Load a .sfmesh; vertex and index streams are views into one buffer."""
+    data = Path(path).read_bytes()
+    magic, version, flags, vertex_count, index_count, sub_count, joint_count, bone_count, _ = \
+        HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not an sfmesh v{VERSION} file")
+    pos = HEADER.size
+
+    def read_str() -> str:
+        nonlocal pos
+        (length,) = struct.unpack_from("<H", data, pos)
+        text = data[pos + 2:pos + 2 + length].decode("utf-8")
+        pos += 2 + length
+        return text
+
+    def read_array(dtype: str, count: int, width: int = 1) -> np.ndarray:
+        nonlocal pos
+        array = np.frombuffer(data, dtype=dtype, count=count * width, offset=pos)
+        pos += array.nbytes
+        return array.reshape(-1, width) if width > 1 else array
+
+    submeshes = []
+    for _ in range(sub_count):
+        name, material = read_str(), read_str()
+        first, count = struct.unpack_from("<II", data, pos)
+        pos += 8
+        submeshes.append(Submesh(name, material, first, count))
+    joint_names, inverse_binds = [], []
+    for _ in range(joint_count):
+        joint_names.append(read_str())
+        inverse_binds.append(np.frombuffer(data, "<f4", 16, pos))
+        pos += 64
+    bones = []
+    for _ in range(bone_count):
+        name = read_str()
+        (parent,) = struct.unpack_from("<h", data, pos)
+        bones.append((name, parent, np.frombuffer(data, "<f4", 16, pos + 2)))
+        pos += 66
+    pos += -pos % 4
+
+    mesh = Mesh(positions=read_array("<f4", vertex_count, 3), indices=np.zeros(0, np.uint32),
+                submeshes=submeshes, joint_names=joint_names, bones=bones,
+                inverse_binds=np.array(inverse_binds, dtype=np.float32).reshape(-1, 16))
+    if flags & FLAG_NORMAL:
+        mesh.normals = read_array("<f4", vertex_count, 3)
+    if flags & FLAG_UV:
+        mesh.uvs = read_array("<f4", vertex_count, 2)
+    if flags & FLAG_COLOR:
+        mesh.colors = read_array("u1", vertex_count, 4)
+    if flags & FLAG_SKIN:
+        mesh.joints = read_array("<u2", vertex_count, 4)
+        pos += -pos % 4
+        mesh.weights = read_array("<f4", vertex_count, 4)
+    mesh.indices = read_array("<u4" if flags & FLAG_INDEX32 else "<u2", index_count)
+    return mesh
+
+
+# --- Convert ---
+
+def convert(dae_path: str | Path, out_path: str | Path) -> dict:
+    """Convert one DAE; returns stats for the report."""
+    with telemetry.stage("parse"):
+        primitives, skins, bones = parse_dae(dae_path)
+    mesh = build_mesh(primitives, skins, bones)
+    with telemetry.stage("write"):
+        size = write_mesh(mesh, out_path)
+    corners = sum(len(p.position_index) for p in primitives)
+    return {
+        "vertices": len(mesh.positions),
+        "corners": corners,
+        "triangles": len(mesh.indices) // 3,
+        "submeshes": len(mesh.submeshes),
+        "joints": len(mesh.joint_names),
+        "acmr": round(acmr(mesh.indices), 3),
+        "daeBytes": os.path.getsize(dae_path),
+        "meshBytes": size,
+    }
+
+
+def verify(dae_path: str | Path, out_path: str | Path) -> list[str]:
+    """Compare the written mesh's triangles with the DAE's, as sets of corner positions."""
+    primitives, _skins, _bones = parse_dae(dae_path)
+    mesh = read_mesh(out_path)
+    problems = []
+    for prim, sub in zip(primitives, mesh.submeshes):
+        expected = prim.columns["POSITION"][:, :3].reshape(-1, 3, 3)
+        got = mesh.positions[mesh.indices[sub.first_index:sub.first_index + sub.index_count]].reshape(-1, 3, 3)
+        if len(expected) != len(got):
+            problems.append(f"{sub.name}/{sub.material}: {len(got)} triangles, DAE has {len(expected)}")
+            continue
+        key = lambda tris: np.unique(np.sort(tris.reshape(len(tris), -1), axis=1), axis=0)
+        if not np.array_equal(key(expected), key(got)):
+            problems.append(f"{sub.name}/{sub.material}: triangle positions differ")
+    if len(primitives) != len(mesh.submeshes):
+        problems.append(f"{len(mesh.submeshes)} submeshes, DAE has {len(primitives)} primitives")
+    return problems
+
+
+def find_models(paths: list[str]) -> list[tuple[Path, Path]]:
+    """(DAE, path relative to the argument it was found under) for every model under `paths`.
+
+    Clip DAEs (anything under a clips/ folder) are skipped; a file argument is relative to its folder.
+    """
+    found = []
+    for p in map(Path, paths):
+        if p.is_file():
+            found.append((p, Path(p.name)))
+            continue
+        for dae in sorted(p.rglob("*.dae")):
+            rel = dae.relative_to(p)
+            if "clips" not in rel.parts[:-1]:
+                found.append((dae, rel))
+    return found
+
+
+def mesh_path(dae: Path, rel: Path, output: str | None) -> Path:
+    """Next to the DAE, or under `output` at the DAE's scanned-relative path (Dark/Dark.dae -> out/Dark/Dark.sfmesh)."""
+    return Path(output) / rel.with_suffix(".sfmesh") if output else dae.with_suffix(".sfmesh")
+
+
+def record_in_manifest(dae: Path, mesh_path: Path) -> bool:
+    """Point the sibling manifest at the mesh when its modelFile is this DAE."""
+    manifest_path = dae.parent / "manifest.json"
+    if not manifest_path.is_file():
+        return False
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    model = data.get("modelFile")
+    if not isinstance(model, str) or Path(asset_paths.to_posix(model)).name != dae.name:
+        return False
+    mesh_ref = os.path.relpath(mesh_path, manifest_path.parent).replace("\\", "/")
+    if data.get("meshFile") == mesh_ref and data.get("meshFormat") == MESH_FORMAT:
+        return False
+    data["meshFile"] = mesh_ref
+    data["meshFormat"] = MESH_FORMAT
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert model DAEs to compact binary .sfmesh files")
+    parser.add_argument("paths", nargs="*", default=[str(ASSETS_DIR)], help="DAE files or directories")
+    parser.add_argument("-o", "--output", type=str, default=None,
+                        help="Output directory, mirroring each DAE's path under its scanned folder "
+                             "(default: next to each DAE)")
+    parser.add_argument("--manifest", action="store_true", help="Record meshFile/meshFormat in manifests")
+    parser.add_argument("--verify", action="store_true", help="Read each mesh back and compare with the DAE")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print stats per model")
+    build_cache.add_arguments(parser)
+    telemetry.add_arguments(parser)
+    args = parser.parse_args()
+
+    telemetry.setup("dae_to_mesh", trace=args.trace, summary=not args.no_summary)
+    models = find_models(args.paths)
+    if not models:
+        print("No DAE models found.")
+        return
+    if args.output:
+        # Two file arguments with the same name still land on one path
+        by_out = {}
+        for dae, rel in models:
+            by_out.setdefault(mesh_path(dae, rel, args.output), []).append(dae)
+        clashes = {out: daes for out, daes in by_out.items() if len(daes) > 1}
+        if clashes:
+            for out, daes in clashes.items():
+                print(f"ERROR: {', '.join(map(str, daes))} would all write {out}")
+            print("Pass their common folder instead, so -o mirrors the paths under it.")
+            raise SystemExit(1)
+    cache = build_cache.open_cache("dae_to_mesh", enabled=not args.no_cache, path=args.cache,
+                                   config={"version": CACHE_VERSION, "format": VERSION, "cacheSize": CACHE_SIZE})
+
+    totals = {"daeBytes": 0, "meshBytes": 0, "triangles": 0}
+    converted = cached = failed = manifests = 0
+    for dae, rel in models:
+        out = mesh_path(dae, rel, args.output)
+        key = f"{dae.resolve()}->{out.resolve()}"
+        stats = cache.get(key, inputs=[str(dae)])
+        if stats is None or not out.exists():
+            out.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                stats = convert(dae, out)
+            except (ET.ParseError, ValueError, IndexError) as e:
+                print(f"  FAILED {dae}: {type(e).__name__}: {e}")
+                failed += 1
+                continue
+            cache.put(key, stats, inputs=[str(dae)], outputs=[str(out)])
+            converted += 1
+        else:
+            cached += 1
+        for k in totals:
+            totals[k] += stats[k]
+        if args.verbose:
+            print(f"  {dae.name}: {stats['vertices']} vertices ({stats['corners']} corners), "
+                  f"{stats['triangles']} triangles, ACMR {stats['acmr']}, "
+                  f"{stats['daeBytes'] / 1024:,.1f} KB -> {stats['meshBytes'] / 1024:,.1f} KB")
+        if args.verify:
+            for problem in verify(dae, out):
+                print(f"  MISMATCH {dae.name}: {problem}")
+                failed += 1
+        if args.manifest and record_in_manifest(dae, out):
+            manifests += 1
+    cache.close()
+
+    print(f"{len(models)} models: {converted} converted, {cached} up to date, {failed} failed")
+    if totals["daeBytes"]:
+        print(f"  {totals['triangles']:,} triangles, {totals['daeBytes'] / 1024:,.1f} KB DAE -> "
+              f"{totals['meshBytes'] / 1024:,.1f} KB mesh ({totals['meshBytes'] / totals['daeBytes']:.0%})")
+    if manifests:
+        print(f"  recorded meshFile in {manifests} manifests")
+
+    # Load-time comparison on the largest model
+    largest, rel = max(models, key=lambda m: m[0].stat().st_size)
+    out = mesh_path(largest, rel, args.output)
+    if out.exists():
+        start = time.perf_counter()
+        ET.parse(largest)
+        xml_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        read_mesh(out)
+        mesh_ms = (time.perf_counter() - start) * 1000
+        print(f"  {largest.name}: XML parse {xml_ms:.2f} ms, mesh load {mesh_ms:.2f} ms")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
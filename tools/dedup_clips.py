@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Find animation clips with identical or near-identical content across the
+Models tree and point manifests at one shared copy.
+
+merge_battle_clips and the exporters decide what to copy by slot name
+only, so the same animation is stored once per character and slot. This
+pass fingerprints every clip DAE a manifest references:
+
+  - each <channel> becomes (bone name / property, times, values); bone
+    names come from the <node> the channel targets, so exporter-generated
+    ids do not matter
+  - channels are sorted, times and values are rounded to --tolerance and
+    hashed: equal hashes are identical clips
+  - clips with the same channel layout and key counts (the "shape") are
+    compared value by value; a max difference within --near makes them
+    near-identical
+
+Fingerprints are kept in the build cache, so a re-run only parses clips
+that changed. Clips without any channel never match anything.
+
+With --apply, manifest clip entries are rewritten to the canonical copy
+(first path in sort order) as a path relative to the manifest, and clip
+files no manifest references any more are deleted. Near-identical groups
+are only reported unless --merge-near is given.
+
+Usage:
+    python dedup_clips.py                                   # report for src/Starfield2026.Assets
+    python dedup_clips.py path/to/Assets --near 0.005
+    python dedup_clips.py --apply                           # share identical clips
+    python dedup_clips.py --apply --merge-near              # also near-identical ones
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import asset_paths
+import build_cache
+import telemetry
+from validate_manifests import list_tree
+
+DEFAULT_TOLERANCE = 1e-4
+DEFAULT_NEAR = 1e-3
+CACHE_VERSION = 1
+
+Channels = dict[str, tuple[np.ndarray, np.ndarray]]
+
+
+# --- Fingerprint ---
+
+def _floats(source: ET.Element | None, ns: str) -> np.ndarray:
+    array = source.find(ns + "float_array") if source is not None else None
+    if array is None or not array.text:
+        return np.zeros(0)
+    return np.array(array.text.split(), dtype=np.float64)
+
+
+def read_channels(path: str | Path) -> Channels:
+    """'bone/property' -> (times, values) for every animation channel in a DAE."""
+    root = ET.parse(path).getroot()
+    ns = root.tag[:root.tag.index("}") + 1] if root.tag.startswith("{") else ""
+    names = {node.get("id"): node.get("name") or node.get("sid") or node.get("id")
+             for node in root.iter(ns + "node") if node.get("id")}
+
+    channels: Channels = {}
+    for anim in root.iter(ns + "animation"):
+        sources = {s.get("id"): s for s in anim.findall(ns + "source")}
+        samplers = {s.get("id"): s for s in anim.findall(ns + "sampler")}
+        for channel in anim.findall(ns + "channel"):
+            sampler = samplers.get(channel.get("source", "").lstrip("#"))
+            if sampler is None:
+                continue
+            inputs = {i.get("semantic"): i.get("source", "").lstrip("#") for i in sampler.findall(ns + "input")}
+            node_id, _, prop = channel.get("target", "").partition("/")
+            key = f"{names.get(node_id, node_id)}/{prop}"
+            channels[key] = (_floats(sources.get(inputs.get("INPUT")), ns),
+                             _floats(sources.get(inputs.get("OUTPUT")), ns))
+    return channels
+
+
+def shape_of(channels: Channels) -> str:
+    """Hash of the channel layout and key counts; only same-shape clips can match."""
+    h = hashlib.blake2b(digest_size=12)
+    for key in sorted(channels):
+        times, values = channels[key]
+        h.update(f"{key}:{len(times)}:{len(values)};".encode())
+    return h.hexdigest()
+
+
+def fingerprint(channels: Channels, tolerance: float) -> str | None:
+    """Hash of the channels with times and values rounded to tolerance; None for an empty clip."""
+    if not channels:
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    for key in sorted(channels):
+        times, values = channels[key]
+        h.update(key.encode() + b"\0")
+        for array in (times, values):
+            quantized = np.round(array / tolerance).astype(np.int64)
+            quantized[quantized == 0] = 0  # fold -0
+            h.update(len(quantized).to_bytes(8, "little"))
+            h.update(quantized.tobytes())
+    return h.hexdigest()
+
+
+def flatten(channels: Channels) -> np.ndarray:
+    return np.concatenate([np.concatenate(channels[k]) for k in sorted(channels)]) if channels else np.zeros(0)
+
+
+def fingerprint_file(path: str, tolerance: float) -> tuple[str, str | None, str | None, str | None]:
+    """(path, exact print, shape, error) -- runs in worker processes."""
+    try:
+        channels = read_channels(path)
+    except (OSError, ET.ParseError, ValueError) as e:
+        return path, None, None, f"{type(e).__name__}: {e}"
+    return path, fingerprint(channels, tolerance), shape_of(channels), None
+
+
+# --- Grouping ---
+
+def collect_clips(resolver: asset_paths.AssetResolver
+                  ) -> tuple[dict[str, dict], dict[str, list[tuple[str, int]]], list[str]]:
+    """Manifests by rel path, clip file (root-relative) -> [(manifest, clip position)], unreadable manifests."""
+    manifests, _files, _lower = list_tree(str(resolver.root))
+    loaded, users, unreadable = {}, defaultdict(list), []
+    for rel in manifests:
+        path = resolver.resolve(rel)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            unreadable.append(rel)
+            continue
+        if not isinstance(data, dict):
+            unreadable.append(rel)
+            continue
+        loaded[rel] = data
+        for i, clip in enumerate(data.get("clips") or []):
+            if isinstance(clip, dict) and isinstance(clip.get("file"), str):
+                target = resolver.relative(resolver.manifest_file(data, path, clip["file"]))
+                if target != ".." and not target.startswith("../"):
+                    users[target].append((rel, i))
+    return loaded, users, unreadable
+
+
+def fingerprint_all(resolver: asset_paths.AssetResolver, clips: list[str], tolerance: float, jobs: int,
+                    cache) -> tuple[dict[str, tuple[str | None, str]], list[str]]:
+    """rel clip path -> (exact print, shape) for every readable clip."""
+    prints, todo, errors = {}, [], []
+    for rel in clips:
+        hit = cache.get(rel, inputs=[resolver.resolve(rel)])
+        if hit is not None:
+            prints[rel] = (hit["exact"], hit["shape"])
+        else:
+            todo.append(rel)
+    telemetry.count("cached", len(clips) - len(todo))
+
+    paths = [resolver.resolve(rel) for rel in todo]
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(jobs) as pool:
+            results = list(pool.map(fingerprint_file, paths, [tolerance] * len(paths),
+                                    chunksize=max(1, len(paths) // (jobs * 8))))
+    else:
+        results = [fingerprint_file(p, tolerance) for p in paths]
+
+    for rel, (path, exact, shape, error) in zip(todo, results):
+        telemetry.count("parsed")
+        if error:
+            errors.append(f"{rel}: {error}")
+            continue
+        prints[rel] = (exact, shape)
+        cache.put(rel, {"exact": exact, "shape": shape}, inputs=[path])
+    return prints, errors
+
+
+def group_exact(prints: dict[str, tuple[str | None, str]]) -> list[list[str]]:
+    by_print = defaultdict(list)
+    for rel, (exact, _shape) in prints.items():
+        if exact is not None:
+            by_print[exact].append(rel)
+    return sorted(sorted(g) for g in by_print.values() if len(g) > 1)
+
+
+def group_near(resolver: asset_paths.AssetResolver, prints: dict[str, tuple[str | None, str]], near: float) -> list[list[str]]:
+    """Groups of distinct exact prints whose values all lie within `near` of the group's first clip."""
+    by_shape = defaultdict(dict)
+    for rel, (exact, shape) in sorted(prints.items()):
+        if exact is not None:
+            by_shape[shape].setdefault(exact, rel)  # one representative per exact print
+
+    groups = []
+    for reps in by_shape.values():
+        if len(reps) < 2:
+            continue
+        clusters: list[tuple[np.ndarray, list[str]]] = []
+        for rel in sorted(reps.values()):
+            with telemetry.stage("near_compare"):
+                vector = flatten(read_channels(resolver.resolve(rel)))
+                for anchor, members in clusters:
+                    if np.max(np.abs(anchor - vector), initial=0.0) <= near:
+                        members.append(rel)
+                        break
+                else:
+                    clusters.append((vector, [rel]))
+        groups.extend(members for _, members in clusters if len(members) > 1)
+    return sorted(groups)
+
+
+# --- Apply ---
+
+def apply_groups(resolver: asset_paths.AssetResolver, manifests: dict[str, dict], users: dict[str, list[tuple[str, int]]],
+                 groups: list[list[str]], delete: bool = True) -> tuple[int, list[str]]:
+    """Point every clip entry at its group's canonical file; returns (manifests rewritten, files removed)."""
+    canonical = {}
+    for group in groups:
+        for rel in group[1:]:
+            canonical[rel] = group[0]
+
+    touched = set()
+    for rel, target in canonical.items():
+        for manifest_rel, i in users.get(rel, []):
+            manifest_dir = manifest_rel.rpartition("/")[0]
+            manifests[manifest_rel]["clips"][i]["file"] = posixpath.relpath(target, manifest_dir or ".")
+            touched.add(manifest_rel)
+
+    for manifest_rel in sorted(touched):
+        with telemetry.stage("write"):
+            with open(resolver.resolve(manifest_rel), "w", encoding="utf-8") as f:
+                json.dump(manifests[manifest_rel], f, indent=2, ensure_ascii=False)
+                f.write("\n")
+
+    removed = []
+    for rel in sorted(canonical) if delete else []:
+        # Every user of a non-canonical file was just repointed
+        os.remove(resolver.resolve(rel))
+        removed.append(rel)
+    return len(touched), removed
+
+
+# --- Main ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Share identical animation clips across the Models tree")
+    parser.add_argument("root", nargs="?", default=str(asset_paths.default_root()), help="Assets root to scan")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Rounding step for times/values in the exact fingerprint (default: {DEFAULT_TOLERANCE:g})")
+    parser.add_argument("--near", type=float, default=DEFAULT_NEAR,
+                        help=f"Max value difference for near-identical clips (default: {DEFAULT_NEAR:g})")
+    parser.add_argument("--apply", action="store_true", help="Rewrite manifests and delete unreferenced duplicates")
+    parser.add_argument("--merge-near", action="store_true", help="With --apply, also share near-identical clips")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--verbose", "-v", action="store_true", help="List every group")
+    build_cache.add_arguments(parser)
+    telemetry.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.root)
+    if not os.path.isdir(root):
+        print(f"ERROR: {root} is not a directory.")
+        raise SystemExit(1)
+    resolver = asset_paths.AssetResolver(root)
+    telemetry.setup("dedup_clips", trace=args.trace, summary=not args.no_summary)
+    cache = build_cache.open_cache("dedup_clips", enabled=not args.no_cache, path=args.cache, root=root,
+                                   config={"version": CACHE_VERSION, "tolerance": args.tolerance})
+
+    with telemetry.stage("manifests"):
+        manifests, users, unreadable = collect_clips(resolver)
+    clips = sorted(rel for rel in users if resolver.resolve(rel).is_file())
+    print(f"{len(manifests)} manifests reference {len(clips)} clip files")
+
+    prints, errors = fingerprint_all(resolver, clips, args.tolerance, args.jobs, cache)
+    cache.close()
+    exact = group_exact(prints)
+    near = group_near(resolver, prints, args.near)
+
+    def size(rel: str) -> int:
+        return os.path.getsize(resolver.resolve(rel))
+
+    exact_bytes = sum(size(r) for g in exact for r in g[1:])
+    print(f"  identical:       {len(exact)} groups, {sum(len(g) - 1 for g in exact)} redundant files, "
+          f"{exact_bytes / 1024:,.1f} KB")
+    print(f"  near-identical:  {len(near)} groups (within {args.near:g}), "
+          f"{sum(len(g) - 1 for g in near)} more files")
+    for label, groups in (("identical", exact), ("near", near)):
+        for group in groups if args.verbose else groups[:5]:
+            print(f"    [{label}] {group[0]}  <- {', '.join(group[1:])}")
+    if errors:
+        print(f"  {len(errors)} unreadable clips:")
+        for e in errors:
+            print(f"    {e}")
+
+    if args.apply:
+        groups = list(exact)
+        if args.merge_near:
+            # Fold near groups of representatives together with their exact duplicates
+            members = {rel: g for g in exact for rel in g}
+            for group in near:
+                merged = sorted({m for rel in group for m in members.get(rel, [rel])})
+                groups = [g for g in groups if not set(g) & set(merged)] + [merged]
+        # A manifest we could not parse may still point at a duplicate, so keep the files
+        rewritten, removed = apply_groups(resolver, manifests, users, groups, delete=not unreadable)
+        print(f"\nRewrote {rewritten} manifests, removed {len(removed)} duplicate clip files")
+        if unreadable:
+            print(f"  kept duplicate files: {len(unreadable)} manifests could not be read ({unreadable[0]}, ...)")
+
+
+if __name__ == "__main__":
+    main()
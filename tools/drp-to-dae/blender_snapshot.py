@@ -0,0 +1,123 @@
+"""
+Blender Import Snapshot — Headless Worker
+-----------------------------------------
+Run by golden_harness.py, not by hand:
+
+    blender --background --factory-startup --python-exit-code 1 \\
+        --python blender_snapshot.py -- <job.json> <results.jsonl>
+
+job.json is a list of {"asset", "model", "clips": [{"file", "path"}]}.
+For each asset the scene is reset, the model DAE is imported, then each
+clip DAE is imported the same way blender_import_test.py does it and its
+action is measured. One JSON line per asset is appended to results.jsonl
+(flushed as it goes, so a crash only loses the asset being imported):
+
+    {"asset": ..., "model": {"armatures", "bones", "boneNames", "meshes", "vertices"},
+     "clips": {file: {"action", "frameRange", "fcurves", "bones"}}, "errors": [...]}
+
+Needs a Blender build with the COLLADA importer (removed in Blender 5.0).
+"""
+
+import json
+import sys
+import traceback
+
+import bpy
+
+
+def reset_scene():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+
+def import_dae(path):
+    """Import a DAE; returns the objects and actions it added."""
+    before_objects = set(bpy.data.objects.keys())
+    before_actions = set(bpy.data.actions.keys())
+    bpy.ops.wm.collada_import(filepath=path)
+    objects = [bpy.data.objects[n] for n in set(bpy.data.objects.keys()) - before_objects]
+    actions = [bpy.data.actions[n] for n in set(bpy.data.actions.keys()) - before_actions]
+    return objects, actions
+
+
+def snapshot_model(objects):
+    armatures = [o for o in objects if o.type == "ARMATURE"]
+    meshes = [o for o in objects if o.type == "MESH"]
+    bone_names = sorted(b.name for a in armatures for b in a.data.bones)
+    return {
+        "armatures": len(armatures),
+        "bones": len(bone_names),
+        "boneNames": bone_names,
+        "meshes": len(meshes),
+        "vertices": sum(len(m.data.vertices) for m in meshes),
+    }
+
+
+def snapshot_clip(path):
+    objects, actions = import_dae(path)
+    action = None
+    for obj in objects:
+        if obj.type == "ARMATURE" and obj.animation_data and obj.animation_data.action:
+            action = obj.animation_data.action
+            break
+    if action is None and actions:
+        action = actions[0]
+
+    if action is None:
+        result = {"action": False, "frameRange": None, "fcurves": 0, "bones": 0}
+    else:
+        bones = {fc.data_path.split('"')[1] for fc in action.fcurves if fc.data_path.startswith("pose.bones[")}
+        result = {
+            "action": True,
+            "frameRange": [round(action.frame_range[0], 3), round(action.frame_range[1], 3)],
+            "fcurves": len(action.fcurves),
+            "bones": len(bones),
+        }
+
+    # Drop the clip's temp armature and action so the next clip starts clean
+    for obj in objects:
+        bpy.data.objects.remove(obj, do_unlink=True)
+    for act in actions:
+        bpy.data.actions.remove(act)
+    return result
+
+
+def snapshot_asset(job):
+    result = {"asset": job["asset"], "model": None, "clips": {}, "errors": []}
+    reset_scene()
+    try:
+        objects, _actions = import_dae(job["model"])
+        result["model"] = snapshot_model(objects)
+    except Exception as e:
+        result["errors"].append(f"model: {type(e).__name__}: {e}")
+        return result
+    for clip in job["clips"]:
+        try:
+            result["clips"][clip["file"]] = snapshot_clip(clip["path"])
+        except Exception as e:
+            result["errors"].append(f"{clip['file']}: {type(e).__name__}: {e}")
+    return result
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if len(argv) != 2:
+        print("usage: blender --background --python blender_snapshot.py -- <job.json> <results.jsonl>")
+        sys.exit(2)
+    if not hasattr(bpy.ops.wm, "collada_import"):
+        print("ERROR: this Blender build has no COLLADA importer")
+        sys.exit(3)
+
+    with open(argv[0], "r", encoding="utf-8") as f:
+        jobs = json.load(f)
+    with open(argv[1], "a", encoding="utf-8") as out:
+        for job in jobs:
+            try:
+                result = snapshot_asset(job)
+            except Exception:
+                result = {"asset": job["asset"], "model": None, "clips": {},
+                          "errors": [traceback.format_exc(limit=3)]}
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+
+
+main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Headless Blender import regression harness for drp-to-dae output.
+
+blender_import_test.py checks one model/animation pair through file
+pickers. This walks a whole converted output tree instead: every folder
+with a manifest.json is an asset (model.dae plus its clips). Assets are
+split into batches and imported by parallel background Blender processes
+running blender_snapshot.py, which records per asset:
+
+  - model: armatures, bone count and names, meshes, vertices
+  - clip:  whether an action was created, its frame range, fcurve count
+           and animated bone count
+
+Snapshots are compared with stored goldens (golden/<asset>/snapshot.json)
+and every difference is reported per asset. Bone counts and names, frame
+ranges, fcurve counts, missing actions or clips and new import errors are
+regressions; mesh and vertex counts and new clips are warnings.
+
+--timeout applies per asset: when Blender hangs on one asset or crashes,
+that asset is reported as harness.failed and the rest of its batch is
+re-run in a fresh Blender. Harness failures are never written as goldens
+by --update.
+
+Usage:
+    python golden_harness.py <output_tree> --update          # record goldens from a known-good converter
+    python golden_harness.py <output_tree>                   # compare against them
+    python golden_harness.py <output_tree> -j 8 --blender "C:/Program Files/Blender Foundation/Blender 4.1/blender.exe"
+    python golden_harness.py <output_tree> --only a038 --only pm0025 --report regressions.json
+
+Blender comes from --blender, else $BLENDER, else "blender" on PATH, and
+needs the COLLADA importer (Blender 4.x or older). Exits with status 1
+when any asset regressed or failed in the harness.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import manifest_schema  # noqa: E402
+import telemetry  # noqa: E402
+from validate_gamedata import Report  # noqa: E402
+from validate_manifests import list_tree  # noqa: E402
+
+SCRIPT_DIR = Path(__file__).parent
+WORKER = SCRIPT_DIR / "blender_snapshot.py"
+GOLDEN_DIR = SCRIPT_DIR / "golden"
+
+DEFAULT_BATCH = 8
+DEFAULT_TIMEOUT = 120  # seconds per asset
+POLL_INTERVAL = 0.5
+
+# check -> severity; anything not listed is an error
+SEVERITY = {
+    "model.armatures": "warning",
+    "model.meshes": "warning",
+    "model.vertices": "warning",
+    "clip.new": "warning",
+    "clip.bones": "warning",
+    "import.fixed": "warning",
+    "golden.missing": "warning",
+}
+
+
+# --- Assets ---
+
+def find_assets(root: Path, only: list[str]) -> tuple[list[dict], list[str]]:
+    """Blender jobs for every manifest folder under root, plus folders skipped for having no model."""
+    manifests, _files, _lower = list_tree(str(root))
+    jobs, skipped = [], []
+    for rel in manifests:
+        if not rel.endswith("manifest.json"):
+            continue
+        asset = rel.rpartition("/")[0] or "."
+        if only and not any(o == asset or asset.endswith("/" + o) for o in only):
+            continue
+        try:
+            with open(root / rel, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            skipped.append(asset)
+            continue
+        rel_dir = asset if asset != "." else ""
+        model = data.get("modelFile") or manifest_schema.first_model_file(data)
+        if not isinstance(model, str) or not (root / manifest_schema.resolve(rel_dir, model)).is_file():
+            skipped.append(asset)
+            continue
+        clips = [{"file": c["file"], "path": str(root / manifest_schema.resolve(rel_dir, c["file"]))}
+                 for c in data.get("clips") or [] if isinstance(c, dict) and isinstance(c.get("file"), str)]
+        jobs.append({"asset": asset, "model": str(root / manifest_schema.resolve(rel_dir, model)), "clips": clips})
+    return jobs, skipped
+
+
+def batches(jobs: list[dict], workers: int, size: int) -> list[list[dict]]:
+    """Split into batches of at most `size`, and at least one per worker, largest assets first."""
+    ordered = sorted(jobs, key=lambda j: -len(j["clips"]))
+    count = max(min(workers, len(ordered)), -(-len(ordered) // size))
+    return [b for b in (ordered[i::count] for i in range(count)) if b]
+
+
+# --- Blender ---
+
+def find_blender(arg: str | None) -> str | None:
+    candidate = arg or os.environ.get("BLENDER") or "blender"
+    return candidate if os.path.isfile(candidate) else shutil.which(candidate)
+
+
+def harness_failure(job: dict, failure: str) -> dict:
+    """Result for an asset Blender never reported on; never written as a golden."""
+    return {"asset": job["asset"], "model": None, "clips": {}, "errors": [], "harness": failure}
+
+
+def snapshot(blender: str, jobs: list[dict], timeout: int, work: Path, results: dict[str, dict]) -> str | None:
+    """Run one Blender over `jobs`, adding what it reports to `results`; returns why it stopped early, if it did.
+
+    blender_snapshot.py appends one line per asset in job order, so each new line restarts the
+    `timeout` clock: a hang is caught on the asset it happens on, not at the end of the batch.
+    """
+    fd, job_path = tempfile.mkstemp(suffix=".json", dir=work)
+    results_path = job_path[:-5] + ".jsonl"
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(jobs, f)
+
+    cmd = [blender, "--background", "--factory-startup", "--python-exit-code", "1",
+           "--python", str(WORKER), "--", job_path, results_path]
+    failure = None
+    with open(job_path[:-5] + ".log", "w+", encoding="utf-8", errors="replace") as log:
+        proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, text=True)
+        reported, deadline = 0, time.monotonic() + timeout
+        while proc.poll() is None:
+            time.sleep(POLL_INTERVAL)
+            lines = count_lines(results_path)
+            if lines > reported:
+                reported, deadline = lines, time.monotonic() + timeout
+            elif time.monotonic() > deadline:
+                proc.kill()
+                proc.wait()
+                failure = f"blender timed out after {timeout} s on this asset"
+        if failure is None and proc.returncode != 0:
+            log.seek(0)
+            tail = log.read().strip().splitlines()[-1:] or [""]
+            failure = f"blender exited with {proc.returncode}: {tail[0]}"
+
+    if os.path.exists(results_path):
+        with open(results_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        result = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut off by the kill
+                    results[result["asset"]] = result
+    return failure
+
+
+def count_lines(path: str) -> int:
+    try:
+        with open(path, "rb") as f:
+            return f.read().count(b"\n")
+    except OSError:
+        return 0
+
+
+def run_batch(blender: str, batch: list[dict], timeout: int, work: Path) -> list[dict]:
+    """Snapshot one batch; when Blender hangs or dies, the asset it was on fails and the rest re-run."""
+    results: dict[str, dict] = {}
+    pending = batch
+    while pending:
+        failure = snapshot(blender, pending, timeout, work, results)
+        pending = [job for job in pending if job["asset"] not in results]
+        if pending:
+            # Jobs run in order, so the first unreported one is where Blender stopped
+            results[pending[0]["asset"]] = harness_failure(pending[0], failure or "no result from blender")
+            pending = pending[1:]
+            telemetry.count("requeued", len(pending))
+    return [results[job["asset"]] for job in batch]
+
+
+# --- Compare ---
+
+def compare(golden: dict, current: dict) -> list[tuple[str, str]]:
+    """(check, detail) for every difference between a golden snapshot and a new one."""
+    diffs = []
+    old_errors, new_errors = set(golden.get("errors", [])), set(current.get("errors", []))
+    for error in sorted(new_errors - old_errors):
+        diffs.append(("import.error", error))
+    if old_errors and not new_errors:
+        diffs.append(("import.fixed", f"{len(old_errors)} golden errors no longer occur (run --update)"))
+
+    old_model, new_model = golden.get("model"), current.get("model")
+    if old_model and not new_model:
+        diffs.append(("model.missing", "model no longer imports"))
+    elif old_model and new_model:
+        for key in ("bones", "armatures", "meshes", "vertices"):
+            if old_model[key] != new_model[key]:
+                diffs.append((f"model.{key}", f"{old_model[key]} -> {new_model[key]}"))
+        old_names, new_names = set(old_model["boneNames"]), set(new_model["boneNames"])
+        if old_names != new_names:
+            removed, added = sorted(old_names - new_names), sorted(new_names - old_names)
+            diffs.append(("model.bone_names", f"removed {removed[:5]}, added {added[:5]}"))
+
+    old_clips, new_clips = golden.get("clips", {}), current.get("clips", {})
+    for name in sorted(old_clips.keys() - new_clips.keys()):
+        diffs.append(("clip.missing", name))
+    for name in sorted(new_clips.keys() - old_clips.keys()):
+        diffs.append(("clip.new", name))
+    for name in sorted(old_clips.keys() & new_clips.keys()):
+        old, new = old_clips[name], new_clips[name]
+        if old["action"] and not new["action"]:
+            diffs.append(("clip.no_action", name))
+            continue
+        if old["frameRange"] != new["frameRange"]:
+            diffs.append(("clip.frame_range", f"{name}: {old['frameRange']} -> {new['frameRange']}"))
+        if old["fcurves"] != new["fcurves"]:
+            diffs.append(("clip.fcurves", f"{name}: {old['fcurves']} -> {new['fcurves']}"))
+        if old["bones"] != new["bones"]:
+            diffs.append(("clip.bones", f"{name}: {old['bones']} -> {new['bones']}"))
+    return diffs
+
+
+def golden_path(golden_dir: Path, asset: str) -> Path:
+    return golden_dir / asset / "snapshot.json"
+
+
+# --- Main ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare drp-to-dae output imported in Blender against golden snapshots")
+    parser.add_argument("root", help="Converted output tree (folders with manifest.json)")
+    parser.add_argument("--golden", type=str, default=str(GOLDEN_DIR), help="Golden snapshot directory")
+    parser.add_argument("--update", action="store_true", help="Write snapshots as the new goldens")
+    parser.add_argument("--only", action="append", default=[], help="Only this asset folder (repeatable)")
+    parser.add_argument("--blender", type=str, default=None, help="Blender executable")
+    parser.add_argument("--jobs", "-j", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Parallel Blender processes")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="Assets per Blender process")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="Seconds allowed per asset")
+    parser.add_argument("--report", type=str, default=None, help="Write JSON report here")
+    telemetry.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = Path(args.root).resolve()
+    golden_dir = Path(args.golden).resolve()
+    if not root.is_dir():
+        print(f"ERROR: {root} is not a directory.")
+        sys.exit(1)
+    blender = find_blender(args.blender)
+    if blender is None:
+        print("ERROR: Blender not found. Pass --blender or set $BLENDER.")
+        sys.exit(1)
+    telemetry.setup("golden_harness", trace=args.trace, summary=not args.no_summary)
+
+    with telemetry.stage("scan"):
+        jobs, skipped = find_assets(root, args.only)
+    if not jobs:
+        print("No assets with a model found.")
+        sys.exit(1)
+    work_batches = batches(jobs, args.jobs, args.batch)
+    print(f"{len(jobs)} assets, {sum(len(j['clips']) for j in jobs)} clips, "
+          f"{len(work_batches)} batches on {args.jobs} Blender processes")
+
+    start = time.perf_counter()
+    results = []
+    with tempfile.TemporaryDirectory(prefix="golden_harness_") as work, \
+            ThreadPoolExecutor(args.jobs) as pool, telemetry.stage("blender"):
+        futures = [pool.submit(run_batch, blender, b, args.timeout, Path(work)) for b in work_batches]
+        for done, future in enumerate(as_completed(futures), start=1):
+            results.extend(future.result())
+            print(f"  [{done}/{len(futures)}] {len(results)}/{len(jobs)} assets")
+    telemetry.count("assets", len(results))
+    elapsed = time.perf_counter() - start
+
+    report = Report()
+    per_asset: dict[str, list[dict]] = {}
+    not_written = []
+    for result in sorted(results, key=lambda r: r["asset"]):
+        asset = result["asset"]
+        path = golden_path(golden_dir, asset)
+        if args.update:
+            if result.get("harness"):
+                # A timeout or crash says nothing about the converter; keep the old golden
+                not_written.append(asset)
+                print(f"  not written {asset}: {result['harness']}")
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+            continue
+        if result.get("harness"):
+            # Nothing was imported, so there is nothing to compare
+            diffs = [("harness.failed", result["harness"])]
+        elif not path.is_file():
+            diffs = [("golden.missing", "no golden snapshot (run --update)")]
+        else:
+            diffs = compare(json.loads(path.read_text(encoding="utf-8")), result)
+        for check, detail in diffs:
+            severity = SEVERITY.get(check, "error")
+            report.add(check, severity, {"asset": asset, "detail": detail})
+            per_asset.setdefault(asset, []).append({"check": check, "severity": severity, "detail": detail})
+
+    if args.update:
+        print(f"Wrote {len(results) - len(not_written)} golden snapshots to {golden_dir} in {elapsed:.1f} s")
+        if not_written:
+            print(f"{len(not_written)} assets failed in the harness and were not written; re-run with --only")
+        sys.exit(1 if not_written else 0)
+
+    failed = sorted(a for a, d in per_asset.items() if any(x["check"] == "harness.failed" for x in d))
+    regressed = sorted(a for a, d in per_asset.items()
+                       if a not in failed and any(x["severity"] == "error" for x in d))
+    for asset in sorted(per_asset):
+        label = "FAILED   " if asset in failed else "REGRESSED" if asset in regressed else "changed  "
+        for diff in per_asset[asset]:
+            print(f"  {label} {asset}: {diff['check']} {diff['detail']}")
+    for asset in skipped:
+        print(f"  skipped   {asset}: no readable manifest or model file")
+    print(f"\n{len(results)} assets in {elapsed:.1f} s: {len(regressed)} regressed, {len(failed)} failed in harness, "
+          f"{len(per_asset) - len(regressed) - len(failed)} changed, {len(results) - len(per_asset)} identical")
+
+    if args.report:
+        Path(args.report).write_text(json.dumps({
+            "root": str(root),
+            "golden": str(golden_dir),
+            "elapsedMs": round(elapsed * 1000, 1),
+            "assets": len(results),
+            "regressed": regressed,
+            "harnessFailed": failed,
+            "skipped": skipped,
+            "checks": report.to_dict(),
+            "perAsset": per_asset,
+        }, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    sys.exit(1 if regressed or failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Materialize the evolution graph in gamedata.db as lookup tables.
+
+The evolutions table only stores direct edges (from -> to). This adds:
+
+    evolution_family   species_id PK, family_id, base_species_id, depth
+    evolution_closure  ancestor_id, descendant_id, distance  (every reachable pair)
+
+so "family of Z", "base form of Y" and "all descendants of X" are single
+indexed reads instead of recursive queries. family_id is the smallest
+species ID in the connected component; base_species_id is the root the
+species descends from (smallest ID if several); depth is the number of
+evolutions from that root. Species with no evolutions get a singleton
+family at depth 0.
+
+The graph is walked with explicit queues, so wide fans (Eevee) and long
+chains cost nothing extra, and a malformed cycle is reported instead of
+recursing forever. fetch-gamedata.py rebuilds the tables after the
+evolution fetch.
+
+Usage:
+    python evolution_graph.py                   # rebuild tables in gamedata.db
+    python evolution_graph.py --db path/to/gamedata.db
+    python evolution_graph.py --show 133        # print the family/closure rows for one species
+"""
+
+import argparse
+import sqlite3
+import sys
+from collections import defaultdict, deque
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+DB_PATH = SCRIPT_DIR.parent / "src" / "Starfield2026.Assets" / "Data" / "gamedata.db"
+
+SCHEMA = """
+    DROP TABLE IF EXISTS evolution_family;
+    DROP TABLE IF EXISTS evolution_closure;
+
+    CREATE TABLE evolution_family (
+        species_id      INTEGER PRIMARY KEY,
+        family_id       INTEGER NOT NULL,
+        base_species_id INTEGER NOT NULL,
+        depth           INTEGER NOT NULL
+    );
+    CREATE INDEX idx_evolution_family_family ON evolution_family (family_id);
+
+    CREATE TABLE evolution_closure (
+        ancestor_id     INTEGER NOT NULL,
+        descendant_id   INTEGER NOT NULL,
+        distance        INTEGER NOT NULL,
+        PRIMARY KEY (ancestor_id, descendant_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX idx_evolution_closure_descendant ON evolution_closure (descendant_id, ancestor_id);
+"""
+
+
+# --- Graph ---
+
+def build_graph(species_ids: list[int], edges: list[tuple[int, int]]) -> tuple[list[tuple], list[tuple], list[int]]:
+    """Family rows, closure rows and any species caught in a cycle.
+
+    Family rows are (species_id, family_id, base_species_id, depth);
+    closure rows are (ancestor_id, descendant_id, distance).
+    """
+    children: dict[int, list[int]] = defaultdict(list)
+    parents: dict[int, list[int]] = defaultdict(list)
+    nodes = set(species_ids)
+    for src, dst in set(edges):
+        if src == dst:
+            continue
+        children[src].append(dst)
+        parents[dst].append(src)
+        nodes.update((src, dst))
+    for kids in children.values():
+        kids.sort()
+
+    # Connected components (undirected), smallest ID first so family_id = min
+    family: dict[int, int] = {}
+    for start in sorted(nodes):
+        if start in family:
+            continue
+        family[start] = start
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for nxt in children[node] + parents[node]:
+                if nxt not in family:
+                    family[nxt] = start
+                    queue.append(nxt)
+
+    # Depth and base form: BFS down from every root, lowest root ID wins ties
+    depth: dict[int, int] = {}
+    base: dict[int, int] = {}
+    roots = sorted(n for n in nodes if not parents[n])
+    for root in roots:
+        depth.setdefault(root, 0)
+        base.setdefault(root, root)
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for child in children[node]:
+                d = depth[node] + 1
+                if child not in depth or d < depth[child]:
+                    depth[child] = d
+                    base[child] = base[node]
+                    queue.append(child)
+
+    # Anything unreached sits on a cycle with no root
+    cyclic = sorted(n for n in nodes if n not in depth)
+    for node in cyclic:
+        depth[node] = 0
+        base[node] = family[node]
+
+    family_rows = [(n, family[n], base[n], depth[n]) for n in sorted(nodes)]
+
+    # Closure: BFS from every species with descendants (shortest distance)
+    closure_rows = []
+    for ancestor in sorted(children):
+        seen = {ancestor: 0}
+        queue = deque([ancestor])
+        while queue:
+            node = queue.popleft()
+            for child in children[node]:
+                if child not in seen:
+                    seen[child] = seen[node] + 1
+                    queue.append(child)
+        del seen[ancestor]  # a cycle can lead back to the start
+        closure_rows.extend((ancestor, d, dist) for d, dist in sorted(seen.items()))
+
+    return family_rows, closure_rows, cyclic
+
+
+def materialize(conn: sqlite3.Connection) -> dict:
+    """Rebuild evolution_family / evolution_closure from species + evolutions."""
+    has_species = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'species'").fetchone()
+    species_ids = [r[0] for r in conn.execute("SELECT id FROM species")] if has_species else []
+    edges = conn.execute("SELECT DISTINCT from_species_id, to_species_id FROM evolutions").fetchall()
+
+    family_rows, closure_rows, cyclic = build_graph(species_ids, edges)
+
+    with conn:
+        conn.executescript(SCHEMA)
+        conn.executemany("INSERT INTO evolution_family VALUES (?, ?, ?, ?)", family_rows)
+        conn.executemany("INSERT INTO evolution_closure VALUES (?, ?, ?)", closure_rows)
+
+    return {
+        "species": len(family_rows),
+        "families": len({r[1] for r in family_rows}),
+        "closure": len(closure_rows),
+        "max_depth": max((r[3] for r in family_rows), default=0),
+        "cyclic": cyclic,
+    }
+
+
+def print_stats(stats: dict):
+    print(f"  {stats['species']} species in {stats['families']} families, "
+          f"{stats['closure']} ancestor/descendant pairs, max depth {stats['max_depth']}")
+    if stats["cyclic"]:
+        print(f"  WARNING: evolution cycle through species {stats['cyclic']}")
+
+
+# --- Lookups ---
+
+def family_members(conn: sqlite3.Connection, species_id: int) -> list[tuple[int, int]]:
+    """(species_id, depth) for every member of species_id's family."""
+    return conn.execute("""
+        SELECT f.species_id, f.depth FROM evolution_family f
+        WHERE f.family_id = (SELECT family_id FROM evolution_family WHERE species_id = ?)
+        ORDER BY f.depth, f.species_id
+    """, (species_id,)).fetchall()
+
+
+def base_form(conn: sqlite3.Connection, species_id: int) -> int | None:
+    row = conn.execute("SELECT base_species_id FROM evolution_family WHERE species_id = ?", (species_id,)).fetchone()
+    return row[0] if row else None
+
+
+def descendants(conn: sqlite3.Connection, species_id: int) -> list[tuple[int, int]]:
+    """(descendant_id, distance) for everything species_id can evolve into."""
+    return conn.execute(
+        "SELECT descendant_id, distance FROM evolution_closure WHERE ancestor_id = ? ORDER BY distance, descendant_id",
+        (species_id,)).fetchall()
+
+
+def ancestors(conn: sqlite3.Connection, species_id: int) -> list[tuple[int, int]]:
+    """(ancestor_id, distance) for everything that evolves into species_id."""
+    return conn.execute(
+        "SELECT ancestor_id, distance FROM evolution_closure WHERE descendant_id = ? ORDER BY distance, ancestor_id",
+        (species_id,)).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize evolution family / closure tables in gamedata.db")
+    parser.add_argument("--db", type=str, default=str(DB_PATH), help="Path to gamedata.db")
+    parser.add_argument("--show", type=int, default=None, metavar="SPECIES_ID",
+                        help="Print lookups for one species instead of rebuilding")
+    args = parser.parse_args()
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"ERROR: {db_path} not found")
+        sys.exit(1)
+    conn = sqlite3.connect(str(db_path))
+
+    if args.show is not None:
+        sid = args.show
+        print(f"Species {sid}: base form {base_form(conn, sid)}")
+        print(f"  family:      {family_members(conn, sid)}")
+        print(f"  ancestors:   {ancestors(conn, sid)}")
+        print(f"  descendants: {descendants(conn, sid)}")
+    else:
+        print(f"Materializing evolution graph in {db_path}")
+        print_stats(materialize(conn))
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
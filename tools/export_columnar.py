@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Export gamedata.db and species.json as typed columnar files for analysis.
+
+Each table becomes one file: NumPy .npz (always available) or Parquet
+(when pyarrow is installed). Integer columns keep their width, text
+columns become fixed-width unicode arrays, and low-cardinality text
+(types, move/item categories, growth rates, learn methods, evolution
+triggers) is dictionary-encoded:
+
+    <col>              int8 codes, -1 for NULL
+    <col>__categories  the code -> label table
+
+Type, category and growth-rate codes follow the C# enum order
+(MoveType, MoveCategory, ItemCategory, GrowthRate), so a code can be cast
+straight to the game's enum. Nullable non-categorical columns get a
+<col>__null boolean mask in .npz; Parquet stores real nulls.
+
+species.json is accepted in both shapes that exist in the tree: the
+fetch_pokeapi.py output (baseHP, captureRate, ...) and the MapEditor copy
+(hp, catchRate, ...). Columns are normalized to the gamedata.db names.
+
+Usage:
+    python export_columnar.py                              # gamedata.db -> out/columnar/*.npz
+    python export_columnar.py --format parquet --out analysis/
+    python export_columnar.py --species-json ../src/Starfield2026.MapEditor/frontend/public/species.json
+    python export_columnar.py --tables moves species
+
+Reading back:
+    from export_columnar import load_npz, decode
+    moves = load_npz("out/columnar/moves.npz")
+    fire = moves["power"][decode(moves, "type") == "Fire"]
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+SCRIPT_DIR = Path(__file__).parent
+DB_PATH = SCRIPT_DIR.parent / "src" / "Starfield2026.Assets" / "Data" / "gamedata.db"
+OUT_DIR = SCRIPT_DIR / "out" / "columnar"
+
+# Enum orders mirror src/Starfield2026.Core (MoveType, MoveCategory, GrowthRate, ItemCategory)
+MOVE_TYPES = [
+    "Normal", "Fire", "Water", "Grass", "Electric", "Ice", "Fighting", "Poison",
+    "Ground", "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon", "Dark", "Steel", "Fairy",
+]
+MOVE_CATEGORIES = ["Physical", "Special", "Status"]
+GROWTH_RATES = ["Erratic", "Fast", "MediumFast", "MediumSlow", "Slow", "Fluctuating"]
+ITEM_CATEGORIES = [
+    "Pokeball", "Medicine", "Battle", "Berry", "KeyItem", "TM", "HM",
+    "EvolutionStone", "HeldItem", "Valuable", "Mail",
+]
+
+# (table, column) -> fixed vocabulary, or None to build it from the data (sorted)
+CATEGORICAL = {
+    ("species", "type1"): MOVE_TYPES,
+    ("species", "type2"): MOVE_TYPES,
+    ("species", "growth_rate"): GROWTH_RATES,
+    ("moves", "type"): MOVE_TYPES,
+    ("moves", "category"): MOVE_CATEGORIES,
+    ("items", "category"): ITEM_CATEGORIES,
+    ("learnsets", "method"): None,
+    ("evolutions", "trigger"): None,
+    ("evolutions", "time_of_day"): None,
+    ("evolutions", "known_move_type"): None,
+}
+
+TABLES = ["species", "moves", "items", "learnsets", "evolutions"]
+
+# species.json key -> gamedata.db column, for both species.json shapes
+SPECIES_JSON_KEYS = {
+    "id": "id",
+    "name": "name",
+    "baseHP": "hp", "hp": "hp",
+    "baseAttack": "attack", "attack": "attack",
+    "baseDefense": "defense", "defense": "defense",
+    "baseSpAttack": "sp_attack", "spAttack": "sp_attack",
+    "baseSpDefense": "sp_defense", "spDefense": "sp_defense",
+    "baseSpeed": "speed", "speed": "speed",
+    "type1": "type1",
+    "type2": "type2",
+    "baseEXPYield": "base_exp_yield", "baseExpYield": "base_exp_yield",
+    "growthRate": "growth_rate",
+    "captureRate": "catch_rate", "catchRate": "catch_rate",
+    "baseHappiness": "base_happiness",
+    "genderRate": "gender_rate",
+}
+
+
+# --- Loading ---
+
+def read_table(conn: sqlite3.Connection, table: str) -> tuple[list[str], list[str], list[tuple]]:
+    """Column names, declared types and all rows of one table."""
+    info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    names = [c[1] for c in info]
+    types = [c[2].upper() for c in info]
+    order = "id" if "id" in names else ", ".join(names[:2])
+    rows = conn.execute(f"SELECT {', '.join(names)} FROM {table} ORDER BY {order}").fetchall()
+    return names, types, rows
+
+
+def load_species_json(path: Path) -> tuple[list[str], list[str], list[tuple]]:
+    """species.json rows normalized to gamedata.db column names.
+
+    Columns present in only one shape (base_happiness, gender_rate) are kept
+    when the file has them.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    columns: list[str] = []
+    for key in entries[0] if entries else []:
+        col = SPECIES_JSON_KEYS.get(key)
+        if col and col not in columns:
+            columns.append(col)
+    key_for = {col: [k for k, c in SPECIES_JSON_KEYS.items() if c == col] for col in columns}
+    rows = []
+    for entry in entries:
+        row = []
+        for col in columns:
+            value = next((entry[k] for k in key_for[col] if k in entry), None)
+            # fetch_pokeapi.py repeats type1 when a species has one type
+            if col == "type2" and value == entry.get("type1"):
+                value = None
+            row.append(value)
+        rows.append(tuple(row))
+    types = ["TEXT" if c in ("name", "type1", "type2", "growth_rate") else "INTEGER" for c in columns]
+    return columns, types, rows
+
+
+# --- Encoding ---
+
+def encode_columns(table: str, names: list[str], types: list[str], rows: list[tuple]) -> dict:
+    """Column name -> (kind, payload) with kind in int / text / category."""
+    columns = {}
+    values_by_col = list(zip(*rows)) if rows else [()] * len(names)
+    for name, decl, values in zip(names, types, values_by_col):
+        key = (table, name)
+        if key in CATEGORICAL:
+            vocab = CATEGORICAL[key]
+            if vocab is None:
+                vocab = sorted({v for v in values if v is not None})
+            else:
+                extra = sorted({v for v in values if v is not None and v not in vocab})
+                if extra:
+                    print(f"  WARNING: {table}.{name} has values outside the enum: {extra}")
+                    vocab = vocab + extra
+            index = {label: i for i, label in enumerate(vocab)}
+            codes = np.fromiter((index[v] if v is not None else -1 for v in values),
+                                dtype=np.int8 if len(vocab) < 128 else np.int16, count=len(values))
+            columns[name] = ("category", (codes, np.array(vocab, dtype=str)))
+        elif "INT" in decl:
+            nulls = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+            data = np.fromiter((0 if v is None else v for v in values), dtype=np.int64, count=len(values))
+            columns[name] = ("int", (data.astype(_int_dtype(data)), nulls))
+        else:
+            nulls = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+            data = np.array(["" if v is None else v for v in values], dtype=str)
+            columns[name] = ("text", (data, nulls))
+    return columns
+
+
+def _int_dtype(data: np.ndarray) -> type:
+    """Narrowest signed integer dtype that holds every value."""
+    if data.size == 0:
+        return np.int32
+    lo, hi = int(data.min()), int(data.max())
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return np.int64
+
+
+# --- Writers ---
+
+def write_npz(path: Path, columns: dict):
+    arrays = {}
+    for name, (kind, payload) in columns.items():
+        if kind == "category":
+            codes, vocab = payload
+            arrays[name] = codes
+            arrays[f"{name}__categories"] = vocab
+        else:
+            data, nulls = payload
+            arrays[name] = data
+            if nulls.any():
+                arrays[f"{name}__null"] = nulls
+    np.savez_compressed(path, **arrays)
+
+
+def write_parquet(path: Path, columns: dict):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fields = {}
+    for name, (kind, payload) in columns.items():
+        if kind == "category":
+            codes, vocab = payload
+            mask = codes < 0
+            fields[name] = pa.DictionaryArray.from_arrays(
+                pa.array(np.where(mask, 0, codes), mask=mask), pa.array(vocab.tolist()))
+        else:
+            data, nulls = payload
+            fields[name] = pa.array(data, mask=nulls if nulls.any() else None)
+    pq.write_table(pa.table(fields), path, compression="zstd")
+
+
+def has_pyarrow() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# --- Reading back ---
+
+def load_npz(path: str | Path) -> dict[str, np.ndarray]:
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def decode(columns: dict[str, np.ndarray], name: str) -> np.ndarray:
+    """Labels for a dictionary-encoded column; NULL becomes ""."""
+    vocab = np.append(columns[f"{name}__categories"], "")
+    return vocab[columns[name]]  # code -1 indexes the trailing ""
+
+
+# --- Export ---
+
+def export(sources: dict[str, tuple[str, list[str], list[str], list[tuple]]], out_dir: Path, fmt: str) -> list[tuple]:
+    """Write one file per source; returns (name, rows, columns, bytes, path).
+
+    sources maps an output name to (schema table, column names, declared types, rows);
+    the schema table selects the CATEGORICAL vocabularies.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    suffix = ".parquet" if fmt == "parquet" else ".npz"
+    results = []
+    for table, (schema, names, types, rows) in sources.items():
+        encoded = encode_columns(schema, names, types, rows)
+        path = out_dir / f"{table}{suffix}"
+        if fmt == "parquet":
+            write_parquet(path, encoded)
+        else:
+            write_npz(path, encoded)
+        results.append((table, len(rows), len(names), path.stat().st_size, path))
+    return results
+
+
+def export_gamedata(db_path: Path, out_dir: Path, fmt: str = "auto", tables: list[str] | None = None) -> list[tuple]:
+    fmt = resolve_format(fmt)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    present = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    sources = {t: (t, *read_table(conn, t)) for t in (tables or TABLES) if t in present}
+    conn.close()
+    return export(sources, out_dir, fmt)
+
+
+def export_species_json(json_path: Path, out_dir: Path, fmt: str = "auto") -> list[tuple]:
+    # Written as species_json.* so it can sit next to the gamedata.db species export
+    return export({"species_json": ("species", *load_species_json(json_path))}, out_dir, resolve_format(fmt))
+
+
+def resolve_format(fmt: str) -> str:
+    if fmt == "auto":
+        return "parquet" if has_pyarrow() else "npz"
+    if fmt == "parquet" and not has_pyarrow():
+        print("ERROR: --format parquet needs pyarrow (pip install pyarrow)")
+        sys.exit(1)
+    return fmt
+
+
+def print_results(results: list[tuple]):
+    for table, rows, cols, size, path in results:
+        print(f"  {table:<14} {rows:>7,} rows  {cols:>3} cols  {size / 1024:>8.1f} KB  {path.name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export gamedata.db / species.json to columnar files")
+    parser.add_argument("--db", type=str, default=str(DB_PATH), help="Path to gamedata.db")
+    parser.add_argument("--species-json", type=str, default=None, help="Also export this species.json")
+    parser.add_argument("--out", type=str, default=str(OUT_DIR), help=f"Output directory (default: {OUT_DIR})")
+    parser.add_argument("--format", choices=["auto", "npz", "parquet"], default="auto",
+                        help="auto = parquet when pyarrow is installed, else npz")
+    parser.add_argument("--tables", nargs="+", choices=TABLES, default=None, help="Subset of gamedata.db tables")
+    parser.add_argument("--no-db", action="store_true", help="Skip gamedata.db (export --species-json only)")
+    args = parser.parse_args()
+
+    out_dir = Path(args.out)
+    start = time.perf_counter()
+    results = []
+    if not args.no_db:
+        db_path = Path(args.db)
+        if not db_path.exists():
+            print(f"ERROR: {db_path} not found")
+            sys.exit(1)
+        results += export_gamedata(db_path, out_dir, args.format, args.tables)
+    if args.species_json:
+        results += export_species_json(Path(args.species_json), out_dir, args.format)
+
+    print(f"Exported {len(results)} tables ({resolve_format(args.format)}) to {out_dir}")
+    print_results(results)
+    print(f"Done in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
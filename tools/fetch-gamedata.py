@@ -3,15 +3,35 @@
 Fetch Pokemon game data from PokeAPI and write directly into gamedata.db.
 
 Downloads moves, learnsets, and evolution chains in batches of 100
-with a cooldown between batches to avoid throttling.
+with a cooldown between batches to avoid throttling. Requests go through
+http_retry.py: 429/5xx/timeouts are retried with backoff, a degraded host
+pauses the run, and URLs that still fail are retried once at the end of
+each section.
+
+Each /pokemon/{id} payload is fetched once and every version group's
+learnset is stored in learnsets_by_version. The learnsets table the game
+reads is then materialized for the selected ruleset, so switching
+--gen / --version-group re-downloads nothing. Species the ruleset's
+version groups don't cover fall back to older generations' groups;
+species with no stored per-version rows keep their current learnsets.
+Species past the --gen limit lose theirs, so a lower --gen never leaves
+a newer ruleset behind. An unknown --version-group is an error.
 
 Usage:
-    python fetch-gamedata.py                  # fetch all
+    python fetch-gamedata.py                  # fetch all (Gen 7, USUM learnsets)
     python fetch-gamedata.py --only moves     # fetch only moves
     python fetch-gamedata.py --only learnsets
     python fetch-gamedata.py --only evolutions
+    python fetch-gamedata.py --only learnsets --version-group sun-moon
+    python fetch-gamedata.py --gen 6          # ORAS learnsets, species 1-721
+    python fetch-gamedata.py --api-base http://127.0.0.1:8765/api/v2 --db scratch.db   # mock_pokeapi.py
+    python fetch-gamedata.py --trace fetch.jsonl   # per-request timing trace (telemetry.py)
+    python fetch-gamedata.py --export out/columnar # then write .npz/.parquet tables (export_columnar.py)
 
-Writes directly to: src/Starfield.Assets/Data/gamedata.db
+After evolutions are fetched the evolution_family / evolution_closure
+lookup tables are rebuilt (evolution_graph.py).
+
+Writes directly to src/Starfield2026.Assets/Data/gamedata.db, or --db.
 """
 
 import argparse
@@ -23,15 +43,37 @@ from pathlib import Path
 import requests
 from tqdm import tqdm
 
+import evolution_graph
+import gamedata_lookup
+import http_retry
+import telemetry
+
 API_BASE = "https://pokeapi.co/api/v2"
 SCRIPT_DIR = Path(__file__).parent
-DB_PATH = SCRIPT_DIR.parent / "src" / "Starfield.Assets" / "Data" / "gamedata.db"
+DB_PATH = SCRIPT_DIR.parent / "src" / "Starfield2026.Assets" / "Data" / "gamedata.db"
+
+DEFAULT_GEN = 7
+
+# Cumulative species / move counts per generation
+GEN_MAX_SPECIES = {1: 151, 2: 251, 3: 386, 4: 493, 5: 649, 6: 721, 7: 807, 8: 905, 9: 1025}
+GEN_MAX_MOVE = {1: 165, 2: 251, 3: 354, 4: 467, 5: 559, 6: 621, 7: 728, 8: 826, 9: 919}
+
+# Learnset version groups per generation, preferred first. A move missing
+# from the first group falls back to the next (e.g. USUM -> SM).
+GEN_VERSION_GROUPS = {
+    1: ["yellow", "red-blue"],
+    2: ["crystal", "gold-silver"],
+    3: ["emerald", "firered-leafgreen", "ruby-sapphire"],
+    4: ["platinum", "heartgold-soulsilver", "diamond-pearl"],
+    5: ["black-2-white-2", "black-white"],
+    6: ["omega-ruby-alpha-sapphire", "x-y"],
+    7: ["ultra-sun-ultra-moon", "sun-moon"],
+    8: ["sword-shield"],
+    9: ["scarlet-violet"],
+}
 
-# Gen 7 (Ultra Sun/Ultra Moon)
-MAX_SPECIES_ID = 807
-MAX_MOVE_ID = 728
-VERSION_GROUP = "ultra-sun-ultra-moon"
-FALLBACK_VERSION_GROUP = "sun-moon"
+MAX_SPECIES_ID = GEN_MAX_SPECIES[DEFAULT_GEN]
+MAX_MOVE_ID = GEN_MAX_MOVE[DEFAULT_GEN]
 
 BATCH_SIZE = 100
 BATCH_COOLDOWN = 6  # seconds between batches
@@ -53,30 +95,38 @@ CATEGORY_MAP = {
 
 # --- Helpers ---
 
-def fetch_json(session: requests.Session, url: str) -> dict | None:
+def fetch_json(client: http_retry.RetryingClient, url: str, key: int) -> dict | None:
+    """Payload for url, or None if it does not exist or is dead-lettered under key."""
     try:
-        resp = session.get(url, timeout=30)
-        if resp.status_code == 404:
-            return None
-        resp.raise_for_status()
-        return resp.json()
-    except requests.RequestException as e:
+        return client.get_json(url, key)
+    except http_retry.FetchFailed as e:
+        telemetry.count("errors")
         tqdm.write(f"    ERROR: {e}")
         return None
 
 
-def create_session() -> requests.Session:
+def create_client(policy: http_retry.RetryPolicy) -> http_retry.RetryingClient:
     session = requests.Session()
     session.headers["User-Agent"] = "Starfield-DataFetcher/2.0"
-    return session
+    return http_retry.RetryingClient(http_retry.requests_transport(session), policy, log=tqdm.write)
 
 
 def batch_cooldown(bar: tqdm):
     """Show a countdown in the progress bar during cooldown."""
-    for remaining in range(BATCH_COOLDOWN, 0, -1):
-        bar.set_postfix_str(f"cooldown {remaining}s")
-        time.sleep(1)
-    bar.set_postfix_str("")
+    with telemetry.stage("cooldown"):
+        for remaining in range(BATCH_COOLDOWN, 0, -1):
+            bar.set_postfix_str(f"cooldown {remaining}s")
+            time.sleep(1)
+        bar.set_postfix_str("")
+
+
+def insert_rows(conn: sqlite3.Connection, sql: str, rows: list[tuple]):
+    """executemany + commit for one batch, timed as the "commit" stage."""
+    with telemetry.stage("commit", rows=len(rows)):
+        conn.executemany(sql, rows)
+        conn.commit()
+    telemetry.count("rows", len(rows))
+    telemetry.count("commits")
 
 
 # --- Schema ---
@@ -102,6 +152,15 @@ def ensure_schema(conn: sqlite3.Connection):
             PRIMARY KEY (species_id, move_id, method)
         );
 
+        CREATE TABLE IF NOT EXISTS learnsets_by_version (
+            species_id      INTEGER NOT NULL,
+            move_id         INTEGER NOT NULL,
+            version_group   TEXT NOT NULL,
+            method          TEXT NOT NULL,
+            level           INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (species_id, move_id, version_group, method, level)
+        );
+
         CREATE TABLE IF NOT EXISTS evolutions (
             from_species_id INTEGER NOT NULL,
             to_species_id   INTEGER NOT NULL,
@@ -126,9 +185,25 @@ def get_existing_ids(conn: sqlite3.Connection, table: str, id_col: str = "id") -
 
 # --- Moves ---
 
-def fetch_and_insert_moves(conn: sqlite3.Connection, session: requests.Session):
+INSERT_MOVE = "INSERT OR IGNORE INTO moves (id, name, type, category, power, accuracy, pp, priority) VALUES (?,?,?,?,?,?,?,?)"
+
+
+def move_row(data: dict) -> tuple:
+    return (
+        data["id"],
+        data["name"].replace("-", " ").title(),
+        TYPE_MAP.get(data["type"]["name"], "Normal"),
+        CATEGORY_MAP.get(data["damage_class"]["name"], "Physical"),
+        data["power"] or 0,
+        data["accuracy"] or 0,
+        data["pp"] or 0,
+        data.get("priority", 0),
+    )
+
+
+def fetch_and_insert_moves(conn: sqlite3.Connection, client: http_retry.RetryingClient, max_move_id: int = MAX_MOVE_ID):
     existing = get_existing_ids(conn, "moves")
-    ids = [i for i in range(1, MAX_MOVE_ID + 1) if i not in existing]
+    ids = [i for i in range(1, max_move_id + 1) if i not in existing]
 
     if not ids:
         print(f"  All {len(existing)} moves already in DB, skipping.")
@@ -145,45 +220,62 @@ def fetch_and_insert_moves(conn: sqlite3.Connection, session: requests.Session):
 
         rows = []
         for move_id in batch:
-            data = fetch_json(session, f"{API_BASE}/move/{move_id}")
+            data = fetch_json(client, f"{API_BASE}/move/{move_id}", move_id)
             if data is None:
                 errors += 1
             else:
-                rows.append((
-                    data["id"],
-                    data["name"].replace("-", " ").title(),
-                    TYPE_MAP.get(data["type"]["name"], "Normal"),
-                    CATEGORY_MAP.get(data["damage_class"]["name"], "Physical"),
-                    data["power"] or 0,
-                    data["accuracy"] or 0,
-                    data["pp"] or 0,
-                    data.get("priority", 0),
-                ))
+                with telemetry.stage("rows"):
+                    rows.append(move_row(data))
             bar.update(1)
 
         if rows:
-            conn.executemany(
-                "INSERT OR IGNORE INTO moves (id, name, type, category, power, accuracy, pp, priority) VALUES (?,?,?,?,?,?,?,?)",
-                rows
-            )
-            conn.commit()
+            insert_rows(conn, INSERT_MOVE, rows)
             inserted += len(rows)
 
         if batch_start + BATCH_SIZE < len(ids):
             batch_cooldown(bar)
 
     bar.close()
+
+    rows = [move_row(data) for _, data in client.retry_dead_letters() if data is not None]
+    if rows:
+        insert_rows(conn, INSERT_MOVE, rows)
+        inserted += len(rows)
+        errors -= len(rows)
+    client.report_dead_letters()
     print(f"  Done: {inserted} inserted, {errors} errors")
 
 
 # --- Learnsets ---
 
-def fetch_and_insert_learnsets(conn: sqlite3.Connection, session: requests.Session):
-    existing = get_existing_ids(conn, "learnsets", "species_id")
-    ids = [i for i in range(1, MAX_SPECIES_ID + 1) if i not in existing]
+def learnset_rows(species_id: int, data: dict) -> list[tuple]:
+    """Every version group's learnset entries from one /pokemon payload."""
+    rows = []
+    for move_entry in data.get("moves", []):
+        move_url = move_entry["move"]["url"]
+        move_id = int(move_url.rstrip("/").split("/")[-1])
+        for vgd in move_entry.get("version_group_details", []):
+            rows.append((
+                species_id,
+                move_id,
+                vgd["version_group"]["name"],
+                vgd["move_learn_method"]["name"],
+                vgd["level_learned_at"],
+            ))
+    return rows
+
+
+INSERT_LEARNSET = """INSERT OR IGNORE INTO learnsets_by_version
+                     (species_id, move_id, version_group, method, level) VALUES (?,?,?,?,?)"""
+
+
+def fetch_and_insert_learnsets(conn: sqlite3.Connection, client: http_retry.RetryingClient,
+                               max_species_id: int = MAX_SPECIES_ID):
+    existing = get_existing_ids(conn, "learnsets_by_version", "species_id")
+    ids = [i for i in range(1, max_species_id + 1) if i not in existing]
 
     if not ids:
-        print(f"  All {len(existing)} species learnsets already in DB, skipping.")
+        print(f"  All {len(existing)} species learnsets already in DB, skipping fetch.")
         return
 
     print(f"  {len(existing)} existing, {len(ids)} species to fetch")
@@ -197,37 +289,16 @@ def fetch_and_insert_learnsets(conn: sqlite3.Connection, session: requests.Sessi
 
         rows = []
         for species_id in batch:
-            data = fetch_json(session, f"{API_BASE}/pokemon/{species_id}")
+            data = fetch_json(client, f"{API_BASE}/pokemon/{species_id}", species_id)
             if data is None:
                 errors += 1
-                bar.update(1)
-                continue
-
-            for move_entry in data.get("moves", []):
-                move_url = move_entry["move"]["url"]
-                move_id = int(move_url.rstrip("/").split("/")[-1])
-
-                # Try USUM first, fall back to SM
-                found = False
-                for vg in (VERSION_GROUP, FALLBACK_VERSION_GROUP):
-                    for vgd in move_entry.get("version_group_details", []):
-                        if vgd["version_group"]["name"] != vg:
-                            continue
-                        method = vgd["move_learn_method"]["name"]
-                        level = vgd["level_learned_at"]
-                        rows.append((species_id, move_id, method, level))
-                        found = True
-                    if found:
-                        break
-
+            else:
+                with telemetry.stage("rows"):
+                    rows.extend(learnset_rows(species_id, data))
             bar.update(1)
 
         if rows:
-            conn.executemany(
-                "INSERT OR IGNORE INTO learnsets (species_id, move_id, method, level) VALUES (?,?,?,?)",
-                rows
-            )
-            conn.commit()
+            insert_rows(conn, INSERT_LEARNSET, rows)
             inserted += len(rows)
             bar.set_postfix_str(f"{inserted} entries")
 
@@ -235,21 +306,110 @@ def fetch_and_insert_learnsets(conn: sqlite3.Connection, session: requests.Sessi
             batch_cooldown(bar)
 
     bar.close()
-    print(f"  Done: {inserted} entries inserted, {errors} errors")
+
+    rows = []
+    for species_id, data in client.retry_dead_letters():
+        if data is not None:
+            rows.extend(learnset_rows(species_id, data))
+            errors -= 1
+    if rows:
+        insert_rows(conn, INSERT_LEARNSET, rows)
+        inserted += len(rows)
+    client.report_dead_letters()
+    print(f"  Done: {inserted} entries inserted (all version groups), {errors} errors")
+
+
+def select_learnsets(conn: sqlite3.Connection, tiers: list[list[str]], max_species_id: int):
+    """Rebuild learnsets from learnsets_by_version for one ruleset, no network.
+
+    tiers is a list of version group chains (resolve_version_groups). Each
+    species uses the first chain it has stored rows in; within that chain,
+    for each move the rows of the first version group that teaches it are
+    used. Species above max_species_id are not part of the ruleset and lose
+    their learnsets; species up to it with no stored rows in any chain keep
+    their existing ones.
+    """
+    stored = conn.execute("SELECT COUNT(*) FROM learnsets_by_version").fetchone()[0]
+    if stored == 0:
+        print("  No per-version learnsets stored, keeping existing learnsets table.")
+        return
+
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS vg_rank "
+                 "(version_group TEXT PRIMARY KEY, tier INTEGER NOT NULL, rank INTEGER NOT NULL)")
+    conn.execute("DELETE FROM vg_rank")
+    ranks = [(vg, tier) for tier, chain in enumerate(tiers) for vg in chain]
+    conn.executemany("INSERT OR IGNORE INTO vg_rank VALUES (?, ?, ?)",
+                     [(vg, tier, rank) for rank, (vg, tier) in enumerate(ranks)])
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS species_tier (species_id INTEGER PRIMARY KEY, tier INTEGER NOT NULL)")
+    conn.execute("DELETE FROM species_tier")
+
+    with telemetry.stage("select"):
+        conn.execute("""
+            INSERT INTO species_tier
+            SELECT lv.species_id, MIN(vr.tier)
+            FROM learnsets_by_version lv
+            JOIN vg_rank vr ON vr.version_group = lv.version_group
+            WHERE lv.species_id <= ?
+            GROUP BY lv.species_id
+        """, (max_species_id,))
+        dropped = conn.execute("SELECT COUNT(DISTINCT species_id) FROM learnsets WHERE species_id > ?",
+                               (max_species_id,)).fetchone()[0]
+        conn.execute("DELETE FROM learnsets WHERE species_id > ?", (max_species_id,))
+        conn.execute("DELETE FROM learnsets WHERE species_id IN (SELECT species_id FROM species_tier)")
+        conn.execute("""
+            INSERT OR IGNORE INTO learnsets (species_id, move_id, method, level)
+            SELECT l.species_id, l.move_id, l.method, MIN(l.level)
+            FROM learnsets_by_version l
+            JOIN vg_rank r ON r.version_group = l.version_group
+            JOIN (
+                SELECT lv.species_id, lv.move_id, MIN(vr.rank) AS best
+                FROM learnsets_by_version lv
+                JOIN vg_rank vr ON vr.version_group = lv.version_group
+                JOIN species_tier st ON st.species_id = lv.species_id AND st.tier = vr.tier
+                GROUP BY lv.species_id, lv.move_id
+            ) b ON b.species_id = l.species_id AND b.move_id = l.move_id AND b.best = r.rank
+            GROUP BY l.species_id, l.move_id, l.method
+        """)
+        conn.commit()
+
+    per_tier = dict(conn.execute("SELECT tier, COUNT(*) FROM species_tier GROUP BY tier"))
+    count = conn.execute("SELECT COUNT(*) FROM learnsets WHERE species_id IN "
+                         "(SELECT species_id FROM species_tier)").fetchone()[0]
+    print(f"  Selected {' > '.join(tiers[0])}: {count} entries for {sum(per_tier.values())} species")
+    for tier in sorted(per_tier):
+        if tier:
+            print(f"    {per_tier[tier]} species not in that chain fell back to {' > '.join(tiers[tier])}")
+    if dropped:
+        print(f"    {dropped} species above #{max_species_id} are outside this ruleset; removed their learnsets")
+    kept = conn.execute("SELECT COUNT(DISTINCT species_id) FROM learnsets WHERE species_id NOT IN "
+                        "(SELECT species_id FROM species_tier)").fetchone()[0]
+    if kept:
+        print(f"    {kept} species without stored per-version data kept their existing learnsets")
 
 
 # --- Evolutions ---
 
+def species_id_from_url(url: str) -> int:
+    return int(url.rstrip("/").split("/")[-1])
+
+
 def flatten_chain(chain: dict) -> list[tuple]:
-    """Recursively flatten an evolution chain into rows."""
+    """Flatten an evolution chain into rows, depth-first, without recursion.
+
+    An explicit stack of child iterators keeps the original pre-order
+    (each edge, then that child's subtree) for any depth or fan-out.
+    """
     results = []
-    from_url = chain["species"]["url"]
-    from_id = int(from_url.rstrip("/").split("/")[-1])
+    stack = [(species_id_from_url(chain["species"]["url"]), iter(chain.get("evolves_to", [])))]
 
-    for evo in chain.get("evolves_to", []):
-        to_url = evo["species"]["url"]
-        to_id = int(to_url.rstrip("/").split("/")[-1])
+    while stack:
+        from_id, pending = stack[-1]
+        evo = next(pending, None)
+        if evo is None:
+            stack.pop()
+            continue
 
+        to_id = species_id_from_url(evo["species"]["url"])
         for detail in evo.get("evolution_details", []):
             trigger = detail["trigger"]["name"]
             results.append((
@@ -266,12 +426,18 @@ def flatten_chain(chain: dict) -> list[tuple]:
                 detail.get("gender"),
             ))
 
-        results.extend(flatten_chain(evo))
+        stack.append((to_id, iter(evo.get("evolves_to", []))))
 
     return results
 
 
-def fetch_and_insert_evolutions(conn: sqlite3.Connection, session: requests.Session):
+INSERT_EVOLUTION = """INSERT OR IGNORE INTO evolutions
+                      (from_species_id, to_species_id, trigger, min_level, item, held_item,
+                       known_move, known_move_type, min_happiness, time_of_day, gender)
+                      VALUES (?,?,?,?,?,?,?,?,?,?,?)"""
+
+
+def fetch_and_insert_evolutions(conn: sqlite3.Connection, client: http_retry.RetryingClient):
     existing_pairs = conn.execute("SELECT DISTINCT from_species_id, to_species_id FROM evolutions").fetchall()
 
     if len(existing_pairs) > 0:
@@ -292,21 +458,14 @@ def fetch_and_insert_evolutions(conn: sqlite3.Connection, session: requests.Sess
 
         rows = []
         for chain_id in batch:
-            data = fetch_json(session, f"{API_BASE}/evolution-chain/{chain_id}")
+            data = fetch_json(client, f"{API_BASE}/evolution-chain/{chain_id}", chain_id)
             if data is not None:
-                chain_rows = flatten_chain(data["chain"])
-                rows.extend(chain_rows)
+                with telemetry.stage("rows"):
+                    rows.extend(flatten_chain(data["chain"]))
             bar.update(1)
 
         if rows:
-            conn.executemany(
-                """INSERT OR IGNORE INTO evolutions
-                   (from_species_id, to_species_id, trigger, min_level, item, held_item,
-                    known_move, known_move_type, min_happiness, time_of_day, gender)
-                   VALUES (?,?,?,?,?,?,?,?,?,?,?)""",
-                rows
-            )
-            conn.commit()
+            insert_rows(conn, INSERT_EVOLUTION, rows)
             inserted += len(rows)
             bar.set_postfix_str(f"{inserted} records")
 
@@ -314,50 +473,122 @@ def fetch_and_insert_evolutions(conn: sqlite3.Connection, session: requests.Sess
             batch_cooldown(bar)
 
     bar.close()
+
+    rows = []
+    for _, data in client.retry_dead_letters():
+        if data is not None:
+            rows.extend(flatten_chain(data["chain"]))
+    if rows:
+        insert_rows(conn, INSERT_EVOLUTION, rows)
+        inserted += len(rows)
+    client.report_dead_letters()
     print(f"  Done: {inserted} evolution records inserted")
 
 
 # --- Main ---
 
+def resolve_version_groups(gen: int, version_group: str | None, stored: set[str] = frozenset()) -> list[list[str]]:
+    """Version group chains for --gen / --version-group, preferred first: the
+    ruleset's own chain, then older generations' chains for species it lacks.
+
+    Raises ValueError for a version group that is neither known nor stored.
+    """
+    if version_group is None:
+        chain = GEN_VERSION_GROUPS[gen]
+    else:
+        gen, chain = next(((g, groups[groups.index(version_group):])
+                           for g, groups in GEN_VERSION_GROUPS.items() if version_group in groups), (gen, None))
+        if chain is None:
+            if version_group not in stored:
+                known = sorted({vg for groups in GEN_VERSION_GROUPS.values() for vg in groups} | stored)
+                raise ValueError(f"unknown version group {version_group!r} (known: {', '.join(known)})")
+            chain = [version_group]
+    return [chain] + [GEN_VERSION_GROUPS[g] for g in range(gen - 1, 0, -1)]
+
+
 def main():
+    global API_BASE
+
     parser = argparse.ArgumentParser(description="Fetch game data from PokeAPI into gamedata.db")
     parser.add_argument("--only", type=str, choices=["moves", "learnsets", "evolutions"],
                         help="Fetch only one data type")
+    parser.add_argument("--gen", type=int, default=DEFAULT_GEN, choices=sorted(GEN_MAX_SPECIES),
+                        help=f"Generation ruleset: species/move range and learnset version groups (default: {DEFAULT_GEN})")
+    parser.add_argument("--version-group", type=str, default=None,
+                        help="Learnset version group to select (default: newest for --gen)")
+    parser.add_argument("--api-base", type=str, default=API_BASE,
+                        help=f"PokeAPI base URL (default: {API_BASE})")
+    parser.add_argument("--db", type=str, default=str(DB_PATH),
+                        help="gamedata.db to write (default: the assets copy; point at a scratch copy for mock runs)")
+    parser.add_argument("--export", type=str, default=None, metavar="DIR",
+                        help="After fetching, export gamedata.db as columnar files to DIR (export_columnar.py)")
+    parser.add_argument("--export-format", choices=["auto", "npz", "parquet"], default="auto")
+    http_retry.add_arguments(parser)
+    telemetry.add_arguments(parser)
     args = parser.parse_args()
 
-    if not DB_PATH.exists():
-        print(f"ERROR: {DB_PATH} not found. Run seed-gamedata.mjs first.")
+    API_BASE = args.api_base.rstrip("/")
+    telemetry.setup("fetch-gamedata", trace=args.trace, summary=not args.no_summary)
+
+    max_species_id = GEN_MAX_SPECIES[args.gen]
+    max_move_id = GEN_MAX_MOVE[args.gen]
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"ERROR: {db_path} not found. Run seed-gamedata.mjs first.")
         sys.exit(1)
 
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(str(db_path))
     ensure_schema(conn)
+    stored = {vg for (vg,) in conn.execute("SELECT DISTINCT version_group FROM learnsets_by_version")}
+    try:
+        tiers = resolve_version_groups(args.gen, args.version_group, stored)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        conn.close()
+        sys.exit(1)
 
-    session = create_session()
+    client = create_client(http_retry.policy_from_args(args))
     targets = [args.only] if args.only else ["moves", "learnsets", "evolutions"]
 
-    print(f"PokeAPI -> {DB_PATH}")
+    print(f"{API_BASE} -> {db_path}")
     print(f"  Batch: {BATCH_SIZE}, cooldown: {BATCH_COOLDOWN}s")
+    print(f"  Gen {args.gen}, learnsets from: {' > '.join(tiers[0])}")
     print()
 
     start = time.time()
 
     if "moves" in targets:
-        print(f"=== Moves (1-{MAX_MOVE_ID}) ===")
-        fetch_and_insert_moves(conn, session)
+        print(f"=== Moves (1-{max_move_id}) ===")
+        fetch_and_insert_moves(conn, client, max_move_id)
         print()
 
     if "learnsets" in targets:
-        print(f"=== Learnsets (species 1-{MAX_SPECIES_ID}) ===")
-        fetch_and_insert_learnsets(conn, session)
+        print(f"=== Learnsets (species 1-{max_species_id}) ===")
+        fetch_and_insert_learnsets(conn, client, max_species_id)
+        select_learnsets(conn, tiers, max_species_id)
         print()
 
     if "evolutions" in targets:
         print("=== Evolution Chains ===")
-        fetch_and_insert_evolutions(conn, session)
+        fetch_and_insert_evolutions(conn, client)
+        with telemetry.stage("evolution_graph"):
+            stats = evolution_graph.materialize(conn)
+        evolution_graph.print_stats(stats)
         print()
 
+    # Name lookups (gamedata_lookup.py) seek these instead of scanning
+    gamedata_lookup.ensure_name_indexes(conn)
     conn.close()
 
+    if args.export:
+        import export_columnar
+        print(f"=== Columnar export -> {args.export} ===")
+        with telemetry.stage("export"):
+            results = export_columnar.export_gamedata(db_path, Path(args.export), args.export_format)
+        export_columnar.print_results(results)
+        print()
+
     elapsed = time.time() - start
     minutes = int(elapsed // 60)
     seconds = int(elapsed % 60)
@@ -5,6 +5,9 @@ suitable for loading into SpeciesRegistry.
 
 Usage:
     python fetch_pokeapi.py [--gen 7] [--output ../src/Starfield.Assets/Content/Data/species.json]
+    python fetch_pokeapi.py --api-base http://127.0.0.1:8765/api/v2   # mock_pokeapi.py
+    python fetch_pokeapi.py --trace species.jsonl   # per-request timing trace (telemetry.py)
+    python fetch_pokeapi.py --export out/columnar   # then write species_json.npz/.parquet (export_columnar.py)
 
 Ultra Sun/Moon = Gen 7, Pokemon IDs 1-807.
 """
@@ -18,6 +21,9 @@ from pathlib import Path
 
 import requests
 
+import http_retry
+import telemetry
+
 API_BASE = "https://pokeapi.co/api/v2"
 
 # PokeAPI growth rate name -> our GrowthRate enum name
@@ -74,24 +80,29 @@ def get_gen_pokemon_ids(gen: int) -> list[int]:
     return list(range(1, max_id + 1))
 
 
-def fetch_pokemon(pokemon_id: int, session: requests.Session) -> dict | None:
+def fetch_pokemon(pokemon_id: int, client: http_retry.RetryingClient) -> dict | None:
     """Fetch combined pokemon + species data from PokeAPI."""
     # Pokemon endpoint: stats, types, base_experience
     poke_url = f"{API_BASE}/pokemon/{pokemon_id}"
     species_url = f"{API_BASE}/pokemon-species/{pokemon_id}"
 
     try:
-        poke_resp = session.get(poke_url, timeout=30)
-        poke_resp.raise_for_status()
-        poke = poke_resp.json()
-
-        species_resp = session.get(species_url, timeout=30)
-        species_resp.raise_for_status()
-        species = species_resp.json()
-    except requests.RequestException as e:
+        poke = client.get_json(poke_url, pokemon_id)
+        species = client.get_json(species_url, pokemon_id) if poke is not None else None
+    except http_retry.FetchFailed as e:
+        telemetry.count("errors")
         print(f"  ERROR fetching #{pokemon_id}: {e}")
         return None
+    if poke is None or species is None:
+        print(f"  #{pokemon_id} not found")
+        return None
+
+    with telemetry.stage("rows"):
+        return build_entry(pokemon_id, poke, species)
+
 
+def build_entry(pokemon_id: int, poke: dict, species: dict) -> dict:
+    """One species.json entry from the /pokemon and /pokemon-species payloads."""
     # Extract types
     types = sorted(poke["types"], key=lambda t: t["slot"])
     type1 = TYPE_MAP.get(types[0]["type"]["name"], "Normal")
@@ -151,13 +162,24 @@ def fetch_pokemon(pokemon_id: int, session: requests.Session) -> dict | None:
 
 
 def main():
+    global API_BASE
+
     parser = argparse.ArgumentParser(description="Fetch Pokemon data from PokeAPI")
     parser.add_argument("--gen", type=int, default=7, help="Generation to fetch through (default: 7 for USUM)")
     parser.add_argument("--output", type=str, default=None, help="Output JSON path")
     parser.add_argument("--start", type=int, default=1, help="Start ID (for resuming)")
     parser.add_argument("--batch", type=int, default=50, help="Print progress every N pokemon")
+    parser.add_argument("--api-base", type=str, default=API_BASE, help=f"PokeAPI base URL (default: {API_BASE})")
+    parser.add_argument("--export", type=str, default=None, metavar="DIR",
+                        help="After saving, export the species as a columnar file to DIR (export_columnar.py)")
+    parser.add_argument("--export-format", choices=["auto", "npz", "parquet"], default="auto")
+    http_retry.add_arguments(parser)
+    telemetry.add_arguments(parser)
     args = parser.parse_args()
 
+    API_BASE = args.api_base.rstrip("/")
+    telemetry.setup("fetch_pokeapi", trace=args.trace, summary=not args.no_summary)
+
     if args.output is None:
         script_dir = Path(__file__).parent.parent
         args.output = str(script_dir / "src" / "Starfield.Assets" / "Content" / "Data" / "species.json")
@@ -178,44 +200,60 @@ def main():
 
     session = requests.Session()
     session.headers["User-Agent"] = "Starfield-DataFetcher/1.0"
+    client = http_retry.RetryingClient(http_retry.requests_transport(session), http_retry.policy_from_args(args))
 
     remaining = [pid for pid in pokemon_ids if pid not in existing_ids and pid >= args.start]
     fetched = 0
     errors = 0
 
     for pid in remaining:
-        data = fetch_pokemon(pid, session)
+        data = fetch_pokemon(pid, client)
         if data:
             results.append(data)
             fetched += 1
         else:
             errors += 1
-            # Retry once after a pause
-            time.sleep(2)
-            data = fetch_pokemon(pid, session)
-            if data:
-                results.append(data)
-                fetched += 1
-                errors -= 1
 
         # Progress
         if fetched % args.batch == 0 or pid == remaining[-1]:
             print(f"  [{fetched + len(existing_ids)}/{total}] #{pid} {data['name'] if data else '???'}")
 
         # Be nice to the API — PokeAPI asks for reasonable rate limiting
-        time.sleep(0.1)
+        with telemetry.stage("cooldown"):
+            time.sleep(0.1)
 
         # Save checkpoint every 100
         if fetched % 100 == 0 and fetched > 0:
             save_results(args.output, results)
             print(f"  Checkpoint saved ({len(results)} total)")
 
+    # Species whose requests exhausted their retries get one more pass
+    letters = client.take_dead_letters()
+    client.dead_letters = [letter for letter in letters if not letter.retryable]
+    failed = sorted({letter.key for letter in letters if letter.retryable})
+    if failed:
+        print(f"  Retrying {len(failed)} failed species...")
+        for pid in failed:
+            data = fetch_pokemon(pid, client)
+            if data:
+                results.append(data)
+                fetched += 1
+                errors -= 1
+    client.report_dead_letters()
+
     # Sort by ID and save
     results.sort(key=lambda r: r["id"])
     save_results(args.output, results)
 
     print(f"\nDone! {fetched} fetched, {errors} errors, {len(results)} total in {args.output}")
 
+    if args.export:
+        import export_columnar
+        with telemetry.stage("export"):
+            exported = export_columnar.export_species_json(Path(args.output), Path(args.export), args.export_format)
+        print(f"Exported to {args.export}:")
+        export_columnar.print_results(exported)
+
     # Print a quick sample
     if results:
         sample = results[0]
@@ -225,8 +263,10 @@ def main():
 
 def save_results(path: str, results: list[dict]):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    with telemetry.stage("write", entries=len(results)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    telemetry.count("checkpoints")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Case-insensitive name lookup for gamedata.db (items, moves, species).
+
+Resolves many names with one indexed query instead of a
+`WHERE LOWER(name) = LOWER(?)` table scan per name, and falls back to fuzzy
+matching for spellings that differ between games ("Parlyz Heal" vs
+"Paralyze Heal", "Poké Ball" vs "Poke Ball", "Farfetch'd" vs "Farfetch’d").
+
+The NOCASE name indexes are created by the steps that write these tables
+(seed-gamedata.mjs, fetch-gamedata.py, scripts/seed_items.py), so
+read-only callers such as scripts/inspect_db.py get index seeks too.
+--create-indexes adds them to a DB built before that.
+
+Library use:
+    from gamedata_lookup import NameLookup, ensure_name_indexes
+
+    conn = sqlite3.connect(db_path)
+    ensure_name_indexes(conn)                  # no-op on a DB from the build steps
+    items = NameLookup(conn, "items")
+    found = items.resolve(["Potion", "Parlyz Heal"])
+    # {"Potion": Match(id=17, name="Potion", ...), "Parlyz Heal": Match(..., fuzzy=True)}
+
+CLI:
+    python gamedata_lookup.py items "Potion" "Parlyz Heal" "Oran Berry"
+    python gamedata_lookup.py moves Thunderbolt "Vice Grip" --db path/to/gamedata.db
+    python gamedata_lookup.py items --create-indexes
+"""
+
+import argparse
+import difflib
+import re
+import sqlite3
+import sys
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+DB_PATH = SCRIPT_DIR.parent / "src" / "Starfield2026.Assets" / "Data" / "gamedata.db"
+
+# Columns returned per table, id and name first.
+TABLE_COLUMNS = {
+    "items": ("id", "name", "category"),
+    "moves": ("id", "name", "type", "category"),
+    "species": ("id", "name", "type1", "type2"),
+}
+
+# SQLite's default host-parameter limit is 999 on older builds.
+QUERY_CHUNK = 500
+
+FUZZY_CUTOFF = 0.75
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_GENDER_SIGNS = str.maketrans({"\u2640": "f", "\u2642": "m"})
+
+
+@dataclass(frozen=True)
+class Match:
+    id: int
+    name: str
+    fields: tuple
+    fuzzy: bool = False
+    score: float = 1.0
+
+
+def normalize_name(name: str) -> str:
+    """Fold case, accents, apostrophes and punctuation: "Poké Ball" -> "pokeball"."""
+    decomposed = unicodedata.normalize("NFKD", name.casefold().translate(_GENDER_SIGNS))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub("", stripped)
+
+
+def ensure_name_indexes(conn: sqlite3.Connection, tables: tuple[str, ...] = tuple(TABLE_COLUMNS)):
+    """Create NOCASE name indexes so `name = ? COLLATE NOCASE` is an index seek."""
+    existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for table in tables:
+        if table in existing:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_name_nocase ON {table} (name COLLATE NOCASE)")
+    conn.commit()
+
+
+class NameLookup:
+    """Batch and fuzzy name resolution against one table."""
+
+    def __init__(self, conn: sqlite3.Connection, table: str):
+        if table not in TABLE_COLUMNS:
+            raise ValueError(f"unsupported table {table!r}; expected one of {', '.join(TABLE_COLUMNS)}")
+        self.conn = conn
+        self.table = table
+        self.columns = TABLE_COLUMNS[table]
+        self._normalized: dict[str, tuple] | None = None
+
+    def _all_rows(self) -> dict[str, tuple]:
+        """Normalized name -> row, loaded once on the first miss."""
+        if self._normalized is None:
+            rows = self.conn.execute(f"SELECT {', '.join(self.columns)} FROM {self.table}").fetchall()
+            self._normalized = {}
+            for row in rows:
+                self._normalized.setdefault(normalize_name(row[1]), row)
+        return self._normalized
+
+    def _exact(self, names: list[str]) -> dict[str, tuple]:
+        found: dict[str, tuple] = {}
+        cols = ", ".join(self.columns)
+        for i in range(0, len(names), QUERY_CHUNK):
+            chunk = names[i:i + QUERY_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            sql = f"SELECT {cols} FROM {self.table} WHERE name COLLATE NOCASE IN ({placeholders})"
+            for row in self.conn.execute(sql, chunk):
+                found.setdefault(row[1].casefold(), row)
+        return found
+
+    def resolve(self, names: list[str], fuzzy: bool = True,
+                cutoff: float = FUZZY_CUTOFF) -> dict[str, Match | None]:
+        """Resolve names in one query; unresolved names fall back to fuzzy matching."""
+        unique = list(dict.fromkeys(names))
+        exact = self._exact(unique)
+        result: dict[str, Match | None] = dict.fromkeys(unique)
+        misses = []
+        for name in unique:
+            row = exact.get(name.casefold())
+            if row is not None:
+                result[name] = Match(row[0], row[1], row[2:])
+            else:
+                misses.append(name)
+
+        if misses and fuzzy:
+            rows = self._all_rows()
+            keys = list(rows)
+            for name in misses:
+                key = normalize_name(name)
+                row = rows.get(key)
+                if row is not None:
+                    result[name] = Match(row[0], row[1], row[2:], fuzzy=True)
+                    continue
+                close = difflib.get_close_matches(key, keys, n=1, cutoff=cutoff)
+                if close:
+                    row = rows[close[0]]
+                    score = difflib.SequenceMatcher(None, key, close[0]).ratio()
+                    result[name] = Match(row[0], row[1], row[2:], fuzzy=True, score=round(score, 3))
+
+        return result
+
+    def get(self, name: str, fuzzy: bool = True) -> Match | None:
+        return self.resolve([name], fuzzy=fuzzy)[name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve item/move/species names against gamedata.db")
+    parser.add_argument("table", choices=sorted(TABLE_COLUMNS), help="Table to search")
+    parser.add_argument("names", nargs="*", help="Names to resolve")
+    parser.add_argument("--db", type=str, default=str(DB_PATH), help="Path to gamedata.db")
+    parser.add_argument("--no-fuzzy", action="store_true", help="Only accept case-insensitive exact matches")
+    parser.add_argument("--create-indexes", action="store_true", help="Create NOCASE name indexes first")
+    args = parser.parse_args()
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"ERROR: {db_path} not found.")
+        sys.exit(1)
+
+    conn = sqlite3.connect(str(db_path))
+    if args.create_indexes:
+        ensure_name_indexes(conn)
+        print(f"Name indexes ensured on {', '.join(TABLE_COLUMNS)}")
+
+    lookup = NameLookup(conn, args.table)
+    for name, match in lookup.resolve(args.names, fuzzy=not args.no_fuzzy).items():
+        if match is None:
+            print(f"  ???: {name:<20} NOT FOUND")
+            continue
+        note = f"  ~ {name!r} ({match.score:.2f})" if match.fuzzy else ""
+        extra = ", ".join(str(f) for f in match.fields if f is not None)
+        print(f"  {match.id:>4}: {match.name:<20} ({extra}){note}")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Compile gamedata.db into a read-only, memory-mappable binary snapshot.
+
+Run after fetch-gamedata.py / seed_items.py. The snapshot holds the same
+species, moves, items, learnsets and evolutions as the SQLite file, laid out
+as fixed-size little-endian records so a loader can mmap the file and index
+rows directly instead of issuing one query per lookup.
+
+Usage:
+    python gamedata_snapshot.py                 # compile gamedata.db -> gamedata.bin
+    python gamedata_snapshot.py --db path/to/gamedata.db --out path/to/gamedata.bin
+    python gamedata_snapshot.py --bench         # compile, then compare cold-start load times
+
+File layout (all integers little-endian):
+
+    header      magic "SFGD", u16 version, u16 section count
+    directory   per section: 4-char tag, u32 offset, u32 byte length, u32 count
+    STRS        u32 offsets[count + 1], then the UTF-8 string pool
+    SPEC/MOVE/ITEM/LRNS/EVOL
+                fixed-size records (see RECORD_FORMATS)
+    SIDX/MIDX/IIDX/LIDX/EIDX
+                u32 offsets[max_key + 2]: rows for key k are
+                records[offsets[k]:offsets[k + 1]] in the matching table
+
+Names, types, categories, methods and triggers are interned into STRS once
+and referenced by u16 index; NO_STRING marks a NULL column.
+"""
+
+import argparse
+import mmap
+import sqlite3
+import struct
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / "src" / "Starfield2026.Assets" / "Data"
+DB_PATH = DATA_DIR / "gamedata.db"
+SNAPSHOT_PATH = DATA_DIR / "gamedata.bin"
+
+MAGIC = b"SFGD"
+FORMAT_VERSION = 1
+NO_STRING = 0xFFFF
+NO_VALUE = 0xFF
+
+HEADER = struct.Struct("<4sHH")
+DIRECTORY_ENTRY = struct.Struct("<4sIII")
+
+# Record layouts per table. String columns are u16 indices into STRS.
+RECORD_FORMATS = {
+    # id, name, hp, atk, def, spa, spd, spe, type1, type2, base_exp, growth, catch
+    "SPEC": struct.Struct("<HH6BHHHHB x"),
+    # id, name, type, category, power, accuracy, pp, priority
+    "MOVE": struct.Struct("<HHHHHBBb x"),
+    # id, name, sprite, category, buy, sell, flags, effect
+    "ITEM": struct.Struct("<HHHHIIBxH"),
+    # move_id, method, level
+    "LRNS": struct.Struct("<HHB x"),
+    # from, to, trigger, min_level, item, held_item, known_move, known_move_type,
+    # min_happiness, time_of_day, gender
+    "EVOL": struct.Struct("<HHHBxHHHHBxHb x"),
+}
+
+# Offset table tag -> record table tag it indexes.
+INDEX_TABLES = {
+    "SIDX": "SPEC",
+    "MIDX": "MOVE",
+    "IIDX": "ITEM",
+    "LIDX": "LRNS",
+    "EIDX": "EVOL",
+}
+
+ITEM_USABLE_IN_BATTLE = 0x01
+ITEM_USABLE_OVERWORLD = 0x02
+
+
+# --- Compile ---
+
+class StringPool:
+    """Interns strings so each distinct value is stored once."""
+
+    def __init__(self):
+        self._index: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def ref(self, value: str | None) -> int:
+        if value is None:
+            return NO_STRING
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.values)
+            if idx >= NO_STRING:
+                raise ValueError("string pool exceeds u16 index range")
+            self._index[value] = idx
+            self.values.append(value)
+        return idx
+
+    def pack(self) -> bytes:
+        offsets = [0]
+        blobs = []
+        for value in self.values:
+            encoded = value.encode("utf-8")
+            blobs.append(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+        return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(blobs)
+
+
+def _opt(value: int | None) -> int:
+    return NO_VALUE if value is None else value
+
+
+def build_offsets(keys: list[int]) -> tuple[bytes, int]:
+    """Build a CSR offset table from record keys sorted ascending."""
+    max_key = keys[-1] if keys else 0
+    counts = [0] * (max_key + 2)
+    for key in keys:
+        counts[key + 1] += 1
+    for i in range(1, len(counts)):
+        counts[i] += counts[i - 1]
+    return struct.pack(f"<{len(counts)}I", *counts), max_key
+
+
+def compile_snapshot(conn: sqlite3.Connection) -> bytes:
+    """Read every table once and return the packed snapshot bytes."""
+    strings = StringPool()
+    sections: dict[str, tuple[bytes, int]] = {}
+
+    def add_table(tag: str, keys: list[int], records: list[tuple]):
+        fmt = RECORD_FORMATS[tag]
+        sections[tag] = (b"".join(fmt.pack(*r) for r in records), len(records))
+        index_tag = next(t for t, target in INDEX_TABLES.items() if target == tag)
+        blob, max_key = build_offsets(keys)
+        sections[index_tag] = (blob, max_key + 2)
+
+    rows = conn.execute("""
+        SELECT id, name, hp, attack, defense, sp_attack, sp_defense, speed,
+               type1, type2, base_exp_yield, growth_rate, catch_rate
+        FROM species ORDER BY id
+    """).fetchall()
+    add_table("SPEC", [r[0] for r in rows], [
+        (r[0], strings.ref(r[1]), *r[2:8], strings.ref(r[8]), strings.ref(r[9]),
+         r[10], strings.ref(r[11]), r[12])
+        for r in rows
+    ])
+
+    rows = conn.execute("""
+        SELECT id, name, type, category, power, accuracy, pp, priority
+        FROM moves ORDER BY id
+    """).fetchall()
+    add_table("MOVE", [r[0] for r in rows], [
+        (r[0], strings.ref(r[1]), strings.ref(r[2]), strings.ref(r[3]), *r[4:8])
+        for r in rows
+    ])
+
+    rows = conn.execute("""
+        SELECT id, name, sprite, category, buy_price, sell_price,
+               usable_in_battle, usable_overworld, effect
+        FROM items ORDER BY id
+    """).fetchall()
+    add_table("ITEM", [r[0] for r in rows], [
+        (r[0], strings.ref(r[1]), strings.ref(r[2]), strings.ref(r[3]), r[4], r[5],
+         (ITEM_USABLE_IN_BATTLE if r[6] else 0) | (ITEM_USABLE_OVERWORLD if r[7] else 0),
+         strings.ref(r[8]))
+        for r in rows
+    ])
+
+    rows = conn.execute("""
+        SELECT species_id, move_id, method, level FROM learnsets
+        ORDER BY species_id, method, level, move_id
+    """).fetchall()
+    add_table("LRNS", [r[0] for r in rows], [
+        (r[1], strings.ref(r[2]), r[3]) for r in rows
+    ])
+
+    rows = conn.execute("""
+        SELECT from_species_id, to_species_id, trigger, min_level, item, held_item,
+               known_move, known_move_type, min_happiness, time_of_day, gender
+        FROM evolutions ORDER BY from_species_id, to_species_id, trigger
+    """).fetchall()
+    add_table("EVOL", [r[0] for r in rows], [
+        (r[0], r[1], strings.ref(r[2]), _opt(r[3]), strings.ref(r[4]), strings.ref(r[5]),
+         strings.ref(r[6]), strings.ref(r[7]), _opt(r[8]), strings.ref(r[9]),
+         -1 if r[10] is None else r[10])
+        for r in rows
+    ])
+
+    sections = {"STRS": (strings.pack(), len(strings.values)), **sections}
+
+    offset = HEADER.size + DIRECTORY_ENTRY.size * len(sections)
+    directory = []
+    payload = []
+    for tag, (blob, count) in sections.items():
+        pad = -offset % 4
+        payload.append(b"\0" * pad)
+        offset += pad
+        directory.append(DIRECTORY_ENTRY.pack(tag.encode("ascii"), offset, len(blob), count))
+        payload.append(blob)
+        offset += len(blob)
+
+    return HEADER.pack(MAGIC, FORMAT_VERSION, len(sections)) + b"".join(directory) + b"".join(payload)
+
+
+# --- Load ---
+
+class GameDataSnapshot:
+    """Zero-copy reader over a compiled snapshot.
+
+    Records are unpacked straight out of the mapped file on access; nothing
+    is materialized up front except the section directory.
+    """
+
+    def __init__(self, path: str | Path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, version, count = HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a gamedata snapshot")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} has snapshot version {version}, expected {FORMAT_VERSION}")
+
+        self._sections: dict[str, tuple[int, int, int]] = {}
+        for i in range(count):
+            tag, offset, length, n = DIRECTORY_ENTRY.unpack_from(self._view, HEADER.size + i * DIRECTORY_ENTRY.size)
+            self._sections[tag.decode("ascii")] = (offset, length, n)
+
+        strs_offset, _, strs_count = self._sections["STRS"]
+        self._str_offsets = self._view[strs_offset:strs_offset + 4 * (strs_count + 1)].cast("I")
+        self._str_base = strs_offset + 4 * (strs_count + 1)
+        self._str_cache: list[str | None] = [None] * strs_count
+        self._str_refs: dict[str, int] = {}
+        self._indexes = {
+            target: self._section_u32(tag) for tag, target in INDEX_TABLES.items()
+        }
+
+    def close(self):
+        self._str_offsets.release()
+        for index in self._indexes.values():
+            index.release()
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _section_u32(self, tag: str) -> memoryview:
+        offset, length, _ = self._sections[tag]
+        return self._view[offset:offset + length].cast("I")
+
+    def string(self, idx: int) -> str | None:
+        if idx == NO_STRING:
+            return None
+        value = self._str_cache[idx]
+        if value is None:
+            start = self._str_base + self._str_offsets[idx]
+            end = self._str_base + self._str_offsets[idx + 1]
+            value = self._str_cache[idx] = str(self._view[start:end], "utf-8")
+        return value
+
+    def string_ref(self, value: str) -> int:
+        """Reverse lookup of an interned string; NO_STRING if absent."""
+        idx = self._str_refs.get(value)
+        if idx is None:
+            idx = next((i for i in range(len(self._str_cache)) if self.string(i) == value), NO_STRING)
+            self._str_refs[value] = idx
+        return idx
+
+    def _rows(self, tag: str, key: int) -> range:
+        index = self._indexes[tag]
+        if key < 0 or key + 1 >= len(index):
+            return range(0)
+        return range(index[key], index[key + 1])
+
+    def _record(self, tag: str, row: int) -> tuple:
+        fmt = RECORD_FORMATS[tag]
+        return fmt.unpack_from(self._view, self._sections[tag][0] + row * fmt.size)
+
+    def _records(self, tag: str, rows: range):
+        fmt = RECORD_FORMATS[tag]
+        base = self._sections[tag][0]
+        return fmt.iter_unpack(self._view[base + rows.start * fmt.size:base + rows.stop * fmt.size])
+
+    def count(self, tag: str) -> int:
+        return self._sections[tag][2]
+
+    # --- Species ---
+
+    def species(self, species_id: int) -> dict | None:
+        rows = self._rows("SPEC", species_id)
+        return self._species_dict(self._record("SPEC", rows[0])) if rows else None
+
+    def all_species(self) -> list[dict]:
+        return [self._species_dict(r) for r in self._records("SPEC", range(self.count("SPEC")))]
+
+    def _species_dict(self, r: tuple) -> dict:
+        s = self.string
+        return {
+            "id": r[0], "name": s(r[1]),
+            "hp": r[2], "attack": r[3], "defense": r[4],
+            "sp_attack": r[5], "sp_defense": r[6], "speed": r[7],
+            "type1": s(r[8]), "type2": s(r[9]),
+            "base_exp_yield": r[10], "growth_rate": s(r[11]), "catch_rate": r[12],
+        }
+
+    # --- Moves ---
+
+    def move(self, move_id: int) -> dict | None:
+        rows = self._rows("MOVE", move_id)
+        if not rows:
+            return None
+        r = self._record("MOVE", rows[0])
+        s = self.string
+        return {
+            "id": r[0], "name": s(r[1]), "type": s(r[2]), "category": s(r[3]),
+            "power": r[4], "accuracy": r[5], "pp": r[6], "priority": r[7],
+        }
+
+    # --- Items ---
+
+    def item(self, item_id: int) -> dict | None:
+        rows = self._rows("ITEM", item_id)
+        return self._item_dict(self._record("ITEM", rows[0])) if rows else None
+
+    def all_items(self) -> list[dict]:
+        return [self._item_dict(r) for r in self._records("ITEM", range(self.count("ITEM")))]
+
+    def _item_dict(self, r: tuple) -> dict:
+        s = self.string
+        return {
+            "id": r[0], "name": s(r[1]), "sprite": s(r[2]), "category": s(r[3]),
+            "buy_price": r[4], "sell_price": r[5],
+            "usable_in_battle": bool(r[6] & ITEM_USABLE_IN_BATTLE),
+            "usable_overworld": bool(r[6] & ITEM_USABLE_OVERWORLD),
+            "effect": s(r[7]),
+        }
+
+    # --- Learnsets ---
+
+    def learnset(self, species_id: int) -> list[tuple[int, str, int]]:
+        """All (move_id, method, level) rows for a species, ordered by method then level."""
+        s = self.string
+        return [(r[0], s(r[1]), r[2]) for r in self._records("LRNS", self._rows("LRNS", species_id))]
+
+    def level_up_moves(self, species_id: int, max_level: int) -> list[tuple[int, int]]:
+        """Mirror of GameDataDb.GetLevelUpMoves: (move_id, level), newest first."""
+        level_up = self.string_ref("level-up")
+        moves = [(r[0], r[2]) for r in self._records("LRNS", self._rows("LRNS", species_id))
+                 if r[1] == level_up and r[2] <= max_level]
+        moves.sort(key=lambda x: (x[1], x[0]), reverse=True)
+        return moves
+
+    # --- Evolutions ---
+
+    def evolutions(self, from_species_id: int) -> list[dict]:
+        s = self.string
+        result = []
+        for r in self._records("EVOL", self._rows("EVOL", from_species_id)):
+            result.append({
+                "from_species_id": r[0], "to_species_id": r[1], "trigger": s(r[2]),
+                "min_level": None if r[3] == NO_VALUE else r[3],
+                "item": s(r[4]), "held_item": s(r[5]),
+                "known_move": s(r[6]), "known_move_type": s(r[7]),
+                "min_happiness": None if r[8] == NO_VALUE else r[8],
+                "time_of_day": s(r[9]),
+                "gender": None if r[10] == -1 else r[10],
+            })
+        return result
+
+
+# --- Benchmark ---
+
+def _startup_sqlite(db_path: Path) -> int:
+    """What the client does at startup: open, load species/items, touch every learnset."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    touched = len(conn.execute("SELECT * FROM species ORDER BY id").fetchall())
+    touched += len(conn.execute("SELECT * FROM items ORDER BY id").fetchall())
+    ids = [r[0] for r in conn.execute("SELECT id FROM species ORDER BY id")]
+    for species_id in ids:
+        touched += len(conn.execute(
+            "SELECT move_id, level FROM learnsets WHERE species_id = ? AND method = 'level-up' AND level <= ?",
+            (species_id, 100)).fetchall())
+        touched += len(conn.execute(
+            "SELECT * FROM evolutions WHERE from_species_id = ?", (species_id,)).fetchall())
+    conn.close()
+    return touched
+
+
+def _startup_snapshot(snapshot_path: Path) -> int:
+    with GameDataSnapshot(snapshot_path) as snap:
+        species = snap.all_species()
+        touched = len(species) + len(snap.all_items())
+        for sp in species:
+            touched += len(snap.level_up_moves(sp["id"], 100))
+            touched += len(snap.evolutions(sp["id"]))
+    return touched
+
+
+def benchmark(db_path: Path, snapshot_path: Path, repeat: int = 5):
+    results = {}
+    for label, fn, path in (("sqlite", _startup_sqlite, db_path),
+                            ("snapshot", _startup_snapshot, snapshot_path)):
+        timings = []
+        touched = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            touched = fn(path)
+            timings.append(time.perf_counter() - start)
+        results[label] = (min(timings), touched)
+
+    print(f"Cold-start load (best of {repeat}):")
+    for label, (best, touched) in results.items():
+        print(f"  {label:<9} {best * 1000:8.2f} ms  ({touched} rows)")
+    speedup = results["sqlite"][0] / results["snapshot"][0] if results["snapshot"][0] else float("inf")
+    print(f"  speedup   {speedup:8.2f}x")
+
+
+# --- Main ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile gamedata.db into a binary snapshot")
+    parser.add_argument("--db", type=str, default=str(DB_PATH), help="Source SQLite database")
+    parser.add_argument("--out", type=str, default=str(SNAPSHOT_PATH), help="Snapshot output path")
+    parser.add_argument("--bench", action="store_true", help="Compare load time against SQLite")
+    parser.add_argument("--repeat", type=int, default=5, help="Benchmark repetitions")
+    args = parser.parse_args()
+
+    db_path = Path(args.db)
+    out_path = Path(args.out)
+    if not db_path.exists():
+        print(f"ERROR: {db_path} not found. Run fetch-gamedata.py first.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    blob = compile_snapshot(conn)
+    conn.close()
+
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+    tmp_path.write_bytes(blob)
+    tmp_path.replace(out_path)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    with GameDataSnapshot(out_path) as snap:
+        counts = ", ".join(f"{snap.count(t)} {t}" for t in ("SPEC", "MOVE", "ITEM", "LRNS", "EVOL", "STRS"))
+    print(f"{db_path} -> {out_path}")
+    print(f"  {len(blob):,} bytes in {elapsed:.1f} ms ({counts})")
+
+    if args.bench:
+        print()
+        benchmark(db_path, out_path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+Retry, backoff and per-host circuit breaking for the PokeAPI fetchers.
+
+RetryingClient.get_json(url) classifies every outcome:
+
+  200          parsed JSON
+  404          None, never retried (the resource does not exist)
+  429          retried; Retry-After pauses the whole host, not just this call
+  5xx          retried with jittered exponential backoff, counts toward the breaker
+  timeout /    same as 5xx
+  connection
+  other 4xx    FetchFailed immediately (a retry cannot fix a bad request)
+
+When a host fails `failure_threshold` times in a row its breaker opens and
+every caller waits out the cooldown (doubling per consecutive trip, capped
+at max_cooldown). After the cooldown one probe request is let through;
+success closes the breaker, failure re-opens it.
+
+A URL that exhausts its attempts (or gets another 4xx) raises FetchFailed
+and is added to the client's dead-letter list with the caller's key.
+Fetchers replay the list once at the end of a run (retry_dead_letters) so
+a bad minute mid-run does not leave silent holes; anything still failing
+is reported.
+
+Transports are plain callables (url, timeout) -> (status, headers, body),
+so the same engine drives requests.Session and urllib:
+
+    client = RetryingClient(requests_transport(session))
+    client = RetryingClient(urllib_transport({"User-Agent": "..."}))
+"""
+
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterator
+
+import telemetry
+
+# (status, lower-cased headers, body)
+Response = tuple[int, dict[str, str], bytes]
+Transport = Callable[[str, float], Response]
+
+
+class TransportError(Exception):
+    """Raised by transports for requests that produced no HTTP status."""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind  # "timeout" or "connection"
+
+
+class FetchFailed(Exception):
+    def __init__(self, url: str, reason: str, retryable: bool = True):
+        super().__init__(f"{url}: {reason}")
+        self.url = url
+        self.reason = reason
+        self.retryable = retryable
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay: float = 1.0       # seconds, doubled per attempt
+    max_delay: float = 30.0
+    timeout: float = 30.0
+    max_retry_after: float = 120.0
+    failure_threshold: int = 5    # consecutive host failures before the breaker opens
+    cooldown: float = 15.0        # first open period, doubled per consecutive trip
+    max_cooldown: float = 120.0
+
+    def backoff(self, attempt: int, rng: random.Random) -> float:
+        """Full-jitter exponential backoff for the given 0-based retry."""
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+@dataclass
+class DeadLetter:
+    url: str
+    key: object
+    reason: str
+    retryable: bool = True
+
+
+# --- Circuit breaker ---
+
+class CircuitBreaker:
+    """Per-host breaker shared by every thread using the client."""
+
+    def __init__(self, policy: RetryPolicy, sleep: Callable[[float], None] = time.sleep):
+        self.policy = policy
+        self.sleep = sleep
+        self.cond = threading.Condition()
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.probing = False
+
+    def before_request(self):
+        """Block while the host is open or another thread is probing it."""
+        while True:
+            with self.cond:
+                now = time.monotonic()
+                if now < self.open_until:
+                    wait = self.open_until - now
+                elif self.probing:
+                    self.cond.wait(timeout=1.0)
+                    continue
+                else:
+                    if self.trips and self.failures >= self.policy.failure_threshold:
+                        self.probing = True  # half-open: this caller is the probe
+                    return
+            telemetry.count("breaker_waits")
+            with telemetry.stage("breaker_wait"):
+                self.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold every caller for `seconds` (a 429 throttles the host, not one URL)."""
+        with self.cond:
+            self.open_until = max(self.open_until, time.monotonic() + seconds)
+            self.probing = False
+            self.cond.notify_all()
+
+    def record_success(self):
+        with self.cond:
+            self.failures = 0
+            self.trips = 0
+            self.probing = False
+            self.cond.notify_all()
+
+    def record_failure(self):
+        with self.cond:
+            self.failures += 1
+            if self.probing or self.failures >= self.policy.failure_threshold:
+                cooldown = min(self.policy.max_cooldown, self.policy.cooldown * 2 ** self.trips)
+                self.trips += 1
+                self.failures = self.policy.failure_threshold
+                self.open_until = time.monotonic() + cooldown
+                self.probing = False
+                self.cond.notify_all()
+                telemetry.count("breaker_trips")
+                telemetry.event("breaker_open", cooldown=cooldown, trips=self.trips)
+
+
+# --- Client ---
+
+class RetryingClient:
+    def __init__(self, transport: Transport, policy: RetryPolicy | None = None,
+                 seed: int | None = None, sleep: Callable[[float], None] = time.sleep,
+                 log: Callable[[str], None] = print):
+        self.transport = transport
+        self.policy = policy or RetryPolicy()
+        self.rng = random.Random(seed)
+        self.sleep = sleep
+        self.log = log
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.dead_letters: list[DeadLetter] = []
+        self.lock = threading.Lock()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urllib.parse.urlsplit(url).netloc
+        with self.lock:
+            breaker = self.breakers.get(host)
+            if breaker is None:
+                breaker = self.breakers[host] = CircuitBreaker(self.policy, self.sleep)
+            return breaker
+
+    def get_json(self, url: str, key: object = None) -> dict | None:
+        """Fetch and parse `url`; None on 404. Dead-letters and raises FetchFailed on exhaustion."""
+        try:
+            return self._get_json(url)
+        except FetchFailed as e:
+            with self.lock:
+                self.dead_letters.append(DeadLetter(url, key, e.reason, e.retryable))
+            telemetry.count("dead_letters")
+            telemetry.event("dead_letter", url=url, reason=e.reason)
+            raise
+
+    def _get_json(self, url: str) -> dict | None:
+        policy = self.policy
+        breaker = self.breaker(url)
+        reason = "no attempts"
+
+        for attempt in range(policy.max_attempts):
+            if attempt:
+                telemetry.count("retries")
+            breaker.before_request()
+
+            try:
+                with telemetry.stage("network", url=url, attempt=attempt):
+                    status, headers, body = self.transport(url, policy.timeout)
+            except TransportError as e:
+                telemetry.count(e.kind + "s")
+                breaker.record_failure()
+                reason = f"{e.kind}: {e}"
+                self._backoff(attempt, reason, url)
+                continue
+
+            telemetry.count("requests")
+            telemetry.count("bytes", len(body))
+
+            if status == 200:
+                breaker.record_success()
+                with telemetry.stage("parse"):
+                    return json.loads(body)
+            if status == 404:
+                breaker.record_success()
+                telemetry.count("not_found")
+                return None
+            if status == 429:
+                telemetry.count("throttled")
+                delay = policy.backoff(attempt, self.rng)
+                retry_after = parse_retry_after(headers.get("retry-after"))
+                if retry_after is not None:
+                    delay = max(delay, min(retry_after, policy.max_retry_after))
+                breaker.pause(delay)
+                reason = "HTTP 429"
+                self._backoff(attempt, reason, url, delay)
+                continue
+            if status >= 500:
+                telemetry.count("server_errors")
+                breaker.record_failure()
+                reason = f"HTTP {status}"
+                self._backoff(attempt, reason, url)
+                continue
+
+            telemetry.count("client_errors")
+            breaker.record_success()
+            raise FetchFailed(url, f"HTTP {status}", retryable=False)
+
+        raise FetchFailed(url, f"{reason} after {policy.max_attempts} attempts")
+
+    def _backoff(self, attempt: int, reason: str, url: str, delay: float | None = None):
+        """Sleep before the next attempt; no-op after the last one."""
+        if attempt + 1 >= self.policy.max_attempts:
+            return
+        if delay is None:
+            delay = self.policy.backoff(attempt, self.rng)
+        telemetry.event("retry", url=url, reason=reason, delay=round(delay, 3))
+        with telemetry.stage("backoff"):
+            self.sleep(delay)
+
+    def take_dead_letters(self) -> list[DeadLetter]:
+        with self.lock:
+            letters, self.dead_letters = self.dead_letters, []
+        return letters
+
+    def retry_dead_letters(self) -> Iterator[tuple[object, dict | None]]:
+        """Replay the dead-letter list once, yielding (key, data) for each recovery.
+
+        Non-retryable letters (4xx) and URLs that fail again are left on the
+        list for the caller to report.
+        """
+        letters = self.take_dead_letters()
+        retry = [letter for letter in letters if letter.retryable]
+        with self.lock:
+            self.dead_letters.extend(letter for letter in letters if not letter.retryable)
+        if not retry:
+            return
+        self.log(f"  Retrying {len(retry)} failed request(s)...")
+        for letter in retry:
+            try:
+                data = self.get_json(letter.url, letter.key)
+            except FetchFailed:
+                continue
+            telemetry.count("recovered")
+            yield letter.key, data
+
+    def report_dead_letters(self) -> int:
+        """Print any URLs that never succeeded; returns how many."""
+        for letter in self.dead_letters:
+            self.log(f"    FAILED {letter.url}: {letter.reason}")
+        return len(self.dead_letters)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# --- Transports ---
+
+def requests_transport(session) -> Transport:
+    """Transport over a requests.Session (keeps connections alive)."""
+    import requests
+
+    def get(url: str, timeout: float) -> Response:
+        try:
+            resp = session.get(url, timeout=timeout)
+        except requests.Timeout as e:
+            raise TransportError("timeout", str(e)) from e
+        except requests.RequestException as e:
+            raise TransportError("connection", str(e)) from e
+        headers = {k.lower(): v for k, v in resp.headers.items()}
+        return resp.status_code, headers, resp.content
+
+    return get
+
+
+def urllib_transport(headers: dict[str, str] | None = None) -> Transport:
+    """Standard-library transport for scripts without requests."""
+
+    def get(url: str, timeout: float) -> Response:
+        req = urllib.request.Request(url, headers=headers or {})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                return resp.status, {k.lower(): v for k, v in resp.headers.items()}, resp.read()
+        except urllib.error.HTTPError as e:
+            return e.code, {k.lower(): v for k, v in e.headers.items()}, e.read()
+        except TimeoutError as e:
+            raise TransportError("timeout", str(e)) from e
+        except urllib.error.URLError as e:
+            kind = "timeout" if isinstance(e.reason, TimeoutError) else "connection"
+            raise TransportError(kind, str(e.reason)) from e
+        except OSError as e:
+            raise TransportError("connection", str(e)) from e
+
+    return get
+
+
+def add_arguments(parser):
+    parser.add_argument("--max-attempts", type=int, default=RetryPolicy.max_attempts,
+                        help=f"Attempts per URL before it is dead-lettered (default: {RetryPolicy.max_attempts})")
+    parser.add_argument("--timeout", type=float, default=RetryPolicy.timeout,
+                        help=f"Per-request timeout in seconds (default: {RetryPolicy.timeout:g})")
+
+
+def policy_from_args(args) -> RetryPolicy:
+    return RetryPolicy(max_attempts=args.max_attempts, timeout=args.timeout)
@@ -0,0 +1,197 @@
+"""
+Threaded image decoding pipeline for scanning texture and sprite batches.
+
+The conversion toolchain leaves loose PNGs next to every DAE under
+src/Starfield2026.Assets; tools that look at them (count_sprites, texture
+audits) all need the same loop: find files, decode, pull out the alpha
+channel, run some per-image analysis. This module does that loop once:
+
+  - decoding runs on a thread pool (Pillow releases the GIL while it
+    inflates, NumPy does while it reduces), so a scan is bounded by disk
+    and zlib rather than the Python loop;
+  - at most `prefetch` images are in flight, so memory stays flat no
+    matter how large the tree is;
+  - alpha is copied into a pool of reusable NumPy buffers (one per
+    in-flight slot) instead of a fresh array per image;
+  - per-image work is a list of named stages, each a callable taking a
+    Decoded and returning any value. Stages run on the worker thread
+    while the image and its alpha buffer are live.
+
+Results come back in input order as ImageResult(path, width, height, mode,
+values, error); values maps stage name to whatever the stage returned.
+
+    import image_pipeline
+
+    def opaque_ratio(img):
+        return float((img.alpha > 0).mean())
+
+    pipeline = image_pipeline.Pipeline({"opaque": opaque_ratio}, workers=8)
+    for result in pipeline.run(image_pipeline.find_images(["../src/Starfield2026.Assets"])):
+        print(result.path, result.values.get("opaque"), result.error)
+
+Stages must not keep references to `img.alpha` after returning: the
+buffer is handed to the next image as soon as the stages finish.
+"""
+
+import os
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+from PIL import Image
+
+import telemetry
+
+IMAGE_PATTERNS = ("*.png",)
+ALPHA_MODES = {"RGBA", "LA", "PA", "RGBa", "La"}
+
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 2))
+DEFAULT_PREFETCH = 2 * DEFAULT_WORKERS
+
+
+@dataclass
+class Decoded:
+    """An image handed to the stages; valid only for the duration of the stage calls."""
+    path: Path
+    image: Image.Image
+    alpha: np.ndarray  # uint8 (height, width), view into a pooled buffer
+    mode: str          # mode as stored on disk, before any conversion
+
+    @property
+    def width(self) -> int:
+        return self.alpha.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.alpha.shape[0]
+
+
+@dataclass
+class ImageResult:
+    path: Path
+    width: int = 0
+    height: int = 0
+    mode: str = ""
+    values: dict[str, object] = field(default_factory=dict)
+    error: str | None = None
+
+
+Stage = Callable[[Decoded], object]
+
+
+# --- Buffers ---
+
+class BufferPool:
+    """Fixed number of reusable uint8 buffers; acquire blocks when all are out."""
+
+    def __init__(self, slots: int):
+        self.free: queue.Queue[np.ndarray] = queue.Queue()
+        for _ in range(slots):
+            self.free.put(np.empty(0, dtype=np.uint8))
+
+    def acquire(self, size: int) -> np.ndarray:
+        buf = self.free.get()
+        if buf.size < size:
+            telemetry.count("alpha_buffer_grows")
+            buf = np.empty(size, dtype=np.uint8)
+        return buf
+
+    def release(self, buf: np.ndarray):
+        self.free.put(buf)
+
+
+def extract_alpha(img: Image.Image, out: np.ndarray) -> tuple[Image.Image, np.ndarray]:
+    """Copy img's alpha into `out` (opaque 255 when it has none); returns (image, alpha view)."""
+    width, height = img.size
+    alpha = out[:width * height].reshape(height, width)
+
+    if img.mode not in ALPHA_MODES and "transparency" in img.info:
+        img = img.convert("RGBA")  # palette / tRNS transparency
+    if img.mode in ALPHA_MODES:
+        np.copyto(alpha, np.asarray(img.getchannel("A")))
+    else:
+        alpha.fill(255)
+    return img, alpha
+
+
+# --- Discovery ---
+
+def find_images(paths: Iterable[str | Path], patterns: Iterable[str] = IMAGE_PATTERNS) -> list[Path]:
+    """Files as given plus every match under directories, sorted per directory."""
+    found = []
+    for p in paths:
+        p = Path(p)
+        if p.is_dir():
+            matches = set()
+            for pattern in patterns:
+                matches.update(p.rglob(pattern))
+            found.extend(sorted(matches))
+        else:
+            found.append(p)
+    return found
+
+
+# --- Pipeline ---
+
+class Pipeline:
+    def __init__(self, stages: dict[str, Stage], workers: int = DEFAULT_WORKERS,
+                 prefetch: int = DEFAULT_PREFETCH):
+        self.stages = stages
+        self.workers = max(1, workers)
+        self.prefetch = max(self.workers, prefetch)
+
+    def _process(self, path: Path, pool: BufferPool) -> ImageResult:
+        result = ImageResult(path)
+        buf = None
+        try:
+            with telemetry.stage("decode", path=str(path)):
+                img = Image.open(path)
+                img.load()
+            result.width, result.height = img.size
+            result.mode = img.mode
+            telemetry.count("bytes_read", path.stat().st_size)
+
+            buf = pool.acquire(result.width * result.height)
+            with telemetry.stage("alpha"):
+                img, alpha = extract_alpha(img, buf)
+
+            decoded = Decoded(path, img, alpha, result.mode)
+            for name, stage in self.stages.items():
+                with telemetry.stage(name):
+                    result.values[name] = stage(decoded)
+            telemetry.count("images")
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            telemetry.count("image_errors")
+            telemetry.event("image_error", path=str(path), error=result.error)
+        finally:
+            if buf is not None:
+                pool.release(buf)
+        return result
+
+    def run(self, paths: Iterable[str | Path]) -> Iterator[ImageResult]:
+        """Yield one ImageResult per path, in input order."""
+        pool = BufferPool(self.prefetch)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image") as executor:
+            try:
+                for path in paths:
+                    if len(pending) >= self.prefetch:
+                        yield pending.popleft().result()
+                    pending.append(executor.submit(self._process, Path(path), pool))
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+
+def add_arguments(parser):
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Decode threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--prefetch", type=int, default=DEFAULT_PREFETCH,
+                        help=f"Images in flight at once (default: {DEFAULT_PREFETCH})")
@@ -0,0 +1,298 @@
+"""
+Schema, validator and normalizer for model manifest.json files.
+
+The schema mirrors MiniToolbox.Manifests.ExportManifest (camelCase, nulls
+allowed where the C# property is nullable). It is compiled once at import
+into a tree of small check closures, so validating a manifest is a walk
+over its keys with no per-call schema interpretation:
+
+    issues = manifest_schema.validate(data)        # [(check, severity, where, detail)]
+    changed = manifest_schema.normalize(data, manifest_dir, assets_root)
+    refs = manifest_schema.references(data)        # [(where, relative file)]
+
+Checks beyond types:
+  clips.duplicate_index   two clips share an index (the loader keys on it)
+  clips.duplicate_name    two clips share a slot name (merge_battle_clips keys on it)
+  manifest.no_model       neither modelFile nor models[].file
+  manifest.format_mismatch  modelFormat disagrees with modelFile's extension
+
+"animationLibrary" points at a shared library.json written by
+anim_libraries.py; clip files may then live outside the manifest's folder.
+"meshFile" / "meshFormat" name the binary mesh written by dae_to_mesh.py,
+"meshLods" its reduced levels from mesh_lod.py.
+
+File references are not checked here; validate_manifests.py resolves
+them against one listing of the whole tree.
+
+normalize() fills the fields BgEditor needs (modelFile, name, dir,
+modelFormat, assetsPath) from the manifest's location, in that order, and
+never overwrites a field that is already present. With portable=True it
+leaves out, and removes, the absolute "dir" so the manifest only holds
+root-relative paths (see asset_paths.py).
+"""
+
+import os
+import posixpath
+from dataclasses import dataclass
+from typing import Callable
+
+Issue = tuple[str, str, str, str]  # (check, severity, where, detail)
+Check = Callable[[object, str, list], None]
+
+
+@dataclass(frozen=True)
+class Field:
+    type: type | tuple[type, ...]
+    required: bool = False
+    nullable: bool = False
+    minimum: int | None = None
+    items: "Field | None" = None
+    fields: "dict[str, Field] | None" = None
+    derive: Callable[[dict, str, str], object] | None = None  # (data, manifest_dir, assets_root)
+
+
+def first_model_file(data: dict) -> str | None:
+    models = data.get("models")
+    if models and isinstance(models[0], dict) and models[0].get("file"):
+        return models[0]["file"]
+    return None
+
+
+def _model_format(data: dict, manifest_dir: str, assets_root: str) -> str:
+    ext = os.path.splitext(data.get("modelFile") or "")[1].lstrip(".").lower()
+    return ext or data.get("format", "dae")
+
+
+TEXT = Field(str, nullable=True)
+COUNT = Field(int, minimum=0)
+
+MODEL_ENTRY = {
+    "file": Field(str, required=True),
+    "name": TEXT,
+    "meshCount": COUNT,
+    "boneCount": COUNT,
+}
+
+CLIP_ENTRY = {
+    "index": Field(int, required=True, minimum=0),
+    "id": TEXT,
+    "name": Field(str, required=True),
+    "sourceName": TEXT,
+    "semanticName": TEXT,
+    "semanticSource": TEXT,
+    "file": Field(str, required=True),
+    "frameCount": COUNT,
+    "fps": COUNT,
+    "boneCount": COUNT,
+    "duration": Field((int, float), nullable=True),
+    "trackCount": Field(int, nullable=True, minimum=0),
+}
+
+TEXTURE_ENTRY = {
+    "name": TEXT,
+    "file": TEXT,
+    "width": COUNT,
+    "height": COUNT,
+    "format": TEXT,
+    "size": COUNT,
+}
+
+MESH_LOD = {
+    "file": Field(str, required=True),
+    "ratio": Field((int, float)),
+    "triangles": COUNT,
+    "error": Field((int, float), nullable=True),
+}
+
+SOURCE_INFO = {
+    "modelGdb": TEXT,
+    "modelBin": TEXT,
+}
+
+MANIFEST = {
+    "version": Field(int, minimum=1),
+    "name": Field(str, nullable=True,
+                  derive=lambda data, manifest_dir, root: os.path.basename(manifest_dir)),
+    "dir": Field(str, nullable=True,
+                 derive=lambda data, manifest_dir, root: manifest_dir),
+    "assetsPath": Field(str, nullable=True,
+                        derive=lambda data, manifest_dir, root: os.path.relpath(manifest_dir, root).replace("\\", "/")),
+    "format": TEXT,
+    "modelFormat": Field(str, nullable=True, derive=_model_format),
+    "id": TEXT,
+    "animationMode": TEXT,
+    "modelFile": Field(str, nullable=True, derive=lambda data, manifest_dir, root: first_model_file(data)),
+    "mtlFile": TEXT,
+    "models": Field(list, nullable=True, items=Field(dict, fields=MODEL_ENTRY)),
+    "textures": Field(list, nullable=True, items=Field(str)),
+    "clips": Field(list, nullable=True, items=Field(dict, fields=CLIP_ENTRY)),
+    "textureDetails": Field(list, nullable=True, items=Field(dict, fields=TEXTURE_ENTRY)),
+    "source": Field(dict, nullable=True, fields=SOURCE_INFO),
+    "animationLibrary": TEXT,
+    "meshFile": TEXT,
+    "meshFormat": TEXT,
+    "meshLods": Field(list, nullable=True, items=Field(dict, fields=MESH_LOD)),
+}
+
+# modelFile is promoted first so modelFormat can be derived from it
+DERIVED_FIELDS = ("modelFile", "name", "dir", "modelFormat", "assetsPath")
+# Machine-specific fields dropped from portable manifests
+ABSOLUTE_FIELDS = ("dir",)
+
+
+def derived_fields(portable: bool = False) -> tuple[str, ...]:
+    return tuple(f for f in DERIVED_FIELDS if not (portable and f in ABSOLUTE_FIELDS))
+
+
+# --- Compile ---
+
+def _type_name(t: type | tuple[type, ...]) -> str:
+    names = {int: "integer", float: "number", str: "string", list: "array", dict: "object"}
+    if isinstance(t, tuple):
+        return " or ".join(names[x] for x in t)
+    return names[t]
+
+
+def compile_field(field: Field) -> Check:
+    """Build a closure that checks one value against `field`, appending issues."""
+    expected = field.type
+    expected_name = _type_name(expected)
+    minimum = field.minimum
+    nullable = field.nullable
+    item_check = compile_field(field.items) if field.items else None
+    object_check = compile_object(field.fields) if field.fields is not None else None
+
+    def check(value, where: str, issues: list):
+        if value is None:
+            if not nullable:
+                issues.append(("manifest.schema", "error", where, f"must be {expected_name}, got null"))
+            return
+        # bool is an int subclass; JSON true/false never deserializes into a C# int
+        if not isinstance(value, expected) or isinstance(value, bool):
+            issues.append(("manifest.schema", "error", where,
+                           f"must be {expected_name}, got {type(value).__name__}"))
+            return
+        if minimum is not None and value < minimum:
+            issues.append(("manifest.schema", "error", where, f"must be >= {minimum}, got {value}"))
+        if item_check:
+            for i, item in enumerate(value):
+                item_check(item, f"{where}[{i}]", issues)
+        if object_check:
+            object_check(value, where, issues)
+
+    return check
+
+
+def compile_object(fields: dict[str, Field]) -> Check:
+    checks = [(name, compile_field(f)) for name, f in fields.items()]
+    required = [name for name, f in fields.items() if f.required]
+
+    def check(obj: dict, where: str, issues: list):
+        for name in required:
+            if name not in obj:
+                issues.append(("manifest.schema", "error", f"{where}.{name}", "required"))
+        for name, field_check in checks:
+            if name in obj:
+                field_check(obj[name], f"{where}.{name}", issues)
+
+    return check
+
+
+_check_manifest = compile_field(Field(dict, fields=MANIFEST))
+_check_clips = compile_field(MANIFEST["clips"])
+
+
+# --- Validate ---
+
+def validate(data) -> list[Issue]:
+    issues: list[Issue] = []
+    _check_manifest(data, "$", issues)
+    if not isinstance(data, dict) or any(i[0] == "manifest.schema" and i[2] == "$" for i in issues):
+        return issues
+
+    _check_clip_slots(data.get("clips") or [], issues)
+
+    model_file = data.get("modelFile")
+    if not model_file and not first_model_file(data):
+        issues.append(("manifest.no_model", "error", "$.modelFile", "no modelFile and no models[].file"))
+    elif isinstance(model_file, str) and isinstance(data.get("modelFormat"), str):
+        ext = os.path.splitext(model_file)[1].lstrip(".").lower()
+        if ext and ext != data["modelFormat"].lower():
+            issues.append(("manifest.format_mismatch", "warning", "$.modelFormat",
+                           f"{data['modelFormat']!r} but modelFile is .{ext}"))
+    return issues
+
+
+def validate_clips(clips) -> list[Issue]:
+    """Issues for a clips array on its own (see manifest_store.Manifest.clip_issues)."""
+    issues: list[Issue] = []
+    _check_clips(clips, "$.clips", issues)
+    if isinstance(clips, list):
+        _check_clip_slots(clips, issues)
+    return issues
+
+
+def _check_clip_slots(clips: list, issues: list):
+    """clips.duplicate_index / clips.duplicate_name."""
+    seen_index: dict[int, int] = {}
+    seen_name: dict[str, int] = {}
+    for i, clip in enumerate(clips):
+        if not isinstance(clip, dict):
+            continue
+        index, name = clip.get("index"), clip.get("name")
+        if isinstance(index, int) and index in seen_index:
+            issues.append(("clips.duplicate_index", "error", f"$.clips[{i}].index",
+                           f"index {index} also used by clips[{seen_index[index]}]"))
+        else:
+            seen_index[index] = i
+        if isinstance(name, str) and name in seen_name:
+            issues.append(("clips.duplicate_name", "warning", f"$.clips[{i}].name",
+                           f"name {name!r} also used by clips[{seen_name[name]}]"))
+        else:
+            seen_name[name] = i
+
+
+def references(data: dict) -> list[tuple[str, str]]:
+    """(where, path relative to the manifest dir) for every file the manifest points at."""
+    refs = []
+
+    def add(where: str, value):
+        if isinstance(value, str) and value:
+            refs.append((where, value))
+
+    add("$.modelFile", data.get("modelFile"))
+    add("$.mtlFile", data.get("mtlFile"))
+    add("$.animationLibrary", data.get("animationLibrary"))
+    add("$.meshFile", data.get("meshFile"))
+    for key in ("models", "clips", "textureDetails", "meshLods"):
+        for i, entry in enumerate(data.get(key) or []):
+            if isinstance(entry, dict):
+                add(f"$.{key}[{i}].file", entry.get("file"))
+    for i, texture in enumerate(data.get("textures") or []):
+        add(f"$.textures[{i}]", texture)
+    return refs
+
+
+def resolve(manifest_rel_dir: str, ref: str) -> str:
+    """Reference as a normalized posix path relative to the scan root."""
+    return posixpath.normpath(posixpath.join(manifest_rel_dir, ref.replace("\\", "/")))
+
+
+# --- Normalize ---
+
+def normalize(data: dict, manifest_dir: str, assets_root: str, portable: bool = False) -> bool:
+    """Fill missing derivable fields in place. Returns True if anything was added or removed."""
+    changed = False
+    if portable:
+        for name in ABSOLUTE_FIELDS:
+            if name in data:
+                del data[name]
+                changed = True
+    for name in derived_fields(portable):
+        if name in data:
+            continue
+        value = MANIFEST[name].derive(data, manifest_dir, assets_root)
+        if value is not None:
+            data[name] = value
+            changed = True
+    return changed
@@ -0,0 +1,288 @@
+"""
+Lazy, cached access to model manifest.json files for the Python tooling.
+
+Scripts that walk thousands of manifests usually need a few header fields
+and maybe the clip names, yet json.load builds every clip, texture and
+textureDetails dict up front and keeps them alive. This module reads a
+manifest once and only decodes what is asked for:
+
+    import manifest_store
+
+    store = manifest_store.ManifestStore()
+    m = store.get(path)                   # header decoded; arrays kept as text
+    m.name, m.model_file, m.assets_path   # header fields
+    names = {c.name for c in m.clips}     # clips decoded on first access into Clip records
+    m.clip_issues                         # manifest_schema.validate_clips() for free
+    data = m.to_dict()                    # full fresh dict, for scripts that rewrite it
+    store.write(path, data)               # write (indent=2); next get() re-reads it
+
+    head = store.header(path)             # fast path: header fields only, nothing retained
+
+Header fields are found by scanning the top level of the indented layout
+that json.dump(indent=2) and the exporters write: top-level arrays and
+objects that open a new line are skipped by finding their closing line,
+never parsed. Any other layout, including an inline array such as
+"textures": ["a.png"], falls back to json.loads. Records use __slots__,
+so a decoded clip is a fraction of the size of its dict.
+
+ManifestStore keeps the most recently used manifests (DEFAULT_CAPACITY),
+keyed on path and validated by (mtime_ns, size), so a file changed on disk
+is re-read and repeated lookups in one run are free.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from json.decoder import scanstring
+from pathlib import Path
+
+import manifest_schema
+import telemetry
+
+DEFAULT_CAPACITY = 512
+
+# JSON key -> attribute
+HEADER_FIELDS = {
+    "version": "version",
+    "name": "name",
+    "id": "id",
+    "dir": "dir",
+    "assetsPath": "assets_path",
+    "format": "format",
+    "modelFormat": "model_format",
+    "modelFile": "model_file",
+    "mtlFile": "mtl_file",
+    "animationMode": "animation_mode",
+    "animationLibrary": "animation_library",
+    "meshFile": "mesh_file",
+    "meshFormat": "mesh_format",
+}
+
+CLIP_FIELDS = {
+    "index": "index",
+    "id": "id",
+    "name": "name",
+    "sourceName": "source_name",
+    "semanticName": "semantic_name",
+    "semanticSource": "semantic_source",
+    "file": "file",
+    "frameCount": "frame_count",
+    "fps": "fps",
+    "boneCount": "bone_count",
+    "duration": "duration",
+    "trackCount": "track_count",
+}
+
+_decoder = json.JSONDecoder()
+_CLOSING = {"[": "\n  ]", "{": "\n  }"}
+
+
+# --- Records ---
+
+class Clip:
+    """One clips[] entry. Fields missing from the JSON are unset: use get()."""
+    __slots__ = tuple(CLIP_FIELDS.values())
+
+    @classmethod
+    def from_dict(cls, entry: dict) -> "Clip":
+        clip = cls()
+        for key, attr in CLIP_FIELDS.items():
+            if key in entry:
+                setattr(clip, attr, entry[key])
+        return clip
+
+    def get(self, attr: str, default=None):
+        return getattr(self, attr, default)
+
+    def __repr__(self) -> str:
+        return f"Clip({self.get('index')!r}, {self.get('name')!r}, {self.get('file')!r})"
+
+
+class ManifestHeader:
+    """Top-level scalar fields of a manifest; absent fields are None."""
+    __slots__ = ("path", "mtime_ns", "size", *HEADER_FIELDS.values())
+
+    def _fill(self, path: Path, stat: os.stat_result, scalars: dict):
+        self.path = path
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        for key, attr in HEADER_FIELDS.items():
+            setattr(self, attr, scalars.get(key))
+
+
+class Manifest(ManifestHeader):
+    """Header plus lazily decoded top-level arrays and objects."""
+    __slots__ = ("_text", "_lazy", "_clips", "_clip_issues", "_textures")
+
+    def raw(self, key: str, default=None):
+        """Decoded value of any top-level field (a new object on every call for arrays/objects)."""
+        value = self._lazy.get(key, default)
+        if isinstance(value, tuple):  # (start, end) span into the text
+            return json.loads(self._text[value[0]:value[1]])
+        return value
+
+    @property
+    def clips(self) -> tuple[Clip, ...]:
+        if self._clips is None:
+            with telemetry.stage("manifest_clips"):
+                entries = self.raw("clips") or []
+                self._clip_issues = manifest_schema.validate_clips(entries)
+                self._clips = tuple(Clip.from_dict(e) for e in entries if isinstance(e, dict))
+        return self._clips
+
+    @property
+    def clip_issues(self) -> list:
+        """Schema and duplicate-slot issues of the clips array."""
+        self.clips
+        return self._clip_issues
+
+    @property
+    def textures(self) -> tuple[str, ...]:
+        if self._textures is None:
+            self._textures = tuple(self.raw("textures") or ())
+        return self._textures
+
+    def to_dict(self) -> dict:
+        return json.loads(self._text)
+
+
+# --- Parse ---
+
+def scan_top_level(text: str) -> tuple[dict, dict] | None:
+    """(scalars, {key: (start, end)} for arrays/objects) of an indent=2 manifest, or None for other layouts."""
+    if not text.startswith('{\n  "'):
+        return None
+    scalars, spans = {}, {}
+    pos = 4
+    try:
+        while True:
+            key, pos = scanstring(text, pos + 1)
+            if not text.startswith(": ", pos):
+                return None
+            pos += 2
+            opener = text[pos]
+            if opener in _CLOSING:
+                if text[pos + 1] == _CLOSING[opener][-1]:  # [] or {}
+                    end = pos + 2
+                elif text[pos + 1] != "\n":
+                    # Inline value ("textures": ["a.png"]): its closing line is not ours to find
+                    return None
+                else:
+                    end = text.find(_CLOSING[opener], pos)
+                    if end < 0:
+                        return None
+                    end += len(_CLOSING[opener])
+                spans[key] = (pos, end)
+            else:
+                scalars[key], end = _decoder.raw_decode(text, pos)
+            if text.startswith(',\n  "', end):
+                pos = end + 4
+            elif text.startswith("\n}", end):
+                return scalars, spans
+            else:
+                return None
+    except (ValueError, IndexError):
+        return None
+
+
+def _read(path: Path) -> str:
+    with open(path, "r", encoding="utf-8-sig") as f:
+        text = f.read()
+    return text.replace("\r\n", "\n") if "\r" in text else text
+
+
+def parse(path: str | Path, stat: os.stat_result | None = None) -> Manifest:
+    """Read a manifest; raises ValueError if it is not a JSON object."""
+    path = Path(path)
+    stat = stat or os.stat(path)
+    text = _read(path)
+    scanned = scan_top_level(text)
+    if scanned is None:
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: manifest is not a JSON object")
+        scalars = {k: v for k, v in data.items() if not isinstance(v, (list, dict))}
+        lazy = {k: v for k, v in data.items() if isinstance(v, (list, dict))}
+    else:
+        scalars, lazy = scanned
+    manifest = Manifest()
+    manifest._fill(path, stat, scalars)
+    manifest._text = text
+    manifest._lazy = {**scalars, **lazy}
+    manifest._clips = manifest._clip_issues = manifest._textures = None
+    return manifest
+
+
+def parse_header(path: str | Path, stat: os.stat_result | None = None) -> ManifestHeader:
+    path = Path(path)
+    stat = stat or os.stat(path)
+    text = _read(path)
+    scanned = scan_top_level(text)
+    if scanned is None:
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: manifest is not a JSON object")
+        scalars = data
+    else:
+        scalars = scanned[0]
+    header = ManifestHeader()
+    header._fill(path, stat, scalars)
+    return header
+
+
+# --- Store ---
+
+class ManifestStore:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._entries: OrderedDict[str, Manifest] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _fresh(self, key: str, stat: os.stat_result) -> Manifest | None:
+        cached = self._entries.get(key)
+        if cached is not None and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            telemetry.count("manifest_hits")
+            return cached
+        return None
+
+    def get(self, path: str | Path) -> Manifest:
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        cached = self._fresh(key, stat)
+        if cached is not None:
+            return cached
+        self.misses += 1
+        with telemetry.stage("manifest_read"):
+            manifest = parse(key, stat)
+        self._entries[key] = manifest
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return manifest
+
+    def header(self, path: str | Path) -> ManifestHeader:
+        """Header fields only; served from the cache when the full manifest is already loaded."""
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        cached = self._fresh(key, stat)
+        if cached is not None:
+            return cached
+        with telemetry.stage("manifest_header"):
+            return parse_header(key, stat)
+
+    def write(self, path: str | Path, data: dict):
+        """Write `data` in the standard layout and drop any cached copy."""
+        key = os.path.abspath(path)
+        with open(key, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        self._entries.pop(key, None)
+
+    def invalidate(self, path: str | Path):
+        self._entries.pop(os.path.abspath(path), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Generate level-of-detail meshes from converted .sfmesh models.
+
+Runs after dae_to_mesh.py. Each mesh is decimated to every --ratios
+target (fraction of the original triangle count) with a quadric error
+metric simplifier (Garland & Heckbert), written as <stem>.lod<N>.sfmesh
+next to the source.
+
+The simplifier works in batches so every step is a NumPy operation:
+
+  1. per-vertex quadrics are summed from area-weighted face planes, plus
+     heavily weighted planes along boundary edges, UV/normal seams (split
+     vertices) and material borders, so outlines and seams stay put
+  2. each pass scores every edge for collapsing onto either endpoint
+     (half-edge collapse) and picks the edges that are the cheapest around
+     both their vertices: no two picked edges share a vertex
+  3. collapses that would flip a triangle are rejected, the rest are
+     applied at once, and quadrics are merged into the surviving vertex
+
+Because vertices only ever collapse onto an existing vertex, every LOD
+vertex is a copy of an original one: positions, UVs, colors, joints and
+weights stay valid, and the skin never needs re-normalizing. Collapsing
+across vertices with different dominant joints costs extra, so joint
+borders keep their shape.
+
+With --manifest, the manifest whose meshFile is the source records the
+levels as "meshLods": [{"file", "ratio", "triangles", "error"}], where
+error is a distance in model units: the largest gap between a collapsed
+original vertex and the nearest LOD triangle. The quadric costs only
+rank collapses; they are area- and BOUNDARY_WEIGHT-scaled squares, not
+distances. A level is dropped when the simplifier runs out of collapses
+that do not flip triangles.
+
+Usage:
+    python mesh_lod.py                                   # every *.sfmesh under src/Starfield2026.Assets
+    python mesh_lod.py path/to/model.sfmesh --ratios 0.5 0.2
+    python mesh_lod.py path/to/Models --manifest
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+import asset_paths
+import build_cache
+import dae_to_mesh
+import telemetry
+
+ASSETS_DIR = asset_paths.default_root()
+
+DEFAULT_RATIOS = (0.5, 0.25, 0.125)
+BOUNDARY_WEIGHT = 100.0
+SKIN_PENALTY = 1e-2          # times the squared bounding-box diagonal
+MAX_PASSES = 200
+DEVIATION_PAIRS = 1 << 20      # grid entries, and (vertex, triangle) distances per batch
+GRID_MAX_CELLS = 256           # finest grid along the longest axis
+CACHE_VERSION = 2
+
+
+# --- Quadrics ---
+
+def face_planes(positions: np.ndarray, tris: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Unit plane (a, b, c, d) and area of every triangle."""
+    p0, p1, p2 = (positions[tris[:, k]] for k in range(3))
+    cross = np.cross(p1 - p0, p2 - p0)
+    length = np.linalg.norm(cross, axis=1)
+    normal = cross / np.maximum(length, 1e-20)[:, None]
+    d = -np.einsum("ij,ij->i", normal, p0)
+    return np.hstack((normal, d[:, None])), length * 0.5
+
+
+def plane_quadrics(planes: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    return weights[:, None, None] * np.einsum("ij,ik->ijk", planes, planes)
+
+
+def unique_edges(tris: np.ndarray, vertex_count: int) -> np.ndarray:
+    pairs = np.sort(tris[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    _keys, first = np.unique(pairs[:, 0] * vertex_count + pairs[:, 1], return_index=True)
+    return pairs[first]
+
+
+def initial_quadrics(positions: np.ndarray, tris: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    planes, area = face_planes(positions.astype(np.float64), tris)
+    quadrics = np.zeros((len(positions), 4, 4))
+    face_q = plane_quadrics(planes, area)
+    for k in range(3):
+        np.add.at(quadrics, tris[:, k], face_q)
+
+    # Boundary edges: one face, or two faces from different submeshes
+    pairs = np.sort(tris[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    faces = np.repeat(np.arange(len(tris)), 3)
+    keys = pairs[:, 0].astype(np.int64) * len(positions) + pairs[:, 1]
+    order = np.argsort(keys, kind="stable")
+    keys, pairs, faces = keys[order], pairs[order], faces[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+    group_min = np.minimum.reduceat(groups[faces], starts)
+    group_max = np.maximum.reduceat(groups[faces], starts)
+    border = (counts == 1) | (group_min != group_max)
+    edges, edge_faces = pairs[starts[border]], faces[starts[border]]
+    if len(edges):
+        pa, pb = positions[edges[:, 0]].astype(np.float64), positions[edges[:, 1]].astype(np.float64)
+        along = pb - pa
+        normal = np.cross(along, planes[edge_faces, :3])
+        normal /= np.maximum(np.linalg.norm(normal, axis=1), 1e-20)[:, None]
+        d = -np.einsum("ij,ij->i", normal, pa)
+        border_q = plane_quadrics(np.hstack((normal, d[:, None])),
+                                  BOUNDARY_WEIGHT * np.einsum("ij,ij->i", along, along))
+        np.add.at(quadrics, edges[:, 0], border_q)
+        np.add.at(quadrics, edges[:, 1], border_q)
+    return quadrics
+
+
+def quadric_cost(quadrics: np.ndarray, points: np.ndarray) -> np.ndarray:
+    h = np.hstack((points, np.ones((len(points), 1))))
+    return np.maximum(np.einsum("ij,ijk,ik->i", h, quadrics, h), 0.0)
+
+
+# --- Error ---
+
+def point_triangle_distance(p: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Distance from each point to its triangle (rows of p, a, b, c)."""
+    normal = np.cross(b - a, c - a)
+    norm2 = np.einsum("ij,ij->i", normal, normal)
+    inside = norm2 > 1e-30
+    for u, v in ((a, b), (b, c), (c, a)):
+        inside &= np.einsum("ij,ij->i", np.cross(v - u, p - u), normal) >= 0
+    plane = np.abs(np.einsum("ij,ij->i", p - a, normal)) / np.sqrt(np.maximum(norm2, 1e-30))
+
+    edge = np.full(len(p), np.inf)
+    for u, v in ((a, b), (b, c), (c, a)):
+        along = v - u
+        t = np.clip(np.einsum("ij,ij->i", p - u, along) / np.maximum(np.einsum("ij,ij->i", along, along), 1e-30), 0, 1)
+        edge = np.minimum(edge, np.linalg.norm(p - (u + t[:, None] * along), axis=1))
+    return np.where(inside, plane, edge)
+
+
+def surface_deviation(positions: np.ndarray, owner: np.ndarray, tris: np.ndarray) -> float:
+    """Largest distance from a collapsed original vertex to the nearest LOD triangle.
+
+    LOD triangles are bucketed on a uniform grid, into every cell their bounding box grown by one
+    cell touches, and each vertex is tested only against the triangles of its own cell. Any triangle
+    closer than one cell is among them; past that, the distance to the vertex it collapsed onto
+    (a corner of the LOD surface) bounds the error from above. Triangles whose bounding box lies
+    beyond that bound are skipped before the exact distance.
+    """
+    removed = np.flatnonzero(owner != np.arange(len(owner)))
+    if len(removed) == 0 or len(tris) == 0:
+        return 0.0
+    corners = positions[tris]
+    lo, hi = corners.min(axis=1), corners.max(axis=1)
+    origin = lo.min(axis=0)
+    extent = float((hi.max(axis=0) - origin).max())
+    cell = max(float(np.median((hi - lo).max(axis=1))), extent / GRID_MAX_CELLS, 1e-12)
+    while True:
+        first = np.floor((lo - origin) / cell).astype(np.int64)  # grown by one cell, shifted by one
+        span = np.floor((hi - origin) / cell).astype(np.int64) + 3 - first
+        counts = span.prod(axis=1)
+        if counts.sum() <= DEVIATION_PAIRS:
+            break
+        cell *= 2  # large triangles spread over too many cells
+    dims = np.floor(extent / cell).astype(np.int64) + 3
+
+    # (cell key, triangle) for every cell a triangle touches, sorted by key
+    entry_tri = np.repeat(np.arange(len(tris)), counts)
+    local = np.arange(len(entry_tri)) - np.repeat(np.cumsum(counts) - counts, counts)
+    sy, sz = span[entry_tri, 1], span[entry_tri, 2]
+    ix = first[entry_tri, 0] + local // (sy * sz)
+    iy = first[entry_tri, 1] + local // sz % sy
+    iz = first[entry_tri, 2] + local % sz
+    keys = (ix * dims + iy) * dims + iz
+    order = np.argsort(keys, kind="stable")
+    keys, entry_tri = keys[order], entry_tri[order]
+
+    points = positions[removed]
+    cells = np.clip(np.floor((points - origin) / cell).astype(np.int64) + 1, 0, dims - 1)
+    point_keys = (cells[:, 0] * dims + cells[:, 1]) * dims + cells[:, 2]
+    begin = np.searchsorted(keys, point_keys, side="left")
+    found = np.searchsorted(keys, point_keys, side="right") - begin
+
+    # Start from the vertex each one collapsed onto, when it is still a corner of the surface
+    on_surface = np.zeros(len(owner), dtype=bool)
+    on_surface[tris.ravel()] = True
+    nearest = np.where(on_surface[owner[removed]], np.linalg.norm(points - positions[owner[removed]], axis=1), np.inf)
+    # Vertices in batches of about DEVIATION_PAIRS (vertex, triangle) pairs
+    bounds = np.searchsorted(np.cumsum(found), np.arange(DEVIATION_PAIRS, int(found.sum()), DEVIATION_PAIRS))
+    for lo_i, hi_i in zip(np.r_[0, bounds], np.r_[bounds, len(removed)]):
+        batch = np.arange(lo_i, hi_i)
+        pair_point = np.repeat(batch, found[batch])
+        if len(pair_point) == 0:
+            continue
+        offset = np.arange(len(pair_point)) - np.repeat(np.cumsum(found[batch]) - found[batch], found[batch])
+        tri = entry_tri[begin[pair_point] + offset]
+        # Skip triangles whose bounding box is already further than the current bound
+        p = points[pair_point]
+        box = np.linalg.norm(np.maximum(np.maximum(lo[tri] - p, p - hi[tri]), 0.0), axis=1)
+        near = box < nearest[pair_point]
+        pair_point, tri = pair_point[near], tri[near]
+        dist = point_triangle_distance(p[near], *(corners[tri, k] for k in range(3)))
+        np.minimum.at(nearest, pair_point, dist)
+    # A vertex with nothing in reach (its owner dropped out of the mesh) keeps the distance to that owner
+    far = ~np.isfinite(nearest)
+    nearest[far] = np.linalg.norm(points[far] - positions[owner[removed[far]]], axis=1)
+    return float(nearest.max())
+
+
+# --- Simplify ---
+
+def simplify(mesh: dae_to_mesh.Mesh, ratio: float) -> tuple[dae_to_mesh.Mesh, float]:
+    """Decimate to about `ratio` of the triangles; returns the LOD mesh and its surface_deviation()."""
+    positions = mesh.positions.astype(np.float64)
+    tris = mesh.indices.astype(np.int64).reshape(-1, 3)
+    groups = np.repeat(np.arange(len(mesh.submeshes)), [s.index_count // 3 for s in mesh.submeshes])
+    target = max(1, int(len(tris) * ratio))
+    n = len(positions)
+
+    quadrics = initial_quadrics(positions, tris, groups)
+    extent = positions.max(axis=0) - positions.min(axis=0) if n else np.zeros(3)
+    skin_penalty = SKIN_PENALTY * float(extent @ extent)
+    dominant = mesh.joints[:, 0] if mesh.joints is not None else None
+    owner = np.arange(n)  # surviving vertex each original vertex collapsed onto
+    frozen = np.zeros(0, dtype=np.int64)  # edge keys whose collapse was rejected
+
+    for _ in range(MAX_PASSES):
+        if len(tris) <= target:
+            break
+        edges = unique_edges(tris, n)
+        a, b = edges[:, 0], edges[:, 1]
+        keys = a * n + b
+        merged = quadrics[a] + quadrics[b]
+        cost_a, cost_b = quadric_cost(merged, positions[a]), quadric_cost(merged, positions[b])
+        keep_a = cost_a <= cost_b
+        error = np.where(keep_a, cost_a, cost_b)
+        cost = error + skin_penalty * (dominant[a] != dominant[b]) if dominant is not None else error
+        cost[np.isin(keys, frozen)] = np.inf
+
+        # Independent set: edges that are the cheapest at both endpoints (ties broken by edge order)
+        order = np.lexsort((np.arange(len(cost)), cost))
+        rank = np.empty(len(cost), dtype=np.int64)
+        rank[order] = np.arange(len(cost))
+        best = np.full(n, np.iinfo(np.int64).max)
+        np.minimum.at(best, a, rank)
+        np.minimum.at(best, b, rank)
+        picked = np.flatnonzero((best[a] == rank) & (best[b] == rank) & np.isfinite(cost))
+        # Each collapse removes about two triangles; do not overshoot the target
+        budget = max(1, (len(tris) - target) // 2)
+        picked = picked[np.argsort(rank[picked])][:budget]
+        if len(picked) == 0:
+            break
+
+        keep = np.where(keep_a[picked], a[picked], b[picked])
+        gone = np.where(keep_a[picked], b[picked], a[picked])
+        step = np.arange(n)
+        step[gone] = keep
+
+        # Reject collapses that flip or squash a triangle, until none are left
+        old_planes, old_area = face_planes(positions, tris)
+        while True:
+            moved = step[tris]
+            changed = np.any(moved != tris, axis=1)
+            alive = (moved[:, 0] != moved[:, 1]) & (moved[:, 1] != moved[:, 2]) & (moved[:, 0] != moved[:, 2])
+            test = np.flatnonzero(changed & alive)
+            if len(test) == 0:
+                break
+            new_planes, new_area = face_planes(positions, moved[test])
+            flips = test[(np.einsum("ij,ij->i", new_planes[:, :3], old_planes[test, :3]) < 0.2)
+                         | (new_area < 1e-3 * old_area[test])]
+            if len(flips) == 0:
+                break
+            bad = tris[flips][step[tris[flips]] != tris[flips]]
+            step[bad] = bad
+        applied = step != np.arange(n)
+        frozen = np.union1d(frozen, keys[picked][step[gone] == gone])
+        if not applied.any():
+            continue
+
+        survivors = step[applied]
+        np.add.at(quadrics, survivors, quadrics[applied])
+        owner = step[owner]
+        tris = step[tris]
+        alive = (tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 0] != tris[:, 2])
+        tris, groups = tris[alive], groups[alive]
+        # Two faces of a submesh can collapse onto the same vertices; keep one
+        _unique, first = np.unique(np.hstack((np.sort(tris, axis=1), groups[:, None])), axis=0, return_index=True)
+        first.sort()
+        tris, groups = tris[first], groups[first]
+
+    return rebuild(mesh, tris, groups), surface_deviation(positions, owner, tris)
+
+
+def rebuild(mesh: dae_to_mesh.Mesh, tris: np.ndarray, groups: np.ndarray) -> dae_to_mesh.Mesh:
+    """Compact the surviving vertices and re-run the cache ordering per submesh."""
+    order = np.argsort(groups, kind="stable")
+    tris, groups = tris[order], groups[order]
+    used = np.unique(tris)
+    compact = np.zeros(len(mesh.positions), dtype=np.uint32)
+    compact[used] = np.arange(len(used), dtype=np.uint32)
+    indices = compact[tris].ravel()
+
+    submeshes, parts = [], []
+    counts = np.bincount(groups, minlength=len(mesh.submeshes))
+    start = 0
+    for sub, count in zip(mesh.submeshes, counts):
+        part = dae_to_mesh.tipsify(indices[start * 3:(start + count) * 3], len(used))
+        submeshes.append(dae_to_mesh.Submesh(sub.name, sub.material, start * 3, int(count) * 3))
+        parts.append(part)
+        start += count
+    indices = np.concatenate(parts) if parts else np.zeros(0, np.uint32)
+
+    def pick(stream):
+        return None if stream is None else np.ascontiguousarray(stream[used])
+
+    return dae_to_mesh.Mesh(
+        positions=pick(mesh.positions), indices=indices, normals=pick(mesh.normals), uvs=pick(mesh.uvs),
+        colors=pick(mesh.colors), joints=pick(mesh.joints), weights=pick(mesh.weights),
+        submeshes=submeshes, joint_names=mesh.joint_names, inverse_binds=mesh.inverse_binds, bones=mesh.bones)
+
+
+# --- Main ---
+
+def lod_path(source: Path, level: int) -> Path:
+    return source.with_name(f"{source.stem}.lod{level}.sfmesh")
+
+
+def find_meshes(paths: list[str]) -> list[Path]:
+    found = []
+    for p in map(Path, paths):
+        candidates = [p] if p.is_file() else sorted(p.rglob("*.sfmesh"))
+        found.extend(c for c in candidates if ".lod" not in c.stem)
+    return found
+
+
+def build_lods(source: Path, ratios: list[float]) -> list[dict]:
+    with telemetry.stage("read"):
+        mesh = dae_to_mesh.read_mesh(source)
+    triangles = previous = len(mesh.indices) // 3
+    levels = []
+    for level, ratio in enumerate(ratios, start=1):
+        with telemetry.stage("simplify"):
+            lod, error = simplify(mesh, ratio)
+        # Stop once the simplifier runs out of valid collapses; a level that is no cheaper is useless
+        if len(lod.indices) // 3 >= previous:
+            break
+        previous = len(lod.indices) // 3
+        out = lod_path(source, level)
+        with telemetry.stage("write"):
+            dae_to_mesh.write_mesh(lod, out)
+        levels.append({"file": out.name, "ratio": ratio, "triangles": previous,
+                       "error": round(error, 6), "sourceTriangles": triangles})
+    for stale in source.parent.glob(f"{source.stem}.lod*.sfmesh"):
+        if stale.name not in {lv["file"] for lv in levels}:
+            stale.unlink()
+    return levels
+
+
+def record_in_manifest(source: Path, levels: list[dict]) -> bool:
+    manifest_path = source.parent / "manifest.json"
+    if not manifest_path.is_file():
+        return False
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data.get("meshFile"), str) or Path(asset_paths.to_posix(data["meshFile"])).name != source.name:
+        return False
+    base = os.path.dirname(asset_paths.to_posix(data["meshFile"]))
+    lods = [{"file": f"{base}/{lv['file']}" if base else lv["file"], "ratio": lv["ratio"],
+             "triangles": lv["triangles"], "error": lv["error"]} for lv in levels]
+    if data.get("meshLods") == lods:
+        return False
+    data["meshLods"] = lods
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate QEM level-of-detail meshes for .sfmesh models")
+    parser.add_argument("paths", nargs="*", default=[str(ASSETS_DIR)], help=".sfmesh files or directories")
+    parser.add_argument("--ratios", type=float, nargs="+", default=list(DEFAULT_RATIOS),
+                        help="Triangle ratio per LOD level, highest detail first")
+    parser.add_argument("--manifest", action="store_true", help="Record meshLods in manifests")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every level")
+    build_cache.add_arguments(parser)
+    telemetry.add_arguments(parser)
+    args = parser.parse_args()
+
+    if any(not 0 < r < 1 for r in args.ratios):
+        print("ERROR: --ratios must be between 0 and 1.")
+        raise SystemExit(1)
+    telemetry.setup("mesh_lod", trace=args.trace, summary=not args.no_summary)
+    meshes = find_meshes(args.paths)
+    if not meshes:
+        print("No .sfmesh files found (run dae_to_mesh.py first).")
+        return
+    cache = build_cache.open_cache("mesh_lod", enabled=not args.no_cache, path=args.cache,
+                                   config={"version": CACHE_VERSION, "ratios": args.ratios,
+                                           "boundary": BOUNDARY_WEIGHT, "skin": SKIN_PENALTY})
+
+    built = cached = manifests = 0
+    for source in meshes:
+        key = str(source.resolve())
+        levels = cache.get(key, inputs=[str(source)])
+        if levels is None or not all((source.parent / lv["file"]).exists() for lv in levels):
+            try:
+                levels = build_lods(source, args.ratios)
+            except ValueError as e:
+                print(f"  FAILED {source}: {e}")
+                continue
+            cache.put(key, levels, inputs=[str(source)], outputs=[str(source.parent / lv["file"]) for lv in levels])
+            built += 1
+        else:
+            cached += 1
+        if args.verbose:
+            steps = ", ".join(f"{lv['ratio']:g}: {lv['triangles']} (err {lv['error']:.4g})" for lv in levels)
+            print(f"  {source.name}: {steps or 'no reducible triangles'}")
+        if args.manifest and record_in_manifest(source, levels):
+            manifests += 1
+    cache.close()
+
+    print(f"{len(meshes)} meshes: {built} built, {cached} up to date, up to {len(args.ratios)} levels each")
+    if manifests:
+        print(f"  recorded meshLods in {manifests} manifests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Local PokeAPI stand-in for offline, reproducible fetcher runs.
+
+Serves /move, /pokemon, /pokemon-species, /evolution-chain and /item (plus
+the paginated /item list) from recorded payloads, with configurable latency,
+throttling and error injection so retry and concurrency strategies can be
+load-tested without hitting pokeapi.co.
+
+Payload sources, in order:
+  1. <fixtures>/<endpoint>/<id>.json recordings
+  2. --record UPSTREAM: fetch from the live API once and save the recording
+  3. synthetic payloads from pokeapi_fixtures.py (unless --no-synthetic)
+
+URLs inside payloads are rewritten to point at this server, so fetchers
+that follow links (seed_items.py) stay local.
+
+Usage:
+    python mock_pokeapi.py                                   # synthetic data on :8765
+    python mock_pokeapi.py --fixtures fixtures/pokeapi --latency 80 --jitter 40
+    python mock_pokeapi.py --rate-limit 20 --error-rate 0.02 --throttle-rate 0.05
+    python mock_pokeapi.py --fixtures fixtures/pokeapi --record https://pokeapi.co/api/v2
+
+Then point a fetcher at it:
+    python fetch-gamedata.py --api-base http://127.0.0.1:8765/api/v2
+    python fetch_pokeapi.py --api-base http://127.0.0.1:8765/api/v2
+    python ../scripts/seed_items.py --api-base http://127.0.0.1:8765/api/v2
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pokeapi_fixtures
+
+LIVE_API_BASE = "https://pokeapi.co/api/v2"
+API_PREFIX = "/api/v2"
+
+ENDPOINTS = set(pokeapi_fixtures.GENERATORS)
+
+_RESOURCE_PATH = re.compile(r"^/api/v2/([a-z-]+)/(\d+)/?$")
+_LIST_PATH = re.compile(r"^/api/v2/([a-z-]+)/?$")
+
+
+class TokenBucket:
+    """Requests-per-second limiter shared by all handler threads."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        # Burst of at least one request, so rates below 1/s still accumulate a whole token
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> float:
+        """Take a token; returns 0 on success or seconds until one is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class MockState:
+    """Configuration and counters shared by all requests."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.fixtures = Path(args.fixtures) if args.fixtures else None
+        self.record = args.record.rstrip("/") if args.record else None
+        self.synthetic = not args.no_synthetic
+        self.latency = args.latency / 1000
+        self.jitter = args.jitter / 1000
+        self.error_rate = args.error_rate
+        self.throttle_rate = args.throttle_rate
+        self.bucket = TokenBucket(args.rate_limit) if args.rate_limit else None
+        self.item_count = args.items
+        self.rng = random.Random(args.seed)
+        self.rng_lock = threading.Lock()
+        self.stats = Counter()
+        self.stats_lock = threading.Lock()
+
+    def roll(self) -> float:
+        with self.rng_lock:
+            return self.rng.random()
+
+    def count(self, key: str, n: int = 1):
+        with self.stats_lock:
+            self.stats[key] += n
+
+    def load(self, endpoint: str, ident: int) -> str | None:
+        """JSON text for one resource, or None for a 404."""
+        if self.fixtures:
+            path = self.fixtures / endpoint / f"{ident}.json"
+            if path.exists():
+                self.count("served_recorded")
+                return path.read_text(encoding="utf-8")
+        if self.record:
+            text = self._fetch_upstream(f"{self.record}/{endpoint}/{ident}/")
+            if text is not None:
+                if self.fixtures:
+                    path = self.fixtures / endpoint / f"{ident}.json"
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_text(text, encoding="utf-8")
+                self.count("recorded")
+                return text
+        if self.synthetic and endpoint in ENDPOINTS:
+            if endpoint == "item" and ident > self.item_count:
+                return None
+            self.count("served_synthetic")
+            return json.dumps(pokeapi_fixtures.GENERATORS[endpoint](ident))
+        return None
+
+    def _fetch_upstream(self, url: str) -> str | None:
+        req = urllib.request.Request(url, headers={"User-Agent": "Starfield-MockRecorder/1.0"})
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                return resp.read().decode("utf-8")
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "StarfieldMockPokeAPI/1.0"
+    state: MockState  # set on the class by main()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str = "", headers: dict | None = None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.state.count(f"status_{status}")
+        self.state.count("bytes", len(data))
+
+    def do_GET(self):
+        state = self.state
+        state.count("requests")
+
+        delay = state.latency + (state.roll() * 2 - 1) * state.jitter if state.jitter else state.latency
+        if delay > 0:
+            time.sleep(delay)
+
+        if state.bucket:
+            wait = state.bucket.take()
+            if wait:
+                self._send(429, '{"detail": "rate limited"}', {"Retry-After": f"{max(1, round(wait))}"})
+                return
+        if state.throttle_rate and state.roll() < state.throttle_rate:
+            self._send(429, '{"detail": "throttled"}', {"Retry-After": "1"})
+            return
+        if state.error_rate and state.roll() < state.error_rate:
+            status = (500, 502, 503, 504)[int(state.roll() * 4)]
+            self._send(status, '{"detail": "injected error"}')
+            return
+
+        url = urllib.parse.urlsplit(self.path)
+        base = f"http://{self.headers.get('Host', '127.0.0.1')}{API_PREFIX}"
+
+        match = _RESOURCE_PATH.match(url.path)
+        if match:
+            try:
+                text = state.load(match.group(1), int(match.group(2)))
+            except Exception as e:
+                self._send(502, json.dumps({"detail": f"upstream error: {e}"}))
+                return
+            if text is None:
+                self._send(404, '{"detail": "Not found."}')
+            else:
+                self._send(200, text.replace(LIVE_API_BASE, base))
+            return
+
+        match = _LIST_PATH.match(url.path)
+        if match and match.group(1) == "item":
+            query = urllib.parse.parse_qs(url.query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["20"])[0])
+            payload = pokeapi_fixtures.item_list(offset, limit, state.item_count)
+            self._send(200, json.dumps(payload).replace(LIVE_API_BASE, base))
+            return
+
+        self._send(404, '{"detail": "Not found."}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local PokeAPI stand-in with latency and fault injection")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", type=str, default=None, help="Recorded payload root (<endpoint>/<id>.json)")
+    parser.add_argument("--record", type=str, default=None, metavar="UPSTREAM",
+                        help=f"Fetch misses from this API base and save them (e.g. {LIVE_API_BASE})")
+    parser.add_argument("--no-synthetic", action="store_true", help="404 instead of generating missing payloads")
+    parser.add_argument("--items", type=int, default=pokeapi_fixtures.DEFAULT_ITEMS,
+                        help="Item count reported by the /item list")
+    parser.add_argument("--latency", type=float, default=0, help="Base latency per request in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Uniform +/- latency jitter in ms")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Requests/second before 429s (0 = unlimited)")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="Probability of a random 429")
+    parser.add_argument("--error-rate", type=float, default=0, help="Probability of a random 5xx")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and fault injection")
+    args = parser.parse_args()
+
+    if args.record and not args.fixtures:
+        parser.error("--record needs --fixtures to save recordings into")
+
+    Handler.state = MockState(args)
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+
+    print(f"Mock PokeAPI on http://{args.host}:{args.port}{API_PREFIX}")
+    print(f"  fixtures: {args.fixtures or '-'}  record: {args.record or '-'}  synthetic: {not args.no_synthetic}")
+    print(f"  latency: {args.latency:g}ms +/- {args.jitter:g}ms  rate limit: {args.rate_limit or 'none'}/s  "
+          f"429 rate: {args.throttle_rate:g}  5xx rate: {args.error_rate:g}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stats = Handler.state.stats
+        print("\nRequests served:")
+        for key in sorted(stats):
+            print(f"  {key:<18} {stats[key]:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Deterministic PokeAPI-shaped payloads for offline runs.
+
+Generates /move, /pokemon, /pokemon-species, /evolution-chain and /item
+responses with the fields our fetchers read, seeded per ID so every run
+produces identical data. Used by the benchmark suite and as the fallback
+payload source for mock_pokeapi.py.
+
+Payloads are written as <root>/<endpoint>/<id>.json, the same layout as
+recordings captured from the live API.
+
+Usage:
+    python pokeapi_fixtures.py --out fixtures/pokeapi            # Gen 7 sized tree
+    python pokeapi_fixtures.py --out fixtures/pokeapi --species 151 --moves 165
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+API_BASE = "https://pokeapi.co/api/v2"
+
+TYPES = [
+    "normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison",
+    "ground", "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy",
+]
+DAMAGE_CLASSES = ["physical", "special", "status"]
+GROWTH_RATES = ["slow", "medium", "medium-slow", "fast", "erratic", "fluctuating"]
+STATS = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+LEARN_METHODS = ["level-up", "machine", "egg", "tutor"]
+VERSION_GROUPS = [
+    "red-blue", "yellow", "gold-silver", "crystal", "ruby-sapphire", "emerald",
+    "firered-leafgreen", "diamond-pearl", "platinum", "heartgold-soulsilver",
+    "black-white", "black-2-white-2", "x-y", "omega-ruby-alpha-sapphire",
+    "sun-moon", "ultra-sun-ultra-moon",
+]
+ITEM_CATEGORIES = [
+    "standard-balls", "healing", "status-cures", "medicine", "in-a-pinch",
+    "held-items", "evolution", "all-mail", "loot", "all-machines", "gameplay",
+]
+ITEM_ATTRIBUTES = ["countable", "consumable", "usable-overworld", "usable-in-battle", "holdable"]
+
+DEFAULT_SPECIES = 807
+DEFAULT_MOVES = 728
+DEFAULT_ITEMS = 400
+DEFAULT_CHAINS = 427
+
+
+def _ref(endpoint: str, ident: int | str, name: str | None = None) -> dict:
+    return {"name": name or f"{endpoint}-{ident}", "url": f"{API_BASE}/{endpoint}/{ident}/"}
+
+
+def _named(endpoint: str, name: str) -> dict:
+    return {"name": name, "url": f"{API_BASE}/{endpoint}/{name}/"}
+
+
+def move(move_id: int) -> dict:
+    rng = random.Random(f"move:{move_id}")
+    damage_class = rng.choice(DAMAGE_CLASSES)
+    return {
+        "id": move_id,
+        "name": f"move-{move_id}",
+        "type": _named("type", rng.choice(TYPES)),
+        "damage_class": _named("move-damage-class", damage_class),
+        "power": None if damage_class == "status" else rng.randrange(20, 151, 5),
+        "accuracy": rng.choice([None, 70, 80, 85, 90, 95, 100, 100, 100]),
+        "pp": rng.choice([5, 10, 15, 20, 25, 30, 35, 40]),
+        "priority": rng.choice([0] * 12 + [-1, 1, 2]),
+    }
+
+
+def pokemon(pokemon_id: int, max_move_id: int = DEFAULT_MOVES, move_count: int = 60) -> dict:
+    rng = random.Random(f"pokemon:{pokemon_id}")
+    types = rng.sample(TYPES, rng.choice([1, 2]))
+    moves = []
+    for move_id in sorted(rng.sample(range(1, max_move_id + 1), min(move_count, max_move_id))):
+        details = []
+        for vg in rng.sample(VERSION_GROUPS, rng.randint(1, 6)):
+            method = rng.choice(LEARN_METHODS)
+            details.append({
+                "version_group": _named("version-group", vg),
+                "move_learn_method": _named("move-learn-method", method),
+                "level_learned_at": rng.randint(1, 100) if method == "level-up" else 0,
+            })
+        moves.append({"move": _ref("move", move_id), "version_group_details": details})
+    return {
+        "id": pokemon_id,
+        "name": f"pokemon-{pokemon_id}",
+        "base_experience": rng.randint(36, 340),
+        "types": [{"slot": i + 1, "type": _named("type", t)} for i, t in enumerate(types)],
+        "stats": [{"base_stat": rng.randint(5, 200), "effort": 0, "stat": _named("stat", s)} for s in STATS],
+        "moves": moves,
+    }
+
+
+def pokemon_species(species_id: int) -> dict:
+    rng = random.Random(f"species:{species_id}")
+    return {
+        "id": species_id,
+        "name": f"species-{species_id}",
+        "growth_rate": _named("growth-rate", rng.choice(GROWTH_RATES)),
+        "capture_rate": rng.choice([3, 45, 45, 90, 120, 190, 255]),
+        "base_happiness": rng.choice([0, 35, 70, 70, 70, 140]),
+        "gender_rate": rng.choice([-1, 0, 1, 2, 4, 4, 4, 6, 8]),
+    }
+
+
+def _evolution_details(rng: random.Random) -> list[dict]:
+    trigger = rng.choice(["level-up", "level-up", "use-item", "trade"])
+    detail = {
+        "trigger": _named("evolution-trigger", trigger),
+        "min_level": rng.randint(10, 55) if trigger == "level-up" else None,
+        "item": _named("item", "water-stone") if trigger == "use-item" else None,
+        "held_item": None,
+        "known_move": None,
+        "known_move_type": None,
+        "min_happiness": None,
+        "time_of_day": "",
+        "gender": None,
+    }
+    return [detail]
+
+
+def evolution_chain(chain_id: int, max_species_id: int = DEFAULT_SPECIES) -> dict:
+    """A chain of depth 1-3; every tenth chain branches like Eevee."""
+    rng = random.Random(f"chain:{chain_id}")
+    next_id = iter(rng.sample(range(1, max_species_id + 1), 20))
+
+    def node(depth: int) -> dict:
+        species_id = next(next_id)
+        children = []
+        if depth < 2 and rng.random() < 0.6:
+            fanout = 8 if chain_id % 10 == 0 and depth == 0 else 1
+            children = [node(depth + 1) for _ in range(fanout)]
+        return {
+            "species": _ref("pokemon-species", species_id),
+            "evolution_details": _evolution_details(rng) if depth else [],
+            "evolves_to": children,
+        }
+
+    return {"id": chain_id, "chain": node(0)}
+
+
+def item(item_id: int) -> dict:
+    rng = random.Random(f"item:{item_id}")
+    return {
+        "id": item_id,
+        "name": f"item-{item_id}",
+        "cost": rng.choice([0, 100, 200, 300, 600, 1000, 3000]),
+        "category": _named("item-category", rng.choice(ITEM_CATEGORIES)),
+        "attributes": [_named("item-attribute", a) for a in rng.sample(ITEM_ATTRIBUTES, rng.randint(0, 3))],
+        "effect_entries": [{
+            "language": _named("language", "en"),
+            "short_effect": f"Synthetic effect for item {item_id}.",
+        }],
+    }
+
+
+def item_list(offset: int, limit: int, total: int = DEFAULT_ITEMS) -> dict:
+    ids = range(offset + 1, min(offset + limit, total) + 1)
+    return {"count": total, "results": [_ref("item", i) for i in ids]}
+
+
+GENERATORS = {
+    "move": move,
+    "pokemon": pokemon,
+    "pokemon-species": pokemon_species,
+    "evolution-chain": evolution_chain,
+    "item": item,
+}
+
+
+def write_tree(root: Path, species: int = DEFAULT_SPECIES, moves: int = DEFAULT_MOVES,
+               items: int = DEFAULT_ITEMS, chains: int = DEFAULT_CHAINS) -> int:
+    """Write a full fixture tree; returns the number of payloads written."""
+    counts = {"move": moves, "pokemon": species, "pokemon-species": species,
+              "evolution-chain": chains, "item": items}
+    written = 0
+    for endpoint, count in counts.items():
+        folder = root / endpoint
+        folder.mkdir(parents=True, exist_ok=True)
+        for ident in range(1, count + 1):
+            payload = GENERATORS[endpoint](ident)
+            (folder / f"{ident}.json").write_text(json.dumps(payload), encoding="utf-8")
+            written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic PokeAPI payloads")
+    parser.add_argument("--out", type=str, required=True, help="Fixture root directory")
+    parser.add_argument("--species", type=int, default=DEFAULT_SPECIES)
+    parser.add_argument("--moves", type=int, default=DEFAULT_MOVES)
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS)
+    parser.add_argument("--chains", type=int, default=DEFAULT_CHAINS)
+    args = parser.parse_args()
+
+    written = write_tree(Path(args.out), args.species, args.moves, args.items, args.chains)
+    print(f"Wrote {written} payloads to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
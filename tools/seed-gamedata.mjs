@@ -41,6 +41,8 @@ function seedSpecies(db) {
       catch_rate      INTEGER NOT NULL DEFAULT 45
     )
   `)
+  // Case-insensitive name lookups (gamedata_lookup.py) seek this instead of scanning
+  db.exec(`CREATE INDEX idx_species_name_nocase ON species (name COLLATE NOCASE)`)
 
   const insert = db.prepare(`
     INSERT INTO species (id, name, hp, attack, defense, sp_attack, sp_defense, speed, type1, type2, base_exp_yield, growth_rate, catch_rate)
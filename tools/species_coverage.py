@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Report which species are missing models, clips, textures, meshes or sprites.
+
+The assets tree is listed once (one os.walk) into a hashed index keyed by
+species id: every pm####_## model folder and every sprite PNG is filed
+under the species it belongs to. Model manifests are then checked on a
+process pool against that listing (no exists() call per file), and the
+result is joined in memory with species.json (fetch_pokeapi.py) and the
+species table of gamedata.db.
+
+Asset types, per species (the runtime loads pm{id:04d}_00, so that form counts):
+  - model      manifest.json whose model file is on disk, or a model file in the folder
+  - clips      at least one clip, every clip file the manifest lists is on disk
+  - textures   at least one texture, every texture the manifest lists is on disk
+  - mesh       meshFile (dae_to_mesh.py) is on disk
+  - sprite     a PNG under a folder named *sprite* whose name starts with the id
+               (25.png, 025_back.png, pm0025_00.png)
+Data gaps are reported as speciesJson / gamedata.
+
+Usage:
+    python species_coverage.py                              # JSON report to stdout
+    python species_coverage.py --report coverage.json       # write report, print summary
+    python species_coverage.py --missing clips              # ids missing clips, one per line
+    python species_coverage.py path/to/Assets --gen 6 --jobs 1
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import asset_paths
+import manifest_schema
+import manifest_store
+import telemetry
+from fetch_pokeapi import get_gen_pokemon_ids
+from validate_manifests import is_manifest, list_tree
+
+SPECIES_JSON = Path(__file__).parent.parent / "src" / "Starfield.Assets" / "Content" / "Data" / "species.json"
+DB_REL = "Data/gamedata.db"
+
+ASSET_TYPES = ("model", "clips", "textures", "mesh", "sprite")
+DATA_TYPES = ("speciesJson", "gamedata")
+MODEL_EXTENSIONS = {".dae", ".fbx", ".obj", ".gltf", ".glb"}
+
+SPECIES_FOLDER = re.compile(r"^pm(\d{4})_(\d{2})$")
+SPRITE_NAME = re.compile(r"^(?:pm)?(\d{1,4})(?:[_\-.].*)?\.png$", re.IGNORECASE)
+
+# Below this many manifests a process pool costs more than it saves
+POOL_MIN_MANIFESTS = 200
+
+
+# --- Index ---
+
+def build_index(files: frozenset[str]) -> tuple[dict[str, list[str]], dict[int, list[str]]]:
+    """(model folder -> files under it relative to the folder, species id -> sprite paths)."""
+    folders: dict[str, list[str]] = defaultdict(list)
+    sprites: dict[int, list[str]] = defaultdict(list)
+    for rel in files:
+        parts = rel.split("/")
+        for i in range(len(parts) - 2, -1, -1):
+            if SPECIES_FOLDER.match(parts[i]):
+                folders["/".join(parts[:i + 1])].append("/".join(parts[i + 1:]))
+                break
+        else:
+            match = SPRITE_NAME.match(parts[-1])
+            if match and any("sprite" in p.lower() for p in parts[:-1]):
+                sprites[int(match.group(1))].append(rel)
+    return folders, sprites
+
+
+# --- Per-folder check (runs in workers) ---
+
+_resolver: asset_paths.AssetResolver | None = None
+_files: frozenset[str] = frozenset()
+
+
+def init_worker(root: str, files: frozenset[str]):
+    global _resolver, _files
+    _resolver, _files = asset_paths.AssetResolver(root), files
+
+
+def check_folder(folder: str, contents: list[str]) -> tuple[str, dict[str, bool], dict[str, str]]:
+    """(folder, {asset type: covered}, {asset type: detail}) for one pm####_## folder."""
+    covered = dict.fromkeys(ASSET_TYPES[:-1], False)
+    detail = {}
+    manifest_name = next((c for c in sorted(contents) if "/" not in c and is_manifest(c)), None)
+
+    if manifest_name is None:
+        covered["model"] = any("/" not in c and os.path.splitext(c)[1].lower() in MODEL_EXTENSIONS
+                               for c in contents)
+        clip_files = [c for c in contents if c.startswith("clips/") and c.lower().endswith(".dae")]
+        covered["clips"] = bool(clip_files)
+        covered["textures"] = any(c.lower().endswith(".png") for c in contents)
+        covered["mesh"] = any(c.endswith(".sfmesh") for c in contents)
+        detail["manifest"] = "no manifest.json"
+        return folder, covered, detail
+
+    try:
+        manifest = manifest_store.parse(_resolver.resolve(f"{folder}/{manifest_name}"))
+    except ValueError as e:
+        detail["manifest"] = f"unreadable: {e}"
+        return folder, covered, detail
+
+    def on_disk(ref: str) -> bool:
+        return manifest_schema.resolve(folder, ref) in _files
+
+    model = manifest.model_file or manifest_schema.first_model_file({"models": manifest.raw("models")})
+    covered["model"] = bool(model) and on_disk(model)
+    if model and not covered["model"]:
+        detail["model"] = f"{model} not on disk"
+
+    for kind, refs in (("clips", [c.file for c in manifest.clips if isinstance(c.get("file"), str)]),
+                       ("textures", [t for t in manifest.textures if isinstance(t, str)])):
+        missing = sum(not on_disk(r) for r in refs)
+        covered[kind] = bool(refs) and not missing
+        if missing:
+            detail[kind] = f"{missing}/{len(refs)} files missing"
+    if not manifest.clips:
+        # split-model-anims manifests list clips per model; count what is in clips/
+        covered["clips"] = any(c.startswith("clips/") and c.lower().endswith(".dae") for c in contents)
+
+    covered["mesh"] = bool(manifest.mesh_file) and on_disk(manifest.mesh_file)
+    return folder, covered, detail
+
+
+def check_folders(root: str, files: frozenset[str], folders: dict[str, list[str]], jobs: int) -> list:
+    items = sorted(folders.items())
+    if jobs > 1 and len(items) >= POOL_MIN_MANIFESTS:
+        chunk = max(1, len(items) // (jobs * 8))
+        with ProcessPoolExecutor(jobs, initializer=init_worker, initargs=(root, files)) as pool:
+            return list(pool.map(check_folder, *zip(*items), chunksize=chunk))
+    init_worker(root, files)
+    return [check_folder(folder, contents) for folder, contents in items]
+
+
+# --- Species data ---
+
+def load_species_json(path: Path) -> dict[int, str] | None:
+    if not path.is_file():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return {entry["id"]: entry.get("name", "") for entry in json.load(f)}
+
+
+def load_gamedata(path: Path) -> dict[int, str] | None:
+    if not path.is_file():
+        return None
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return dict(conn.execute("SELECT id, name FROM species"))
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
+# --- Join ---
+
+def coverage(expected: list[int], results: list, sprites: dict[int, list[str]],
+             species_json: dict[int, str] | None, gamedata: dict[int, str] | None) -> dict:
+    """Per-type totals, per-species gaps and assets that belong to no expected species."""
+    forms: dict[int, list[tuple[str, str, dict, dict]]] = defaultdict(list)
+    for folder, covered, detail in results:
+        species_id, form = SPECIES_FOLDER.match(folder.rsplit("/", 1)[-1]).groups()
+        forms[int(species_id)].append((form, folder, covered, detail))
+
+    totals = {t: {"covered": 0, "missing": 0} for t in ASSET_TYPES + DATA_TYPES}
+    gaps = []
+    for species_id in expected:
+        # The runtime loads form 00; among duplicate copies take the most complete one
+        base = [f for f in forms.get(species_id, []) if f[0] == "00"]
+        best = max(base, key=lambda f: sum(f[2].values()), default=None)
+        covered = dict(best[2]) if best else dict.fromkeys(ASSET_TYPES[:-1], False)
+        covered["sprite"] = species_id in sprites
+        if species_json is not None:
+            covered["speciesJson"] = species_id in species_json
+        if gamedata is not None:
+            covered["gamedata"] = species_id in gamedata
+
+        missing = []
+        for kind, ok in covered.items():
+            totals[kind]["covered" if ok else "missing"] += 1
+            if not ok:
+                missing.append(kind)
+        if missing:
+            gap = {"id": species_id,
+                   "name": (species_json or {}).get(species_id) or (gamedata or {}).get(species_id, ""),
+                   "missing": missing}
+            if best:
+                gap["folder"] = best[1]
+                if best[3]:
+                    gap["detail"] = best[3]
+            else:
+                other = sorted(f[1] for f in forms.get(species_id, []))
+                if other:
+                    gap["detail"] = {"model": "no form 00; found " + ", ".join(other)}
+            gaps.append(gap)
+
+    for kind in DATA_TYPES:
+        if not any(totals[kind].values()):
+            del totals[kind]
+
+    known = set(expected)
+    orphans = sorted(
+        [{"id": i, "folders": sorted(f[1] for f in entries)} for i, entries in forms.items() if i not in known]
+        + [{"id": i, "sprites": sorted(paths)} for i, paths in sprites.items() if i not in known],
+        key=lambda o: o["id"])
+    return {"coverage": totals, "gaps": gaps, "orphans": orphans}
+
+
+# --- Main ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Report missing models, clips, textures and sprites per species")
+    parser.add_argument("root", nargs="?", default=str(asset_paths.default_root()), help="Assets root to scan")
+    parser.add_argument("--species-json", type=str, default=str(SPECIES_JSON), help="species.json from fetch_pokeapi.py")
+    parser.add_argument("--db", type=str, default=None, help=f"gamedata.db (default: <root>/{DB_REL})")
+    parser.add_argument("--gen", type=int, default=7, help="Expect species through this generation (default: 7)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--report", type=str, default=None, help="Write JSON report here (default: stdout)")
+    parser.add_argument("--missing", choices=ASSET_TYPES + DATA_TYPES, default=None,
+                        help="Only print the ids of species missing this asset type, one per line")
+    telemetry.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.root).replace("\\", "/")
+    if not os.path.isdir(root):
+        print(f"ERROR: {root} is not a directory.")
+        sys.exit(1)
+    db_path = args.db or str(asset_paths.AssetResolver(root).resolve(DB_REL))
+    telemetry.setup("species_coverage", trace=args.trace, summary=not args.no_summary and not args.missing)
+
+    start = time.perf_counter()
+    expected = get_gen_pokemon_ids(args.gen)
+    with telemetry.stage("list"):
+        _manifests, files, _lower = list_tree(root)
+    with telemetry.stage("index"):
+        folders, sprites = build_index(files)
+    telemetry.count("files", len(files))
+    telemetry.count("model_folders", len(folders))
+
+    with telemetry.stage("check"):
+        results = check_folders(root, files, folders, args.jobs)
+    with telemetry.stage("data"):
+        species_json = load_species_json(Path(args.species_json))
+        gamedata = load_gamedata(Path(db_path))
+    with telemetry.stage("join"):
+        joined = coverage(expected, results, sprites, species_json, gamedata)
+    elapsed = time.perf_counter() - start
+
+    if args.missing:
+        for gap in joined["gaps"]:
+            if args.missing in gap["missing"]:
+                print(gap["id"])
+        return
+
+    result = {
+        "root": root,
+        "elapsedMs": round(elapsed * 1000, 1),
+        "species": len(expected),
+        "files": len(files),
+        "modelFolders": len(folders),
+        "speciesJson": args.species_json if species_json is not None else None,
+        "gamedata": db_path if gamedata is not None else None,
+        **joined,
+    }
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+
+    if args.report:
+        Path(args.report).write_text(text + "\n", encoding="utf-8")
+        print(f"{root}: {len(expected)} species, {len(folders)} model folders, {len(files)} files "
+              f"in {elapsed * 1000:.0f} ms -> {args.report}")
+        for kind, counts in joined["coverage"].items():
+            share = counts["covered"] / len(expected) if expected else 0
+            print(f"  {kind:<12} {counts['covered']:>5} covered  {counts['missing']:>5} missing  ({share:.0%})")
+        if species_json is None:
+            print(f"  (no species.json at {args.species_json})")
+        if gamedata is None:
+            print(f"  (no gamedata.db at {db_path})")
+        if joined["orphans"]:
+            print(f"  {len(joined['orphans'])} ids with assets but outside Gen 1-{args.gen}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Stage timers and counters shared by the fetch and asset scripts.
+
+Scripts wrap the parts of a run they care about in named stages and bump
+counters as they go:
+
+    import telemetry
+
+    telemetry.setup("fetch-gamedata", trace=args.trace)
+    with telemetry.stage("network"):
+        resp = session.get(url)
+    telemetry.count("requests")
+    telemetry.count("bytes", len(resp.content))
+
+At exit a summary table is printed (time, calls and share per stage, then
+counters). With --trace every stage exit and event is also appended to a
+JSON Lines file:
+
+    {"t": 1.204, "tool": "fetch-gamedata", "kind": "stage", "stage": "network", "dur": 0.0812, "url": "..."}
+    {"t": 9.771, "tool": "fetch-gamedata", "kind": "summary", "stages": {...}, "counters": {...}}
+
+Stages are flat: time spent in a stage opened inside another is counted
+in both. Recording is thread-safe and costs a lock and a perf_counter()
+call per stage, so it is always on; without setup() nothing is emitted.
+
+Usage (from a script):
+    telemetry.add_arguments(parser)          # adds --trace / --no-summary
+    args = parser.parse_args()
+    telemetry.setup("my-tool", trace=args.trace, summary=not args.no_summary)
+"""
+
+import argparse
+import atexit
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class Telemetry:
+    def __init__(self):
+        self.tool = None
+        self.started = time.perf_counter()
+        self.stage_time: dict[str, float] = {}
+        self.stage_calls: Counter = Counter()
+        self.counters: Counter = Counter()
+        self.trace_file = None
+        self.lock = threading.Lock()
+
+    def _write(self, record: dict):
+        # Caller holds self.lock
+        if self.trace_file is None:
+            return
+        record = {"t": round(time.perf_counter() - self.started, 4), "tool": self.tool, **record}
+        self.trace_file.write(json.dumps(record, default=str) + "\n")
+
+    @contextmanager
+    def stage(self, name: str, **fields):
+        """Time the enclosed block under `name`; extra fields go to the trace."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            dur = time.perf_counter() - start
+            with self.lock:
+                self.stage_time[name] = self.stage_time.get(name, 0.0) + dur
+                self.stage_calls[name] += 1
+                self._write({"kind": "stage", "stage": name, "dur": round(dur, 6), **fields})
+
+    def count(self, name: str, n: int = 1):
+        with self.lock:
+            self.counters[name] += n
+
+    def event(self, kind: str, **fields):
+        """Write a one-off record (e.g. an error) to the trace."""
+        with self.lock:
+            self._write({"kind": kind, **fields})
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> dict:
+        # Caller holds self.lock
+        return {
+            "elapsed": round(time.perf_counter() - self.started, 4),
+            "stages": {name: {"seconds": round(self.stage_time[name], 4), "calls": self.stage_calls[name]}
+                       for name in self.stage_time},
+            "counters": dict(self.counters),
+        }
+
+    def print_summary(self, file=sys.stdout):
+        snap = self.snapshot()
+        elapsed = snap["elapsed"] or 1e-9
+        if not snap["stages"] and not snap["counters"]:
+            return
+        print(f"\n--- {self.tool or 'telemetry'}: {snap['elapsed']:.2f}s wall ---", file=file)
+        if snap["stages"]:
+            print(f"  {'stage':<16} {'seconds':>10} {'calls':>8} {'avg ms':>9} {'share':>7}", file=file)
+            for name, s in sorted(snap["stages"].items(), key=lambda kv: -kv[1]["seconds"]):
+                avg_ms = s["seconds"] / s["calls"] * 1000 if s["calls"] else 0.0
+                print(f"  {name:<16} {s['seconds']:>10.3f} {s['calls']:>8,} {avg_ms:>9.2f} "
+                      f"{s['seconds'] / elapsed:>7.1%}", file=file)
+        if snap["counters"]:
+            print(f"  {'counter':<16} {'value':>10}", file=file)
+            for name, value in sorted(snap["counters"].items()):
+                print(f"  {name:<16} {value:>10,}", file=file)
+
+    def close(self, summary: bool = True):
+        if summary:
+            self.print_summary()
+        with self.lock:
+            if self.trace_file is not None:
+                self._write({"kind": "summary", **self._snapshot()})
+                self.trace_file.close()
+                self.trace_file = None
+
+
+# --- Module-level default instance ---
+
+_default = Telemetry()
+
+
+def setup(tool: str, trace: str | None = None, summary: bool = True) -> Telemetry:
+    """Name the run, open the JSONL trace (appending) and register the exit summary."""
+    _default.tool = tool
+    _default.started = time.perf_counter()
+    if trace:
+        path = Path(trace)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _default.trace_file = open(path, "a", encoding="utf-8")
+        _default.event("start", argv=sys.argv[1:])
+    atexit.register(_default.close, summary)
+    return _default
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--trace", type=str, default=None, metavar="PATH",
+                        help="Append a JSON Lines timing trace to PATH")
+    parser.add_argument("--no-summary", action="store_true", help="Skip the timing summary at exit")
+
+
+def stage(name: str, **fields):
+    return _default.stage(name, **fields)
+
+
+def count(name: str, n: int = 1):
+    _default.count(name, n)
+
+
+def event(kind: str, **fields):
+    _default.event(kind, **fields)
+
+
+def snapshot() -> dict:
+    return _default.snapshot()
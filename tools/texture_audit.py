@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Audit extracted textures for wasted memory and optionally rewrite them.
+
+Scans PNGs on the image_pipeline thread pool and reports:
+
+  duplicate     identical pixel data at several paths (hash of size + RGBA)
+  opaque-alpha  an alpha channel that is 255 everywhere (could be RGB)
+  transparent   no visible pixel at all
+  trimmable     a fully transparent border around the visible pixels
+  upscaled      every NxN block is one colour (nearest-neighbour upscale by N)
+  oversized     larger than --max-size on either side
+
+Each finding carries an estimate of the GPU memory it wastes (uncompressed
+RGBA8 / RGB8), so the report ends with a total the client would save.
+
+--fix rewrites files in place (re-encoded with PNG optimize):
+
+  rgb        drop opaque alpha channels
+  downscale  undo nearest-neighbour upscales exactly, shrink oversized
+             images to --max-size with Lanczos
+  trim       crop transparent borders -- sprites only: this changes the
+             image size, so texture UVs on models would no longer line up
+
+Duplicates are only reported; models reference textures by path, so
+merging them belongs in the manifest tools.
+
+Usage:
+    python texture_audit.py                                 # audit src/Starfield2026.Assets
+    python texture_audit.py path/to/dir other.png --report audit.json
+    python texture_audit.py --fix rgb --fix downscale
+    python texture_audit.py --max-size 1024 --workers 16
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import asset_paths
+import image_pipeline
+import telemetry
+
+ASSETS_DIR = asset_paths.default_root()
+
+DEFAULT_MAX_SIZE = 2048
+FIXES = ("rgb", "downscale", "trim")
+
+
+@dataclass
+class Finding:
+    kind: str
+    detail: str
+    saved_bytes: int = 0
+
+
+@dataclass
+class TextureInfo:
+    path: str
+    width: int
+    height: int
+    mode: str
+    pixel_hash: str = ""
+    upscale: int = 1
+    alpha: bool = False
+    opaque: bool = False
+    bbox: tuple[int, int, int, int] | None = None  # visible area, exclusive max
+    findings: list[Finding] = field(default_factory=list)
+
+    @property
+    def memory(self) -> int:
+        return self.width * self.height * (4 if self.alpha else 3)
+
+
+# --- Stages ---
+
+def pixel_stage(img: image_pipeline.Decoded) -> tuple[str, int]:
+    """(hash of size + RGBA pixels, nearest-neighbour upscale factor)."""
+    rgba = np.asarray(img.image if img.image.mode == "RGBA" else img.image.convert("RGBA"))
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{img.width}x{img.height}".encode())
+    h.update(rgba.tobytes())
+    return h.hexdigest(), upscale_factor(rgba)
+
+
+def upscale_factor(pixels: np.ndarray) -> int:
+    """Largest power-of-two N such that every NxN block of pixels is uniform."""
+    factor = 1
+    height, width = pixels.shape[:2]
+    while height % (factor * 2) == 0 and width % (factor * 2) == 0:
+        f = factor * 2
+        blocks = pixels.reshape(height // f, f, width // f, f, -1)
+        if not np.array_equal(blocks, np.broadcast_to(blocks[:, :1, :, :1], blocks.shape)):
+            break
+        factor = f
+    return factor
+
+
+def alpha_stage(img: image_pipeline.Decoded) -> tuple[bool, bool, tuple[int, int, int, int] | None]:
+    """(has alpha, alpha is 255 everywhere, bounding box of visible pixels or None)."""
+    alpha = img.alpha
+    if img.image.mode not in image_pipeline.ALPHA_MODES:
+        return False, False, (0, 0, img.width, img.height)
+    cols = np.flatnonzero(alpha.any(axis=0))
+    if not len(cols):
+        return True, False, None
+    rows = np.flatnonzero(alpha.any(axis=1))
+    opaque = bool(alpha.min() == 255)
+    return True, opaque, (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+
+
+STAGES = {"pixels": pixel_stage, "alpha": alpha_stage}
+
+
+# --- Findings ---
+
+def fit_size(width: int, height: int, max_size: int) -> tuple[int, int]:
+    scale = max_size / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def assess(info: TextureInfo, max_size: int):
+    bpp = 4 if info.alpha else 3
+    if info.opaque:
+        info.findings.append(Finding("opaque-alpha", "alpha is 255 everywhere", info.width * info.height))
+    if info.bbox is None:
+        info.findings.append(Finding("transparent", "no visible pixels"))
+    else:
+        x0, y0, x1, y1 = info.bbox
+        visible = (x1 - x0) * (y1 - y0)
+        if visible < info.width * info.height:
+            info.findings.append(Finding("trimmable", f"visible {x1 - x0}x{y1 - y0} at ({x0},{y0})",
+                                         (info.width * info.height - visible) * bpp))
+    if info.upscale > 1:
+        f = info.upscale
+        info.findings.append(Finding("upscaled", f"{f}x nearest, native {info.width // f}x{info.height // f}",
+                                     info.memory - info.memory // (f * f)))
+    width, height = info.width // info.upscale, info.height // info.upscale
+    if max(width, height) > max_size:
+        w, h = fit_size(width, height, max_size)
+        info.findings.append(Finding("oversized", f"{width}x{height} > {max_size}, fits as {w}x{h}",
+                                     (width * height - w * h) * bpp))
+
+
+def assess_duplicates(infos: list[TextureInfo]) -> list[list[TextureInfo]]:
+    by_hash = defaultdict(list)
+    for info in infos:
+        by_hash[info.pixel_hash].append(info)
+    groups = [g for g in by_hash.values() if len(g) > 1]
+    for group in groups:
+        first = group[0]
+        for info in group[1:]:
+            info.findings.append(Finding("duplicate", f"same pixels as {first.path}", info.memory))
+    return groups
+
+
+# --- Fixes ---
+
+def apply_fixes(info: TextureInfo, fixes: set[str], max_size: int) -> list[str]:
+    """Rewrite one texture in place; returns what was changed."""
+    kinds = {f.kind for f in info.findings}
+    actions = []
+    with Image.open(info.path) as src:
+        img = src.copy()
+
+    # Trim first, in source coordinates; an exact upscale trims to whole blocks
+    if "trim" in fixes and "trimmable" in kinds:
+        img = img.crop(info.bbox)
+        actions.append(f"trimmed to {img.width}x{img.height}")
+    if "downscale" in fixes:
+        if "upscaled" in kinds:
+            f = info.upscale
+            img = img.resize((img.width // f, img.height // f), Image.Resampling.NEAREST)
+            actions.append(f"downscaled {f}x")
+        if "oversized" in kinds:
+            img = img.resize(fit_size(img.width, img.height, max_size), Image.Resampling.LANCZOS)
+            actions.append(f"resized to {img.width}x{img.height}")
+    if "rgb" in fixes and "opaque-alpha" in kinds:
+        img = img.convert("RGB")
+        actions.append("dropped alpha")
+
+    if actions:
+        with telemetry.stage("encode", path=info.path):
+            img.save(info.path, optimize=True)
+        telemetry.count("rewritten")
+    return actions
+
+
+# --- Main ---
+
+def audit(paths: list[str], max_size: int, workers: int, prefetch: int) -> tuple[list[TextureInfo], list[str]]:
+    pipeline = image_pipeline.Pipeline(STAGES, workers, prefetch)
+    infos, errors = [], []
+    for result in pipeline.run(image_pipeline.find_images(paths)):
+        if result.error:
+            errors.append(f"{result.path}: {result.error}")
+            continue
+        info = TextureInfo(str(result.path), result.width, result.height, result.mode)
+        info.pixel_hash, info.upscale = result.values["pixels"]
+        info.alpha, info.opaque, info.bbox = result.values["alpha"]
+        assess(info, max_size)
+        infos.append(info)
+    return infos, errors
+
+
+def format_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
+    return f"{n:,.1f} GB"
+
+
+def print_report(infos: list[TextureInfo], groups: list[list[TextureInfo]], errors: list[str], verbose: bool):
+    totals = defaultdict(lambda: [0, 0])
+    for info in infos:
+        for f in info.findings:
+            totals[f.kind][0] += 1
+            totals[f.kind][1] += f.saved_bytes
+
+    memory = sum(i.memory for i in infos)
+    print(f"\n{len(infos)} textures, {format_bytes(memory)} uncompressed")
+    print(f"  {'finding':<14}{'count':>7}{'saves':>14}")
+    for kind in ("duplicate", "opaque-alpha", "transparent", "trimmable", "upscaled", "oversized"):
+        count, saved = totals.get(kind, (0, 0))
+        print(f"  {kind:<14}{count:>7}{format_bytes(saved):>14}")
+    print(f"  {'total':<14}{'':>7}{format_bytes(sum(s for _, s in totals.values())):>14}"
+          "  (upper bound; findings on one texture overlap)")
+
+    if groups:
+        print(f"\nDuplicate groups: {len(groups)}")
+        for group in groups if verbose else groups[:10]:
+            print(f"  {group[0].path}")
+            for info in group[1:]:
+                print(f"    = {info.path}")
+        if not verbose and len(groups) > 10:
+            print(f"  ... {len(groups) - 10} more (use --verbose)")
+
+    if verbose:
+        print()
+        for info in infos:
+            for f in info.findings:
+                if f.kind != "duplicate":
+                    print(f"  {f.kind:<13} {info.path}: {f.detail}")
+
+    if errors:
+        print(f"\n{len(errors)} unreadable:")
+        for e in errors:
+            print(f"  {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit textures for duplicates, unused alpha and oversize")
+    parser.add_argument("paths", nargs="*", default=[str(ASSETS_DIR)], help="Images or directories to scan")
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE,
+                        help=f"Largest allowed side in pixels (default: {DEFAULT_MAX_SIZE})")
+    parser.add_argument("--fix", action="append", choices=FIXES, default=[],
+                        help="Rewrite files in place (repeatable); trim is for sprites only")
+    parser.add_argument("--report", type=str, default=None, help="Write findings as JSON")
+    parser.add_argument("--verbose", "-v", action="store_true", help="List every finding")
+    image_pipeline.add_arguments(parser)
+    telemetry.add_arguments(parser)
+    args = parser.parse_args()
+    telemetry.setup("texture_audit", trace=args.trace, summary=not args.no_summary)
+
+    print(f"Auditing {', '.join(args.paths)}")
+    infos, errors = audit(args.paths, args.max_size, args.workers, args.prefetch)
+    groups = assess_duplicates(infos)
+    print_report(infos, groups, errors, args.verbose)
+
+    if args.report:
+        report = {"max_size": args.max_size, "errors": errors,
+                  "textures": [asdict(i) for i in infos if i.findings]}
+        Path(args.report).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nReport written to {args.report}")
+
+    if args.fix:
+        fixes = set(args.fix)
+        print(f"\nApplying fixes: {', '.join(sorted(fixes))}")
+        for info in infos:
+            actions = apply_fixes(info, fixes, args.max_size)
+            if actions:
+                print(f"  {info.path}: {', '.join(actions)}")
+
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
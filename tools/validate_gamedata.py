@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Validate gamedata.db in one pass and write a machine-readable report.
+
+Each table is read exactly once; every invariant is then checked in memory
+against those row sets, so a full run takes well under a second instead of
+one query per row.
+
+Checks:
+  - learnsets: species_id exists in species, move_id exists in moves
+  - evolutions: from/to species exist in species (later-gen endpoints are warnings)
+  - species/moves: types, move categories and growth rates match the C# enums
+  - items: category is a valid ItemCategory, berries are categorised as Berry
+  - species/moves/items: names are unique case-insensitively
+
+Usage:
+    python validate_gamedata.py                       # report to stdout
+    python validate_gamedata.py --report report.json  # write report file
+    python validate_gamedata.py --db path/to/gamedata.db
+
+Exits with status 1 when any error-level issue is found.
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+DB_PATH = SCRIPT_DIR.parent / "src" / "Starfield2026.Assets" / "Data" / "gamedata.db"
+
+# Mirrors of the C# enums the runtime parses these columns into.
+MOVE_TYPES = {
+    "Normal", "Fire", "Water", "Grass", "Electric", "Ice", "Fighting", "Poison",
+    "Ground", "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon", "Dark", "Steel", "Fairy",
+}
+MOVE_CATEGORIES = {"Physical", "Special", "Status"}
+GROWTH_RATES = {"Erratic", "Fast", "MediumFast", "MediumSlow", "Slow", "Fluctuating"}
+ITEM_CATEGORIES = {
+    "Pokeball", "Medicine", "Battle", "Berry", "KeyItem", "TM", "HM",
+    "EvolutionStone", "HeldItem", "Valuable", "Mail",
+}
+
+# Cap on examples stored per check so the report stays readable.
+MAX_EXAMPLES = 50
+
+
+class Report:
+    """Collects issues grouped by check name."""
+
+    def __init__(self):
+        self.issues: dict[str, list] = defaultdict(list)
+        self.severity: dict[str, str] = {}
+
+    def add(self, check: str, severity: str, detail: dict):
+        self.severity[check] = severity
+        self.issues[check].append(detail)
+
+    @property
+    def error_count(self) -> int:
+        return sum(len(v) for k, v in self.issues.items() if self.severity[k] == "error")
+
+    @property
+    def warning_count(self) -> int:
+        return sum(len(v) for k, v in self.issues.items() if self.severity[k] == "warning")
+
+    def to_dict(self) -> dict:
+        return {
+            check: {
+                "severity": self.severity[check],
+                "count": len(details),
+                "examples": details[:MAX_EXAMPLES],
+            }
+            for check, details in sorted(self.issues.items())
+        }
+
+
+# --- Load ---
+
+def load_tables(conn: sqlite3.Connection) -> dict[str, list[tuple]]:
+    """Read each table once. Missing tables load as empty."""
+    queries = {
+        "species": "SELECT id, name, type1, type2, growth_rate FROM species",
+        "moves": "SELECT id, name, type, category FROM moves",
+        "items": "SELECT id, name, category FROM items",
+        "learnsets": "SELECT species_id, move_id, method, level FROM learnsets",
+        "evolutions": "SELECT from_species_id, to_species_id, trigger FROM evolutions",
+    }
+    existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return {
+        table: conn.execute(sql).fetchall() if table in existing else []
+        for table, sql in queries.items()
+    }
+
+
+# --- Checks ---
+
+def check_unique_names(report: Report, table: str, rows: list[tuple]):
+    by_name = defaultdict(list)
+    for row in rows:
+        by_name[row[1].casefold()].append(row[0])
+    for name, ids in by_name.items():
+        if len(ids) > 1:
+            report.add(f"{table}.duplicate_name", "warning", {"name": name, "ids": sorted(ids)})
+
+
+def validate(tables: dict[str, list[tuple]]) -> tuple[Report, dict]:
+    report = Report()
+    species_ids = {r[0] for r in tables["species"]}
+    move_ids = {r[0] for r in tables["moves"]}
+
+    for sid, name, type1, type2, growth in tables["species"]:
+        if type1 not in MOVE_TYPES:
+            report.add("species.invalid_type", "error", {"id": sid, "name": name, "type": type1})
+        if type2 is not None and type2 not in MOVE_TYPES:
+            report.add("species.invalid_type", "error", {"id": sid, "name": name, "type": type2})
+        if growth not in GROWTH_RATES:
+            report.add("species.invalid_growth_rate", "error", {"id": sid, "name": name, "growth_rate": growth})
+
+    for mid, name, mtype, category in tables["moves"]:
+        if mtype not in MOVE_TYPES:
+            report.add("moves.invalid_type", "error", {"id": mid, "name": name, "type": mtype})
+        if category not in MOVE_CATEGORIES:
+            report.add("moves.invalid_category", "error", {"id": mid, "name": name, "category": category})
+
+    for iid, name, category in tables["items"]:
+        if category not in ITEM_CATEGORIES:
+            report.add("items.invalid_category", "error", {"id": iid, "name": name, "category": category})
+        is_berry_name = name.casefold().endswith(" berry")
+        if is_berry_name and category != "Berry":
+            report.add("items.berry_miscategorised", "error", {"id": iid, "name": name, "category": category})
+        elif category == "Berry" and not is_berry_name:
+            report.add("items.non_berry_in_berry_category", "error", {"id": iid, "name": name})
+
+    missing_species = defaultdict(int)
+    missing_moves = defaultdict(int)
+    for species_id, move_id, _method, _level in tables["learnsets"]:
+        if species_id not in species_ids:
+            missing_species[species_id] += 1
+        if move_id not in move_ids:
+            missing_moves[move_id] += 1
+    for species_id, n in sorted(missing_species.items()):
+        report.add("learnsets.unknown_species", "error", {"species_id": species_id, "rows": n})
+    for move_id, n in sorted(missing_moves.items()):
+        report.add("learnsets.unknown_move", "error", {"move_id": move_id, "rows": n})
+
+    # PokeAPI chains include later-generation branches (e.g. Meowth -> Perrserker);
+    # endpoints past the last species we ship are reported separately as warnings.
+    max_species_id = max(species_ids, default=0)
+    for from_id, to_id, trigger in tables["evolutions"]:
+        for column, value in (("from_species_id", from_id), ("to_species_id", to_id)):
+            if value in species_ids:
+                continue
+            detail = {"from_species_id": from_id, "to_species_id": to_id,
+                      "trigger": trigger, "missing": column}
+            if value > max_species_id:
+                report.add("evolutions.species_beyond_dex", "warning", detail)
+            else:
+                report.add("evolutions.unknown_species", "error", detail)
+
+    for table in ("species", "moves", "items"):
+        check_unique_names(report, table, tables[table])
+
+    counts = {table: len(rows) for table, rows in tables.items()}
+    return report, counts
+
+
+# --- Main ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate gamedata.db consistency")
+    parser.add_argument("--db", type=str, default=str(DB_PATH), help="Path to gamedata.db")
+    parser.add_argument("--report", type=str, default=None, help="Write JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"ERROR: {db_path} not found.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    tables = load_tables(conn)
+    conn.close()
+    report, counts = validate(tables)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "database": str(db_path),
+        "elapsedMs": round(elapsed * 1000, 1),
+        "rows": counts,
+        "errors": report.error_count,
+        "warnings": report.warning_count,
+        "checks": report.to_dict(),
+    }
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+
+    if args.report:
+        Path(args.report).write_text(text + "\n", encoding="utf-8")
+        print(f"{db_path}: {report.error_count} errors, {report.warning_count} warnings "
+              f"in {elapsed * 1000:.0f} ms -> {args.report}")
+        for check, info in result["checks"].items():
+            print(f"  {info['severity']:<7} {check}: {info['count']}")
+    else:
+        print(text)
+
+    sys.exit(1 if report.error_count else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Validate (and optionally normalize) every model manifest under an assets root.
+
+The tree is listed once up front (one os.walk) and every file reference in
+every manifest is checked against that listing, so there is no exists()
+call per reference. Manifests are parsed and checked on a process pool
+with the schema from manifest_schema.py, compiled once per worker.
+
+Checks:
+  - manifest.parse         file is not valid JSON
+  - manifest.schema        field types, required clip fields, negative counts
+  - manifest.no_model      neither modelFile nor models[].file
+  - clips.duplicate_index / clips.duplicate_name
+  - refs.missing           referenced file (model, mtl, texture, clip) is not on disk
+  - refs.case_mismatch     file exists only with different case (works on Windows, not Linux)
+  - refs.outside_root      reference escapes the assets root (checked with a stat)
+  - manifest.stale_dir     "dir" / "assetsPath" no longer match the manifest's location
+                           (assetsPath is relative to --assets-root, see asset_paths.py)
+  - manifest.format_mismatch / manifest.normalizable (fields fix-manifests would add)
+  - manifest.absolute_dir  with --relative: an absolute "dir" is still present
+
+Usage:
+    python validate_manifests.py                              # src/Starfield2026.Assets
+    python validate_manifests.py path/to/Assets/Models --report manifests.json
+    python validate_manifests.py path/to/Models --assets-root path/to   # another checkout
+    python validate_manifests.py --fix                        # write normalized manifests
+    python validate_manifests.py --jobs 1                     # no process pool
+    python validate_manifests.py --relative --fix             # make manifests portable (see asset_paths.py)
+
+Exits with status 1 when any error-level issue is found.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import asset_paths
+import manifest_schema
+import telemetry
+from validate_gamedata import Report
+
+# Below this many manifests a process pool costs more than it saves
+POOL_MIN_MANIFESTS = 200
+
+
+def is_manifest(name: str) -> bool:
+    return name == "manifest.json" or (name.startswith("manifest.") and name.endswith(".json"))
+
+
+def list_tree(root: str) -> tuple[list[str], frozenset[str], dict[str, str]]:
+    """One walk of root: manifest paths, every file (relative, posix) and a lower-case index."""
+    manifests, files = [], []
+    for dirpath, _dirs, names in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace("\\", "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        for name in names:
+            files.append(prefix + name)
+            if is_manifest(name):
+                manifests.append(prefix + name)
+    manifests.sort()
+    return manifests, frozenset(files), {f.lower(): f for f in files}
+
+
+# --- Per-manifest check (runs in workers) ---
+
+_root: str = ""
+_assets_root: str = ""
+_files: frozenset[str] = frozenset()
+_lower: dict[str, str] = {}
+_fix = False
+_portable = False
+
+
+def init_worker(root: str, assets_root: str, files: frozenset[str], lower: dict[str, str], fix: bool,
+                portable: bool):
+    global _root, _assets_root, _files, _lower, _fix, _portable
+    _root, _assets_root, _files, _lower, _fix, _portable = root, assets_root, files, lower, fix, portable
+
+
+def check_manifest(rel_path: str) -> tuple[str, list, bool]:
+    """(rel_path, issues, rewritten) for one manifest."""
+    path = os.path.join(_root, rel_path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return rel_path, [("manifest.parse", "error", "$", str(e))], False
+
+    issues = manifest_schema.validate(data)
+    if not isinstance(data, dict):
+        return rel_path, issues, False
+
+    rel_dir = rel_path.rpartition("/")[0]
+    for where, ref in manifest_schema.references(data):
+        target = manifest_schema.resolve(rel_dir, ref)
+        if target == ".." or target.startswith("../") or os.path.isabs(ref):
+            if not os.path.exists(os.path.join(_root, rel_dir, ref)):
+                issues.append(("refs.outside_root", "error", where, ref))
+            continue
+        if target in _files:
+            continue
+        actual = _lower.get(target.lower())
+        if actual:
+            issues.append(("refs.case_mismatch", "error", where, f"{ref} (on disk: {actual})"))
+        else:
+            issues.append(("refs.missing", "error", where, ref))
+
+    manifest_dir = os.path.dirname(path).replace("\\", "/")
+    if not _portable and isinstance(data.get("dir"), str) and data["dir"] != manifest_dir:
+        issues.append(("manifest.stale_dir", "warning", "$.dir", data["dir"]))
+    assets_path = asset_paths.to_posix(os.path.relpath(manifest_dir, _assets_root))
+    if isinstance(data.get("assetsPath"), str) and data["assetsPath"] != assets_path:
+        issues.append(("manifest.stale_dir", "warning", "$.assetsPath", data["assetsPath"]))
+
+    missing = [name for name in manifest_schema.derived_fields(_portable) if name not in data]
+    absolute = [name for name in manifest_schema.ABSOLUTE_FIELDS if _portable and name in data]
+    if _fix and (missing or absolute):
+        if manifest_schema.normalize(data, manifest_dir, _assets_root, _portable):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            return rel_path, issues, True
+    if missing:
+        issues.append(("manifest.normalizable", "warning", "$", "missing " + ", ".join(missing)))
+    for name in absolute:
+        issues.append(("manifest.absolute_dir", "warning", f"$.{name}", data[name]))
+    return rel_path, issues, False
+
+
+# --- Main ---
+
+def validate_tree(root: str, jobs: int, fix: bool, portable: bool = False,
+                  assets_root: str | None = None) -> tuple[Report, int, int, int]:
+    """Report plus (manifests, files listed, manifests rewritten)."""
+    assets_root = os.path.abspath(assets_root or asset_paths.default_root())
+    with telemetry.stage("list"):
+        manifests, files, lower = list_tree(root)
+    telemetry.count("files", len(files))
+    telemetry.count("manifests", len(manifests))
+
+    with telemetry.stage("check"):
+        if jobs > 1 and len(manifests) >= POOL_MIN_MANIFESTS:
+            chunk = max(1, len(manifests) // (jobs * 8))
+            with ProcessPoolExecutor(jobs, initializer=init_worker, initargs=(root, assets_root, files, lower, fix, portable)) as pool:
+                results = list(pool.map(check_manifest, manifests, chunksize=chunk))
+        else:
+            init_worker(root, assets_root, files, lower, fix, portable)
+            results = [check_manifest(m) for m in manifests]
+
+    report = Report()
+    rewritten = 0
+    for rel_path, issues, fixed in results:
+        rewritten += fixed
+        for check, severity, where, detail in issues:
+            report.add(check, severity, {"manifest": rel_path, "at": where, "detail": detail})
+    return report, len(manifests), len(files), rewritten
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate model manifests against the schema and the file tree")
+    parser.add_argument("root", nargs="?", default=str(asset_paths.default_root()), help="Folder to scan")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--fix", action="store_true", help="Write normalized manifests (fields fix-manifests adds)")
+    parser.add_argument("--relative", action="store_true",
+                        help="Expect portable manifests (no absolute dir); with --fix, strip it")
+    parser.add_argument("--report", type=str, default=None, help="Write JSON report here (default: stdout)")
+    asset_paths.add_arguments(parser)
+    telemetry.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.root).replace("\\", "/")
+    if not os.path.isdir(root):
+        print(f"ERROR: {root} is not a directory.")
+        sys.exit(1)
+    telemetry.setup("validate_manifests", trace=args.trace, summary=not args.no_summary)
+
+    start = time.perf_counter()
+    report, manifest_count, file_count, rewritten = validate_tree(root, args.jobs, args.fix, args.relative,
+                                                                  args.assets_root)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "root": root,
+        "elapsedMs": round(elapsed * 1000, 1),
+        "manifests": manifest_count,
+        "files": file_count,
+        "rewritten": rewritten,
+        "errors": report.error_count,
+        "warnings": report.warning_count,
+        "checks": report.to_dict(),
+    }
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+
+    if args.report:
+        Path(args.report).write_text(text + "\n", encoding="utf-8")
+        print(f"{root}: {manifest_count} manifests, {report.error_count} errors, {report.warning_count} warnings "
+              f"in {elapsed * 1000:.0f} ms -> {args.report}")
+        for check, info in result["checks"].items():
+            print(f"  {info['severity']:<7} {check}: {info['count']}")
+        if rewritten:
+            print(f"  normalized {rewritten} manifests")
+    else:
+        print(text)
+
+    sys.exit(1 if report.error_count else 0)
+
+
+if __name__ == "__main__":
+    main()